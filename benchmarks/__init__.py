@@ -0,0 +1,20 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`benchmarks`
+================================================================================
+
+Rendering benchmarks for the charts, run on CPython. Every chart is built
+and redrawn with data sets of growing size, on a stub display or on an in
+memory frame buffer, and the results are saved as JSON::
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json
+    python -m benchmarks.compare before.json after.json
+
+
+* Author: Jose D. Montoya
+
+
+"""
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`benchmarks.compare`
+================================================================================
+
+Compares two benchmark result files made by :mod:`benchmarks.run`. For every
+chart, size and stage found in both files the time ratio, and the change in
+primitive calls and peak memory are shown. The exit status is :const:`1` when
+a stage got slower than the threshold.
+
+Usage::
+
+    python -m benchmarks.compare before.json after.json [--threshold 1.10]
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+import argparse
+import json
+import sys
+
+
+def _key(result: dict) -> tuple:
+    return result["chart"], result["size"], result["stage"]
+
+
+def compare(before: dict, after: dict) -> list:
+    """
+    Matches the results of two runs
+
+    :param dict before: results of the first run
+    :param dict after: results of the second run
+    :return list: ``(before, after)`` result pairs measured in both runs
+    """
+    previous = {_key(result): result for result in before["results"]}
+    pairs = []
+    for result in after["results"]:
+        old = previous.get(_key(result))
+        if old is None or "skipped" in old or "skipped" in result:
+            continue
+        pairs.append((old, result))
+    return pairs
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compares two benchmark result files",
+    )
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.10,
+        help="time ratio above which a stage is reported as slower",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding="utf-8") as before_file:
+        before = json.load(before_file)
+    with open(args.after, encoding="utf-8") as after_file:
+        after = json.load(after_file)
+    for field in ("display", "mode"):
+        if before.get(field) != after.get(field):
+            print(
+                "Warning: %s differs, %s and %s"
+                % (field, before.get(field), after.get(field))
+            )
+
+    slower = 0
+    print(
+        "%-12s %7s %-9s %11s %11s %7s %9s %11s"
+        % ("chart", "size", "stage", "before ms", "after ms", "ratio", "calls", "bytes")
+    )
+    for old, new in compare(before, after):
+        ratio = new["time_ms"] / old["time_ms"] if old["time_ms"] else 1.0
+        mark = ""
+        if ratio > args.threshold:
+            mark = " slower"
+            slower += 1
+        print(
+            "%-12s %7d %-9s %11.3f %11.3f %7.2f %+9d %+11d%s"
+            % (
+                new["chart"],
+                new["size"],
+                new["stage"],
+                old["time_ms"],
+                new["time_ms"],
+                ratio,
+                sum(new["calls"].values()) - sum(old["calls"].values()),
+                new["peak_bytes"] - old["peak_bytes"],
+                mark,
+            )
+        )
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`benchmarks.displays`
+================================================================================
+
+Displays used by the benchmarks
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from micropython_uplot.headless import HeadlessDisplay
+
+
+class StubDisplay:
+    """
+    Display with the driver interface whose primitives do nothing, so only
+    the cost of the library is measured. It has a GS4 color table like the
+    ILI9486 driver, but no frame buffer.
+
+    :param int width: display width in pixels
+    :param int height: display height in pixels
+
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.lut = bytearray(32)
+
+    @staticmethod
+    def rgb(r: int, g: int, b: int) -> int:
+        """
+        Converts a color into the display color value
+        """
+        return ((r & 0xF8) << 5) | ((g & 0x1C) << 11) | (b & 0xF8) | ((g & 0xE0) >> 5)
+
+    @staticmethod
+    def pixel(*args):
+        """
+        Reads or sets a pixel, pixels are read as :const:`0`
+        """
+        return 0 if len(args) == 2 else None
+
+    def line(self, *args) -> None:
+        """
+        Draws nothing
+        """
+
+    hline = vline = rect = fill_rect = ellipse = poly = line
+    text = fill = blit = scroll = show = line
+
+
+def new_display(kind: str, mode: str, width: int = 480, height: int = 320):
+    """
+    Returns a display for the benchmarks
+
+    :param str kind: ``"stub"`` or ``"headless"``
+    :param str mode: buffer format of the headless display
+    :param int width: display width in pixels. Defaults to :const:`480`
+    :param int height: display height in pixels. Defaults to :const:`320`
+    """
+    if kind == "stub":
+        return StubDisplay(width, height)
+    if kind == "headless":
+        return HeadlessDisplay(width, height, mode)
+    raise ValueError("Display must be stub or headless")
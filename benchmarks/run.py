@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`benchmarks.run`
+================================================================================
+
+Runs the benchmark scenarios and saves the results as JSON. For every chart
+and size the construction and the redraw are timed, keeping the best of the
+repetitions. A separate pass counts the drawing primitive calls and the
+pixels they draw, and measures the peak memory allocated with
+:mod:`tracemalloc`.
+
+Usage::
+
+    python -m benchmarks.run [--display stub|headless] [--mode GS4|GS8|RGB565]
+        [--charts cartesian,map] [--sizes 10,100] [--repeat 3] [--output file]
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from micropython_uplot.stats import Stats, StatsProxy
+from benchmarks.displays import new_display
+from benchmarks.scenarios import SCENARIOS
+
+SIZES = (10, 100, 1000, 10000, 100000)
+STAGES = ("construct", "redraw")
+FORMAT_VERSION = 1
+
+
+def _render(scenario, display, data: dict, stage: str):
+    """
+    Builds the chart, and redraws it for the redraw stage. Returns the plot,
+    the chart and the nanoseconds used by the stage
+    """
+    start = time.perf_counter_ns()
+    plot, chart = scenario.build(display, data)
+    elapsed = time.perf_counter_ns() - start
+    if stage == "redraw":
+        start = time.perf_counter_ns()
+        chart = scenario.redraw(plot, chart, data)
+        elapsed = time.perf_counter_ns() - start
+    return plot, chart, elapsed
+
+
+def _release(plot, chart) -> None:
+    """
+    Gives the color table slots back, so the display can be used again
+    """
+    plot.release_colors(chart)
+    plot.release_colors()
+
+
+def measure(scenario, display, size: int, stage: str, repeat: int) -> dict:
+    """
+    Measures one stage of a scenario
+
+    :param Scenario scenario: scenario to run
+    :param display: display to draw on, cleared before each run
+    :param int size: number of data elements
+    :param str stage: ``"construct"`` or ``"redraw"``
+    :param int repeat: number of timed runs
+    :return dict: result record
+    """
+    result = {"chart": scenario.name, "size": size, "stage": stage}
+    reason = scenario.skip(size)
+    if reason is not None:
+        result["skipped"] = reason
+        return result
+
+    data = scenario.data(size)
+    times = []
+    for _ in range(repeat):
+        display.fill(0)
+        plot, chart, elapsed = _render(scenario, display, data, stage)
+        times.append(elapsed)
+        _release(plot, chart)
+
+    display.fill(0)
+    stats = Stats()
+    counter = StatsProxy(display, stats)
+    tracemalloc.start()
+    try:
+        if stage == "redraw":
+            plot, chart = scenario.build(counter, data)
+            stats.reset()
+            tracemalloc.reset_peak()
+            chart = scenario.redraw(plot, chart, data)
+        else:
+            plot, chart = scenario.build(counter, data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    _release(plot, chart)
+
+    result["time_ms"] = min(times) / 1e6
+    result["mean_ms"] = sum(times) / len(times) / 1e6
+    result["calls"] = dict(sorted(stats.calls.items()))
+    result["pixels"] = sum(stats.pixels.values())
+    result["peak_bytes"] = peak
+    return result
+
+
+def run(
+    charts=None, sizes=SIZES, display="stub", mode="GS4", repeat=3, report=None
+) -> dict:
+    """
+    Runs the benchmarks and returns the results
+
+    :param list|None charts: scenario names. Defaults to None, every scenario
+    :param list sizes: data sizes. Defaults to :data:`SIZES`
+    :param str display: ``"stub"`` or ``"headless"``. Defaults to ``"stub"``
+    :param str mode: headless display buffer format. Defaults to ``"GS4"``
+    :param int repeat: number of timed runs. Defaults to :const:`3`
+    :param report: function called with each result record. Defaults to None
+    :return dict: results, ready to be saved as JSON
+    """
+    if charts is None:
+        charts = list(SCENARIOS)
+    for name in charts:
+        if name not in SCENARIOS:
+            raise ValueError("Unknown chart %s" % name)
+
+    target = new_display(display, mode)
+    results = []
+    for name in charts:
+        for size in sizes:
+            for stage in STAGES:
+                result = measure(SCENARIOS[name], target, size, stage, repeat)
+                results.append(result)
+                if report is not None:
+                    report(result)
+
+    return {
+        "version": FORMAT_VERSION,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "display": display,
+        "mode": mode if display == "headless" else "GS4",
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _print_result(result: dict) -> None:
+    """
+    Prints a result record as a table row
+    """
+    label = "%-12s %7d %-9s" % (result["chart"], result["size"], result["stage"])
+    if "skipped" in result:
+        print("%s  skipped: %s" % (label, result["skipped"]))
+        return
+    print(
+        "%s %10.3f ms %9d calls %10d bytes"
+        % (
+            label,
+            result["time_ms"],
+            sum(result["calls"].values()),
+            result["peak_bytes"],
+        )
+    )
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description="Runs the chart benchmarks"
+    )
+    parser.add_argument("--display", choices=("stub", "headless"), default="stub")
+    parser.add_argument("--mode", choices=("GS4", "GS8", "RGB565"), default="GS4")
+    parser.add_argument("--charts", help="comma separated chart names")
+    parser.add_argument("--sizes", help="comma separated data sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    charts = args.charts.split(",") if args.charts else None
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else SIZES
+    results = run(
+        charts, sizes, args.display, args.mode, max(1, args.repeat), _print_result
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`benchmarks.scenarios`
+================================================================================
+
+Benchmark scenarios, one per chart, following the library examples. Each
+scenario prepares its data for a size ``n``, builds the plot and the chart,
+and redraws the chart the way an application refreshing the screen would.
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+import random
+from math import exp, pi, sqrt
+from micropython_uplot.bar import Bar
+from micropython_uplot.cartesian import Cartesian
+from micropython_uplot.fillbetween import Fillbetween
+from micropython_uplot.logging import Logging
+from micropython_uplot.map import Map
+from micropython_uplot.plot import PLOT
+from micropython_uplot.scatter import Scatter
+from micropython_uplot.utils import linspace
+
+_SEED = 1234
+_BAR_COLORS = ((255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0))
+
+
+class Scenario:
+    """
+    Benchmark scenario. By default a straight line is drawn with
+    :class:`Cartesian` on a 300x250 plot, subclasses change the data, the
+    plot and the chart. A redraw builds the chart again on the same plot.
+    """
+
+    name = None
+
+    def data(self, size: int) -> dict:  # pylint: disable=no-self-use
+        """
+        Returns the data for ``size`` elements, prepared outside the timings
+        """
+        x = list(linspace(0, 10, size))
+        return {"x": x, "y": list(x)}
+
+    def skip(self, size: int):  # pylint: disable=no-self-use
+        """
+        Returns the reason why the scenario can not use ``size`` elements, or
+        None when it can
+        """
+        return None if size > 0 else "Size must be positive"
+
+    def build(self, display, data: dict) -> tuple:
+        """
+        Creates the plot and the chart, returns both
+        """
+        plot = PLOT(display, 5, 5, 300, 250, padding=1, box_color=(255, 255, 255))
+        return plot, self.chart(plot, data)
+
+    def chart(self, plot: PLOT, data: dict):  # pylint: disable=no-self-use
+        """
+        Draws the chart on an existing plot
+        """
+        return Cartesian(plot, data["x"], data["y"])
+
+    def redraw(self, plot: PLOT, chart, data: dict):
+        """
+        Draws the chart again, returns the chart shown
+        """
+        plot.release_colors(chart)
+        return self.chart(plot, data)
+
+
+class CartesianScenario(Scenario):
+    """
+    Gaussian curve, as in ``cartesian_simpletest.py``
+    """
+
+    name = "cartesian"
+
+    def data(self, size: int) -> dict:
+        x = list(linspace(-4, 4, size))
+        constant = 1.0 / sqrt(2 * pi)
+        return {"x": x, "y": [constant * exp(-(value**2) / 2.0) for value in x]}
+
+    def build(self, display, data: dict) -> tuple:
+        plot = PLOT(display, 5, 5, 300, 250, padding=1, box_color=(255, 255, 255))
+        plot.tick_params(
+            tickx_height=12, ticky_height=12, tickcolor=(100, 100, 100), tickgrid=True
+        )
+        return plot, self.chart(plot, data)
+
+    def chart(self, plot: PLOT, data: dict):
+        return Cartesian(plot, data["x"], data["y"], line_color=(255, 255, 0))
+
+
+class LoggingScenario(Scenario):
+    """
+    Data log with ticks and labels, as in ``logging_simpletest.py``. The
+    redraw draws every point again
+    """
+
+    name = "logging"
+
+    def data(self, size: int) -> dict:
+        generator = random.Random(_SEED)
+        return {
+            "x": [10 * (index + 1) for index in range(size)],
+            "y": [generator.randint(19, 37) for _ in range(size)],
+        }
+
+    def build(self, display, data: dict) -> tuple:
+        plot = PLOT(display, 5, 5, 300, 250, padding=25, box_color=(255, 255, 255))
+        plot.tick_params(
+            tickx_height=4,
+            ticky_height=4,
+            show_ticks=True,
+            tickcolor=(255, 125, 125),
+            showtext=True,
+        )
+        return plot, self.chart(plot, data)
+
+    def chart(self, plot: PLOT, data: dict):
+        return Logging(
+            plot,
+            data["x"],
+            data["y"],
+            rangex=[0, 10 * (len(data["x"]) + 1)],
+            rangey=[0, 110],
+            line_color=(0, 255, 0),
+            ticksx=[25, 50, 75, 100, 125, 150, 175, 200],
+            ticksy=[25, 50, 75, 100],
+        )
+
+    def redraw(self, plot: PLOT, chart, data: dict):
+        chart.draw_points(plot, data["x"], data["y"])
+        return chart
+
+
+class ScatterScenario(Scenario):
+    """
+    Circles of random radius, as in ``scatter_different_datasets.py``
+    """
+
+    name = "scatter"
+
+    def data(self, size: int) -> dict:
+        generator = random.Random(_SEED)
+        x = list(linspace(10, 200, size))
+        return {
+            "x": x,
+            "y": [generator.choice(x) for _ in x],
+            "radius": [generator.choice((2, 3, 4, 5, 6)) for _ in x],
+        }
+
+    def build(self, display, data: dict) -> tuple:
+        plot = PLOT(display, 50, 50, 200, 200, padding=1, box_color=(0, 0, 255))
+        plot.axs_params(axstype="box")
+        plot.tick_params(
+            tickx_height=12, ticky_height=12, tickcolor=(100, 100, 100), tickgrid=True
+        )
+        return plot, self.chart(plot, data)
+
+    def chart(self, plot: PLOT, data: dict):
+        return Scatter(
+            plot,
+            data["x"],
+            data["y"],
+            rangex=[0, 210],
+            rangey=[0, 210],
+            radius=data["radius"],
+            pointer_color=(255, 255, 0),
+        )
+
+
+class BarScenario(Scenario):
+    """
+    Filled bars, as in ``bar_simpletest.py``, the example colors are repeated
+    """
+
+    name = "bar"
+
+    def data(self, size: int) -> dict:
+        generator = random.Random(_SEED)
+        return {
+            "x": [str(index) for index in range(size)],
+            "y": [generator.randint(1, 7) for _ in range(size)],
+            "colors": [_BAR_COLORS[index % 4] for index in range(size)],
+        }
+
+    def build(self, display, data: dict) -> tuple:
+        plot = PLOT(display, 10, 10, 250, 250, padding=1, box_color=(255, 255, 255))
+        plot.axs_params(axstype="box")
+        return plot, self.chart(plot, data)
+
+    def chart(self, plot: PLOT, data: dict):
+        return Bar(
+            plot,
+            data["x"],
+            data["y"],
+            fill=True,
+            bar_space=20,
+            xstart=8,
+            color_palette=data["colors"],
+        )
+
+
+class MapScenario(Scenario):
+    """
+    Color map of a square grid with about ``n`` cells, as in
+    ``map_simpletest.py``. The redraw shows a new frame with :meth:`Map.update`
+    """
+
+    name = "map"
+
+    @staticmethod
+    def _side(size: int) -> int:
+        side = 1
+        while (side + 1) * (side + 1) <= size:
+            side += 1
+        return side
+
+    def skip(self, size: int):
+        if self._side(size) > 247:
+            return "Map needs at least one pixel per cell"
+        return super().skip(size)
+
+    def data(self, size: int) -> dict:
+        side = self._side(size)
+        x = list(linspace(-4, 4, side * side))
+        values = [2.0 / sqrt(2 * pi) * exp(-(value**2) / 4.0) for value in x]
+        return {
+            "side": side,
+            "y": values,
+            "next": values[side:] + values[:side],
+            "max": max(values),
+        }
+
+    def chart(self, plot: PLOT, data: dict):
+        side = data["side"]
+        return Map(
+            plot, data["y"], data["max"], [side, side], (255, 0, 68), (68, 0, 255)
+        )
+
+    def redraw(self, plot: PLOT, chart, data: dict):
+        chart.update(data["next"])
+        return chart
+
+
+class FillbetweenScenario(Scenario):
+    """
+    Area between two curves, as in ``fillbetween_simpletest.py``
+    """
+
+    name = "fillbetween"
+
+    def data(self, size: int) -> dict:
+        x = list(linspace(0, 8, size))
+        return {
+            "x": x,
+            "y1": [value**2 / 2 for value in x],
+            "y2": [2 + value**2 + 3 * value for value in x],
+        }
+
+    def build(self, display, data: dict) -> tuple:
+        plot = PLOT(display, 5, 5, 300, 200, padding=1, box_color=(255, 255, 255))
+        return plot, self.chart(plot, data)
+
+    def chart(self, plot: PLOT, data: dict):
+        return Fillbetween(
+            plot, data["x"], data["y1"], data["y2"], fill_color=(255, 0, 0)
+        )
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        CartesianScenario(),
+        LoggingScenario(),
+        ScatterScenario(),
+        BarScenario(),
+        MapScenario(),
+        FillbetweenScenario(),
+    )
+}
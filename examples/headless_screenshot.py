@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import math
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+from micropython_uplot.utils import linspace
+from micropython_uplot.cartesian import Cartesian
+
+# Display kept in memory, no hardware needed
+display = HeadlessDisplay(480, 320, mode="RGB565")
+
+plot = PLOT(display, 5, 5, 300, 250, padding=25, box_color=(255, 255, 255))
+plot.tick_params(tickx_height=12, ticky_height=12, showtext=True, decimal_points=1)
+
+# Creating some points to graph
+x = list(linspace(-4, 4, 25))
+y = [math.sin(_) for _ in x]
+# Drawing the graph
+Cartesian(plot, x, y, line_color=(255, 255, 0))
+
+plot.screenshot("headless.ppm")
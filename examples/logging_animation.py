@@ -55,29 +55,26 @@ y = [26, 22, 24, 30, 28, 35, 26, 25, 24, 23, 20, 27, 26, 33, 24, 23, 19, 27, 26]
 random_numbers = [19, 22, 35, 33, 24, 26, 28, 37]
 
 
-dist = 1
-
 # Creating the loggraph
 my_loggraph = Logging(
     my_plot,
-    x[0:dist],
-    y[0:dist],
+    x[0:1],
+    y[0:1],
     rangex=[0, 210],
     rangey=[0, 110],
     line_color=(0, 255, 0),
     ticksx=[25, 50, 75, 100, 125, 150, 175, 200],
     ticksy=[25, 50, 75, 100],
+    capacity=len(x),
 )
 
 display.show()
 
 # Showing the loggraph
-for _ in range(20):
-    if dist > len(x):
-        y.pop(0)
-        y.append(random.choice(random_numbers))
-
-    my_loggraph.draw_points(my_plot, x[0:dist], y[0:dist])
+for i in range(1, 40):
+    if i < len(x):
+        my_loggraph.append(x[i], y[i])
+    else:
+        my_loggraph.append(x[-1] + 10 * (i - len(x) + 1), random.choice(random_numbers))
     display.show()
-    dist += 1
     time.sleep(0.5)
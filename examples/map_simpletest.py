@@ -25,20 +25,10 @@ x = linspace(-4, 4, 100)
 y = tuple([(2.0 / sqrt(2 * pi) * exp((-(value**2)) / 4.0)) for value in x])
 ymax = max(y)
 
-y1 = []
-
 rows, cols = (10, 10)
-indice = 0
-
-for i in range(rows):
-    col = []
-    for j in range(cols):
-        col.append(y[indice])
-        indice += 1
-    y1.append(col)
-
 
 # Plotting and showing the plot
-Map(plot, y1, ymax, [rows, cols], (255, 0, 68), (68, 0, 255))
+# The flat data is read in place, row by row
+Map(plot, y, ymax, [cols, rows], (255, 0, 68), (68, 0, 255))
 # Plotting and showing the plot
 display.show()
@@ -19,7 +19,7 @@ try:
 except ImportError:
     pass
 from math import ceil
-from micropython_uplot.colors import set_color
+from micropython_uplot.stats import measure
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/MicroPython_uplot.git"
@@ -59,60 +59,41 @@ class Bar:
          folder showing this functionality
 
         """
-        self._plot_obj = plot
-        self._filled = fill
-        self._plot_palette = []
-        self._plot_palette.append((20, 159, 20))
-        self._plot_palette.append((100, 113, 130))
-        self._plot_palette.append((116, 40, 239))
-        self._plot_palette.append((0, 94, 153))
-        self._plot_palette.append((0, 167, 109))
-        self._plot_palette.append((44, 73, 113))
-        self._color = []
-
-        if color_palette is None:
-            for element in self._plot_palette:
-                self._color.append(
-                    set_color(
-                        plot._display,
-                        plot._pointer_index,
-                        element[0],
-                        element[1],
-                        element[2],
-                    )
-                )
-                plot._pointer_index += 1
-        else:
+        with measure(plot, "transform", self):
+            self._plot_obj = plot
+            self._filled = fill
+            self._plot_palette = []
+            self._plot_palette.append((20, 159, 20))
+            self._plot_palette.append((100, 113, 130))
+            self._plot_palette.append((116, 40, 239))
+            self._plot_palette.append((0, 94, 153))
+            self._plot_palette.append((0, 167, 109))
+            self._plot_palette.append((44, 73, 113))
+            self._color = []
+
+            if color_palette is None:
+                color_palette = self._plot_palette
             for element in color_palette:
-                self._color.append(
-                    set_color(
-                        plot._display,
-                        plot._pointer_index,
-                        element[0],
-                        element[1],
-                        element[2],
-                    )
-                )
-                plot._pointer_index += 1
-
-        self._y = y
-
-        if max_value is None:
-            y_max = max(y)
-        else:
-            y_max = max_value
-
-        xstart = plot._newxmin + xstart + bar_space
-
-        self._graphx = ceil(abs(plot._newxmax - plot._newxmin) / (len(x) + 4))
-        self._graphy = abs(plot._newymax - plot._newymin) / (y_max + 2)
-
-        self._new_min = int(plot.transform(0, y_max, y_max, 0, 0))
-        self._new_max = int(plot.transform(0, y_max, y_max, 0, y_max))
-
-        for i, _ in enumerate(x):
-            self._create_bars(plot, xstart, i)
-            xstart = xstart + bar_space
+                self._color.append(plot.color(element, self))
+
+            self._y = y
+
+            if max_value is None:
+                y_max = max(y)
+            else:
+                y_max = max_value
+
+            xstart = plot._newxmin + xstart + bar_space
+
+            self._graphx = ceil(abs(plot._newxmax - plot._newxmin) / (len(x) + 4))
+            self._graphy = abs(plot._newymax - plot._newymin) / (y_max + 2)
+
+            self._new_min = int(plot.transform(0, y_max, y_max, 0, 0))
+            self._new_max = int(plot.transform(0, y_max, y_max, 0, y_max))
+
+            for i, _ in enumerate(x):
+                self._create_bars(plot, xstart, i)
+                xstart = xstart + bar_space
 
     def _create_bars(self, plot: PLOT, xstart: int, indice: int):
         """
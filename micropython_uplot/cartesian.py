@@ -20,7 +20,9 @@ except ImportError:
     pass
 
 from array import array
-from micropython_uplot.colors import set_color
+from micropython_uplot.clipping import clip_line, clip_polygon
+from micropython_uplot.plot import Mapper
+from micropython_uplot.stats import measure
 
 
 __version__ = "0.0.0+auto.0"
@@ -45,6 +47,7 @@ class Cartesian:
         ticksy: list = None,
         fill: bool = False,
         pointer_index: Optional[int] = None,
+        decimate: bool = False,
     ) -> None:
         """
 
@@ -58,108 +61,101 @@ class Cartesian:
         :param list ticksx: X axis ticks values
         :param list ticksy: Y axis ticks values
         :param bool fill: Show the filling. Defaults to `False`
-        :param int|None pointer_index: Pointer index. Defaults to None
+        :param int|None pointer_index: color table slot to use. Defaults to None,
+         the plot picks a slot, shared with charts of the same color
+        :param bool decimate: reduce the points to at most four per pixel column
+         before drawing. The result looks the same, but plots with many more
+         points than pixels are drawn much faster. Only available with the
+         ``"-"`` line style, the other styles depend on the point index.
+         Defaults to `False`
 
         """
-        self.points = []
-        self.ticksx = ticksx
-        self.ticksy = ticksy
-
-        if pointer_index is None:
-            self._pointer_index = plot._pointer_index
-        else:
-            self._pointer_index = pointer_index
-
-        self._line_color = set_color(
-            plot._display,
-            self._pointer_index,
-            line_color[0],
-            line_color[1],
-            line_color[2],
-        )
-        plot._pointer_index += 1
-
-        if line_style is None:
-            self._line_type = "-"
-        else:
-            self._line_type = line_style
-
-        if self._line_type not in ["-", ".", "- -", "-.-"]:
-            raise ValueError("line_style must be a valid option")
-
-        max_x = max(x)
-        min_x = min(x)
-        max_y = max(y)
-        min_y = min(y)
-
-        if rangex is None:
-            self.xmin = min_x - (abs(max_x - min_x) / 10)
-            self.xmax = max_x + (abs(max_x - min_x) / 10)
-
-        else:
-            self.xmin = min(rangex)
-            self.xmax = max(rangex)
-
-        if rangey is None:
-            self.ymin = min_y - (abs(max_y - min_y) / 10)
-            self.ymax = max_y + (abs(max_y - min_y) / 10)
-        else:
-            self.ymin = min(rangey)
-            self.ymax = max(rangey)
-
-        xnorm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.xmin, self.xmax, plot._newxmin, plot._newxmax, _
-                    )
-                )
-                for _ in x
-            ]
-        )
-        ynorm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.ymin, self.ymax, plot._newymin, plot._newymax, _
-                    )
+        with measure(plot, "transform", self):
+            self.points = []
+            self.ticksx = ticksx
+            self.ticksy = ticksy
+
+            if pointer_index is None:
+                self._line_color = plot.color(line_color, self)
+            else:
+                self._line_color = plot._color_table.set(
+                    pointer_index, line_color, self
                 )
-                for _ in y
-            ]
-        )
 
-        if fill:
-            self.points.extend([xnorm[0], plot._newymin])
-            for index, item in enumerate(xnorm):
-                self.points.extend([item, ynorm[index]])
-            self.points.extend([xnorm[-1], plot._newymin])
-            self.points.extend([xnorm[0], plot._newymin])
-            array_points = array("i", self.points)
-            plot._display.poly(0, 0, array_points, self._line_color, True)
-
-        for index, _ in enumerate(xnorm):
-            if index + 1 >= len(xnorm):
-                break
-            if y[index] >= self.ymax:
-                continue
-
-            self._draw_plotline(plot, index, xnorm, ynorm)
-
-        if plot._showticks:
-            if plot._cartesianfirst:
-                plot._draw_ticks(x, y, self.ticksx, self.ticksy)
-                plot._cartesianfirst = False
-                plot._showticks = False
+            if line_style is None:
+                self._line_type = "-"
+            else:
+                self._line_type = line_style
+
+            if self._line_type not in ["-", ".", "- -", "-.-"]:
+                raise ValueError("line_style must be a valid option")
+            if decimate and self._line_type != "-":
+                raise ValueError("decimate can only be used with the solid line style")
+
+            max_x = max(x)
+            min_x = min(x)
+            max_y = max(y)
+            min_y = min(y)
+
+            if rangex is None:
+                self.xmin = min_x - (abs(max_x - min_x) / 10)
+                self.xmax = max_x + (abs(max_x - min_x) / 10)
+
+            else:
+                self.xmin = min(rangex)
+                self.xmax = max(rangex)
+
+            if rangey is None:
+                self.ymin = min_y - (abs(max_y - min_y) / 10)
+                self.ymax = max_y + (abs(max_y - min_y) / 10)
+            else:
+                self.ymin = min(rangey)
+                self.ymax = max(rangey)
+
+            xmapper = plot.mapper(self.xmin, self.xmax, plot._newxmin, plot._newxmax)
+            ymapper = plot.mapper(self.ymin, self.ymax, plot._newymin, plot._newymax)
+            if decimate:
+                xnorm, ynorm = decimate_columns(xmapper, ymapper, x, y)
+            else:
+                xnorm = xmapper.map(x)
+                ynorm = ymapper.map(y)
+
+            # Inside the axes, so lines and fill do not draw over them
+            self._box = (
+                plot._newxmin + 1,
+                plot._newymax + 1,
+                plot._newxmax - 1,
+                plot._newymin - 1,
+            )
+
+            if fill:
+                self.points.extend([xnorm[0], plot._newymin])
+                for index, item in enumerate(xnorm):
+                    self.points.extend([item, ynorm[index]])
+                self.points.extend([xnorm[-1], plot._newymin])
+                self.points.extend([xnorm[0], plot._newymin])
+                array_points = clip_polygon(array("i", self.points), self._box)
+                if array_points is not None:
+                    plot._display.poly(0, 0, array_points, self._line_color, True)
+
+            for index in range(len(xnorm) - 1):
+                self._draw_plotline(plot, index, xnorm, ynorm)
+
+            if plot._showticks:
+                if plot._cartesianfirst:
+                    plot._draw_ticks(x, y, self.ticksx, self.ticksy)
+                    plot._cartesianfirst = False
+                    plot._showticks = False
 
     def _draw_plotline(
-        self, plot: PLOT, index: int, xnorm: tuple, ynorm: tuple
+        self, plot: PLOT, index: int, xnorm: array, ynorm: array
     ) -> None:
         """
         Draw plot line
         :param PLOT plot: plot object provided
         :param int index: index of the point to be drawn
-        :param tuple xnorm: x points coordinates
-        :param tuple ynorm: y points coordinates
+        :param array xnorm: x points coordinates
+        :param array ynorm: y points coordinates
         """
         if self._line_type == "-":
             self._plot_line(plot, index, xnorm, ynorm)
@@ -167,28 +163,92 @@ class Cartesian:
             if index % 3 == 0:
                 self._plot_line(plot, index, xnorm, ynorm)
             else:
-                plot._display.pixel(xnorm[index], ynorm[index], self._line_color)
+                self._plot_pixel(plot, index, xnorm, ynorm)
         elif self._line_type == ".":
-            plot._display.pixel(xnorm[index], ynorm[index], self._line_color)
+            self._plot_pixel(plot, index, xnorm, ynorm)
         elif self._line_type == "- -":
             if index % 2 == 0:
                 self._plot_line(plot, index, xnorm, ynorm)
 
-    def _plot_line(self, plot: PLOT, index: int, xnorm: tuple, ynorm: tuple) -> None:
+    def _plot_line(self, plot: PLOT, index: int, xnorm: array, ynorm: array) -> None:
         """
         Draw plot line
         :param PLOT plot: plot object provided
         :param int index: index of the point to be drawn
-        :param tuple xnorm: x points coordinates
-        :param tuple ynorm: y points coordinates
+        :param array xnorm: x points coordinates
+        :param array ynorm: y points coordinates
         """
-        plot._display.line(
-            xnorm[index],
-            ynorm[index],
-            xnorm[index + 1],
-            ynorm[index + 1],
-            self._line_color,
+        segment = clip_line(
+            xnorm[index], ynorm[index], xnorm[index + 1], ynorm[index + 1], self._box
         )
+        if segment is not None:
+            plot._display.line(
+                segment[0], segment[1], segment[2], segment[3], self._line_color
+            )
+
+    def _plot_pixel(self, plot: PLOT, index: int, xnorm: array, ynorm: array) -> None:
+        """
+        Draw plot point
+        :param PLOT plot: plot object provided
+        :param int index: index of the point to be drawn
+        :param array xnorm: x points coordinates
+        :param array ynorm: y points coordinates
+        """
+        box = self._box
+        if box[0] <= xnorm[index] <= box[2] and box[1] <= ynorm[index] <= box[3]:
+            plot._display.pixel(xnorm[index], ynorm[index], self._line_color)
+
+
+def decimate_columns(xmapper: Mapper, ymapper: Mapper, x: list, y: list) -> tuple:
+    """
+    Converts the points to pixels keeping, for each run of points falling in
+    the same pixel column, only the first, minimum, maximum and last values.
+    The lines between the kept points cover the same pixels as the lines
+    between all the points. Points are read one at a time, only the kept
+    vertices are stored.
+
+    :param Mapper xmapper: x values mapper
+    :param Mapper ymapper: y values mapper
+    :param list x: x values
+    :param list y: y values
+
+    :return tuple: ``array('h')`` with the x and y pixel coordinates
+    """
+    xnorm = array("h")
+    ynorm = array("h")
+    column = None
+    first = last = low = high = 0
+    for index, value in enumerate(x):
+        xpixel = xmapper.pixel(value)
+        ypixel = ymapper.pixel(y[index])
+        if xpixel == column:
+            last = ypixel
+            if ypixel < low:
+                low = ypixel
+            elif ypixel > high:
+                high = ypixel
+            continue
+        if column is not None:
+            _add_column(xnorm, ynorm, column, first, low, high, last)
+        column = xpixel
+        first = last = low = high = ypixel
+    if column is not None:
+        _add_column(xnorm, ynorm, column, first, low, high, last)
+    return xnorm, ynorm
+
+
+def _add_column(
+    xnorm: array, ynorm: array, column: int, first: int, low: int, high: int, last: int
+) -> None:
+    """
+    Adds the vertices of a pixel column, skipping repeated values
+    """
+    previous = None
+    for value in (first, low, high, last):
+        if value != previous:
+            xnorm.append(column)
+            ynorm.append(value)
+            previous = value
 
 
 class LineStyle:
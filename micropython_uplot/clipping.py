@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`clipping`
+================================================================================
+
+Line and polygon clipping against the plot area
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from array import array
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+# pylint: disable=too-many-arguments
+
+_LEFT = 1
+_RIGHT = 2
+_TOP = 4
+_BOTTOM = 8
+
+
+def _outcode(x, y, box: tuple) -> int:
+    """
+    Cohen-Sutherland region code of a point
+    """
+    code = 0
+    if x < box[0]:
+        code = _LEFT
+    elif x > box[2]:
+        code = _RIGHT
+    if y < box[1]:
+        code = code | _TOP
+    elif y > box[3]:
+        code = code | _BOTTOM
+    return code
+
+
+def clip_line(xstart: int, ystart: int, xend: int, yend: int, box: tuple):
+    """
+    Clips a line against a rectangle using the Cohen-Sutherland algorithm
+
+    :param int xstart: x coordinate of the line start
+    :param int ystart: y coordinate of the line start
+    :param int xend: x coordinate of the line end
+    :param int yend: y coordinate of the line end
+    :param tuple box: ``(xmin, ymin, xmax, ymax)`` rectangle, limits included
+
+    :return tuple|None: clipped line coordinates, or None if the line is
+     outside the rectangle
+    """
+    code0 = _outcode(xstart, ystart, box)
+    code1 = _outcode(xend, yend, box)
+    if not code0 | code1:
+        return xstart, ystart, xend, yend
+
+    while code0 | code1:
+        if code0 & code1:
+            return None
+        code = code0 or code1
+        if code & _BOTTOM:
+            x = xstart + (xend - xstart) * (box[3] - ystart) / (yend - ystart)
+            y = box[3]
+        elif code & _TOP:
+            x = xstart + (xend - xstart) * (box[1] - ystart) / (yend - ystart)
+            y = box[1]
+        elif code & _RIGHT:
+            y = ystart + (yend - ystart) * (box[2] - xstart) / (xend - xstart)
+            x = box[2]
+        else:
+            y = ystart + (yend - ystart) * (box[0] - xstart) / (xend - xstart)
+            x = box[0]
+        if code == code0:
+            xstart, ystart = x, y
+            code0 = _outcode(x, y, box)
+        else:
+            xend, yend = x, y
+            code1 = _outcode(x, y, box)
+
+    return (
+        _limit(xstart, box[0], box[2]),
+        _limit(ystart, box[1], box[3]),
+        _limit(xend, box[0], box[2]),
+        _limit(yend, box[1], box[3]),
+    )
+
+
+def _round(value) -> int:
+    """
+    Rounds a coordinate to the nearest integer
+    """
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(0.5 - value)
+
+
+def _limit(value, low: int, high: int) -> int:
+    """
+    Rounds a coordinate and keeps it inside the limits
+    """
+    value = _round(value)
+    if value < low:
+        return low
+    if value > high:
+        return high
+    return value
+
+
+def clip_polygon(coords, box: tuple):
+    """
+    Clips a polygon against a rectangle using the Sutherland-Hodgman
+    algorithm. Polygons completely inside the rectangle are returned as they are.
+
+    :param coords: polygon vertices as a flat ``x0, y0, x1, y1, ...`` sequence
+    :param tuple box: ``(xmin, ymin, xmax, ymax)`` rectangle, limits included
+
+    :return array|None: ``array('i')`` with the clipped vertices, or None if
+     nothing is left inside the rectangle
+    """
+    inside = True
+    for index in range(0, len(coords) - 1, 2):
+        if _outcode(coords[index], coords[index + 1], box):
+            inside = False
+            break
+    if inside:
+        return coords
+
+    points = coords
+    for edge in (_LEFT, _RIGHT, _TOP, _BOTTOM):
+        points = _clip_edge(points, edge, box)
+        if len(points) < 6:
+            return None
+    return points
+
+
+def _clip_edge(coords, edge: int, box: tuple) -> array:
+    """
+    Clips a polygon against one side of the rectangle
+    """
+    result = array("i")
+    count = len(coords) // 2
+    xprev = coords[2 * count - 2]
+    yprev = coords[2 * count - 1]
+    prev_inside = not _outcode(xprev, yprev, box) & edge
+    for index in range(count):
+        x = coords[2 * index]
+        y = coords[2 * index + 1]
+        current_inside = not _outcode(x, y, box) & edge
+        if current_inside != prev_inside:
+            if edge in (_LEFT, _RIGHT):
+                limit = box[0] if edge == _LEFT else box[2]
+                result.append(limit)
+                result.append(
+                    _round(yprev + (y - yprev) * (limit - xprev) / (x - xprev))
+                )
+            else:
+                limit = box[1] if edge == _TOP else box[3]
+                result.append(
+                    _round(xprev + (x - xprev) * (limit - yprev) / (y - yprev))
+                )
+                result.append(limit)
+        if current_inside:
+            result.append(x)
+            result.append(y)
+        xprev = x
+        yprev = y
+        prev_inside = current_inside
+    return result
@@ -13,12 +13,16 @@ MicroPython Graphics Library
 
 """
 
+from micropython_uplot.proxy import DisplayProxy
+
 
 def create_color(ssd, idx, r, g, b):
     """
     Creates a color in the LUT of the display and returns the index.
 
     """
+    if not 0 <= idx < len(ssd.lut) // 2:
+        raise ValueError("Color index %d is outside the display color table" % idx)
 
     color = ssd.rgb(r, g, b)
 
@@ -35,3 +39,162 @@ def set_color(display, idx, r, g, b):
     if hasattr(display, "lut"):
         return create_color(display, idx, r, g, b)
     return display.rgb(r, g, b)
+
+
+class ColorTable:
+    """
+    Hands out display colors. For displays with a ``lut`` each color gets a
+    slot of the table, and a color already in the table reuses its slot.
+    Slots are held by owners, usually charts. Once every owner released a
+    slot it keeps its color, so it is reused if the color is asked again, but
+    it can be given to a new color. The least recently used one goes first.
+    For other displays the ``rgb`` conversions are cached.
+
+    Use :func:`color_table` to get the table shared by every plot of a display.
+
+    :param display: display object
+
+    """
+
+    def __init__(self, display) -> None:
+        self._display = display
+        self._lut = getattr(display, "lut", None)
+        size = len(self._lut) // 2 if self._lut is not None else 0
+        self._native = {}
+        self._slots = {}
+        self._colors = [None] * size
+        self._owners = [[] for _ in range(size)]
+        self._used = [0] * size
+        self._clock = 0
+
+    def native(self, color: tuple) -> int:
+        """
+        Returns the display value of a color, converted once with ``rgb``
+
+        :param tuple color: color as ``(r, g, b)``
+        :return int: display color value
+        """
+        color = tuple(color)
+        value = self._native.get(color)
+        if value is None:
+            value = self._display.rgb(color[0], color[1], color[2])
+            self._native[color] = value
+        return value
+
+    def get(self, color: tuple, owner) -> int:
+        """
+        Returns the value to draw a color with. For displays with a ``lut``
+        the color slot is held by ``owner`` until :meth:`release` is called.
+
+        :param tuple color: color as ``(r, g, b)``
+        :param owner: object holding the slot
+        :return int: slot index, or display color value
+        """
+        if self._lut is None:
+            return self.native(color)
+
+        color = tuple(color)
+        slot = self._slots.get(color)
+        if slot is None:
+            slot = self._free_slot()
+            self._write(slot, color)
+        self._hold(slot, owner)
+        return slot
+
+    def set(self, slot: int, color: tuple, owner) -> int:
+        """
+        Writes a color in a given slot, held by ``owner``. A slot holding
+        another color for other owners is not overwritten, a ``ValueError`` is
+        raised instead.
+
+        :param int slot: slot index
+        :param tuple color: color as ``(r, g, b)``
+        :param owner: object holding the slot
+        :return int: slot index, or display color value
+        """
+        if self._lut is None:
+            return self.native(color)
+        if not 0 <= slot < len(self._colors):
+            raise ValueError("Color index %d is outside the display color table" % slot)
+
+        color = tuple(color)
+        if self._colors[slot] != color:
+            for holder in self._owners[slot]:
+                if holder is not owner:
+                    raise ValueError("Color index %d is used by another chart" % slot)
+            self._write(slot, color)
+        self._hold(slot, owner)
+        return slot
+
+    def release(self, owner) -> None:
+        """
+        Releases every slot held by ``owner``
+
+        :param owner: object holding the slots
+        :return: None
+        """
+        for owners in self._owners:
+            while owner in owners:
+                owners.remove(owner)
+
+    def _hold(self, slot: int, owner) -> None:
+        """
+        Adds an owner to a slot and marks it as used
+        """
+        if owner not in self._owners[slot]:
+            self._owners[slot].append(owner)
+        self._clock += 1
+        self._used[slot] = self._clock
+
+    def _free_slot(self) -> int:
+        """
+        Returns an empty slot, or the least recently used slot without owners
+        """
+        slot = None
+        for index, color in enumerate(self._colors):
+            if color is None:
+                return index
+            if not self._owners[index]:
+                if slot is None or self._used[index] < self._used[slot]:
+                    slot = index
+        if slot is None:
+            raise ValueError(
+                "The display color table is full, %d colors are in use"
+                % len(self._colors)
+            )
+        return slot
+
+    def _write(self, slot: int, color: tuple) -> None:
+        """
+        Writes a color in the display color table
+        """
+        previous = self._colors[slot]
+        if self._slots.get(previous) == slot:
+            del self._slots[previous]
+        self._colors[slot] = color
+        self._slots[color] = slot
+        value = self.native(color)
+        self._lut[2 * slot] = value & 0xFF
+        self._lut[2 * slot + 1] = value >> 8
+
+
+def color_table(display) -> ColorTable:
+    """
+    Returns the color table of a display, shared by every plot drawing on it.
+    Display proxies are looked through, so the wrapped display is used. The
+    table is kept as an attribute of the display, so it is freed with it.
+    Displays not accepting attributes get a new table each time.
+
+    :param display: display object
+    :return ColorTable: display color table
+    """
+    while isinstance(display, DisplayProxy):
+        display = display.display
+    table = getattr(display, "_uplot_color_table", None)
+    if table is None:
+        table = ColorTable(display)
+        try:
+            display._uplot_color_table = table
+        except AttributeError:
+            pass
+    return table
@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+"""
+
+`density`
+================================================================================
+
+MicroPython density graph, a 2D histogram for large point sets
+
+* Author: Jose D. Montoya
+
+
+"""
+try:
+    from typing import Optional, Union
+    from micropython_uplot.plot import PLOT
+except ImportError:
+    pass
+
+from math import log
+from micropython_uplot.map import fade_palette
+from micropython_uplot.palette import Palette, get_palette
+from micropython_uplot.stats import measure
+from micropython_uplot.utils import zeros
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+
+class Density:
+    """
+    Counts points in a fixed grid of bins and draws the grid as a color map.
+    Points are read one by one from any iterable, so memory only depends on
+    the number of bins and very large data sets can be plotted.
+    """
+
+    def __init__(
+        self,
+        plot: PLOT,
+        points,
+        rangex: list,
+        rangey: list,
+        bins: tuple = (32, 24),
+        initial_color: tuple = (0, 0, 255),
+        final_color: tuple = (255, 0, 0),
+        levels: int = 10,
+        log_scale: bool = False,
+        palette: Optional[Union[str, Palette]] = None,
+    ) -> None:
+        """
+
+        :param PLOT plot: Plot object for the density to be drawn
+        :param points: iterable of ``(x, y)`` pairs, for example ``zip(x, y)``.
+         Points outside the ranges are ignored
+        :param list rangex: x range limits
+        :param list rangey: y range limits
+        :param tuple bins: number of bins in the x and y directions.
+         Defaults to ``(32, 24)``
+        :param tuple initial_color: color used for the bins with fewer points
+        :param tuple final_color: color used for the bins with more points
+        :param int levels: number of colors. Defaults to :const:`10`
+        :param bool log_scale: select the color using the logarithm of the
+         count. Defaults to `False`
+        :param str|Palette|None palette: palette, or registered palette name, used
+         instead of the initial and final colors. The number of levels is then
+         the number of palette colors. Defaults to None
+
+        """
+        with measure(plot, "transform", self):
+            self._plot = plot
+            self._columns = bins[0]
+            self._rows = bins[1]
+            self._log_scale = log_scale
+
+            self.xmin = min(rangex)
+            self.xmax = max(rangex)
+            self.ymin = min(rangey)
+            self.ymax = max(rangey)
+            if self.xmin == self.xmax or self.ymin == self.ymax:
+                raise ValueError("Range minimum and maximum can not be the same value")
+
+            if palette is None:
+                palette = fade_palette(initial_color, final_color, levels)
+            elif isinstance(palette, str):
+                palette = get_palette(palette)
+            self._levels = len(palette)
+            self._colors = palette.native(plot._display, self)
+
+            self.counts = zeros("I", self._columns * self._rows)
+            self.total = 0
+            self.add(points)
+            self.draw()
+
+            if plot._showticks:
+                plot._draw_ticks(rangex, rangey)
+                plot._showticks = False
+
+    def add(self, points) -> None:
+        """
+        Counts new points. Call :meth:`draw` to show them
+
+        :param points: iterable of ``(x, y)`` pairs
+        :return: None
+        """
+        with measure(self._plot, "transform", self):
+            counts = self.counts
+            columns = self._columns
+            rows = self._rows
+            xmin = self.xmin
+            xmax = self.xmax
+            ymin = self.ymin
+            ymax = self.ymax
+            xscale = columns / (xmax - xmin)
+            yscale = rows / (ymax - ymin)
+            total = 0
+
+            for x, y in points:
+                if xmin <= x <= xmax and ymin <= y <= ymax:
+                    column = int((x - xmin) * xscale)
+                    if column == columns:
+                        column -= 1
+                    row = int((y - ymin) * yscale)
+                    if row == rows:
+                        row -= 1
+                    counts[row * columns + column] += 1
+                    total += 1
+
+            self.total = self.total + total
+
+    def clear(self) -> None:
+        """
+        Sets every count to zero
+
+        :return: None
+        """
+        self.counts = zeros("I", self._columns * self._rows)
+        self.total = 0
+
+    def _level(self, count: int, maximum: int) -> int:
+        """
+        Returns the color level of a bin
+        """
+        if self._log_scale:
+            return int(log(count) * self._levels / log(maximum + 1))
+        return (count - 1) * self._levels // maximum
+
+    def draw(self) -> None:
+        """
+        Draws the bins inside the plot box. Empty bins are not drawn, and
+        consecutive bins with the same color in a row are drawn together
+
+        :return: None
+        """
+        with measure(self._plot, "transform", self):
+            plot = self._plot
+            columns = self._columns
+            counts = self.counts
+            colors = self._colors
+            xdist = (plot._newxmax - plot._newxmin - 1) // columns
+            ydist = (plot._newymin - plot._newymax - 1) // self._rows
+            left = plot._newxmin + 1
+            maximum = max(counts)
+            if not maximum:
+                return
+
+            deltay = plot._newymax + 1
+            for row in range(self._rows - 1, -1, -1):
+                start = row * columns
+                column = 0
+                while column < columns:
+                    count = counts[start + column]
+                    if not count:
+                        column += 1
+                        continue
+                    level = self._level(count, maximum)
+                    end = column + 1
+                    while end < columns:
+                        count = counts[start + end]
+                        if not count or self._level(count, maximum) != level:
+                            break
+                        end += 1
+                    plot._display.rect(
+                        left + column * xdist,
+                        deltay,
+                        (end - column) * xdist,
+                        ydist,
+                        colors[level],
+                        True,
+                    )
+                    column = end
+                deltay = deltay + ydist
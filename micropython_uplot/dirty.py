@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`dirty`
+================================================================================
+
+Dirty rectangle tracking, so drivers can refresh only the changed regions
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from micropython_uplot.proxy import DisplayProxy
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+
+class DirtyTracker(DisplayProxy):
+    """
+    Display proxy that collects the bounding boxes of the drawn primitives.
+    Overlapping or touching boxes are merged, and when there are more than
+    ``max_regions`` boxes the two whose union grows the least are merged.
+
+    :param display: display object to wrap
+    :param int max_regions: maximum number of regions kept. Defaults to :const:`8`
+
+    """
+
+    def __init__(self, display, max_regions: int = 8) -> None:
+        super().__init__(display)
+        self._max_regions = max_regions
+        self._regions = []
+        self._width = getattr(display, "width", 0x7FFF)
+        self._height = getattr(display, "height", 0x7FFF)
+
+    def _record(self, x: int, y: int, width: int, height: int) -> None:
+        xstart = max(x, 0)
+        ystart = max(y, 0)
+        xend = min(x + width, self._width)
+        yend = min(y + height, self._height)
+        if xstart >= xend or ystart >= yend:
+            return
+
+        regions = self._regions
+        if regions:
+            last = regions[-1]
+            if (
+                last[0] <= xstart
+                and last[1] <= ystart
+                and xend <= last[2]
+                and yend <= last[3]
+            ):
+                return
+
+        index = 0
+        while index < len(regions):
+            region = regions[index]
+            if (
+                xstart <= region[2]
+                and region[0] <= xend
+                and ystart <= region[3]
+                and region[1] <= yend
+            ):
+                xstart = min(xstart, region[0])
+                ystart = min(ystart, region[1])
+                xend = max(xend, region[2])
+                yend = max(yend, region[3])
+                regions.pop(index)
+                index = 0
+            else:
+                index += 1
+        regions.append([xstart, ystart, xend, yend])
+
+        if len(regions) > self._max_regions:
+            self._merge_closest()
+
+    def _merge_closest(self) -> None:
+        """
+        Merges the two regions whose union adds the least area
+        """
+        regions = self._regions
+        best_growth = None
+        for first, region_a in enumerate(regions):
+            for second in range(first + 1, len(regions)):
+                region_b = regions[second]
+                xstart = min(region_a[0], region_b[0])
+                ystart = min(region_a[1], region_b[1])
+                xend = max(region_a[2], region_b[2])
+                yend = max(region_a[3], region_b[3])
+                growth = (
+                    (xend - xstart) * (yend - ystart)
+                    - (region_a[2] - region_a[0]) * (region_a[3] - region_a[1])
+                    - (region_b[2] - region_b[0]) * (region_b[3] - region_b[1])
+                )
+                if best_growth is None or growth < best_growth:
+                    best_growth = growth
+                    best_pair = (first, second)
+                    merged = [xstart, ystart, xend, yend]
+        regions.pop(best_pair[1])
+        regions[best_pair[0]] = merged
+
+    @property
+    def regions(self) -> list:
+        """
+        List of dirty regions as ``(x, y, width, height)`` tuples
+        """
+        return [
+            (region[0], region[1], region[2] - region[0], region[3] - region[1])
+            for region in self._regions
+        ]
+
+    def clear(self) -> None:
+        """
+        Forgets the collected regions
+
+        :return: None
+        """
+        self._regions = []
@@ -0,0 +1,624 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`displaylist`
+================================================================================
+
+Display list keeping the drawing calls of a plot, so it can be drawn again
+without computing the charts
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from array import array
+from micropython_uplot.proxy import DisplayProxy
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+# pylint: disable=too-many-arguments, too-many-branches, too-many-locals
+# pylint: disable=too-many-statements, too-many-instance-attributes
+
+# Opcodes, followed in the arguments array by:
+_HLINE = 0  # x, y, width, color
+_VLINE = 1  # x, y, height, color
+_LINE = 2  # xstart, ystart, xend, yend, color
+_RECT = 3  # x, y, width, height, color, fill
+_PIXEL = 4  # x, y, color
+_POLY = 5  # x, y, color, fill, number of values, coordinates
+_TEXT = 6  # string index, x, y, color or -1
+_BLIT = 7  # buffer index, x, y, key, palette index or -1
+_ELLIPSE = 8  # x, y, xradius, yradius, color, fill or -1, mask or -1
+_FILL_RECT = 9  # x, y, width, height, color
+_FILL = 10  # color
+_SCROLL = 11  # xstep, ystep
+
+# Positions of the object indexes in the arguments of each opcode
+_REFERENCES = {_TEXT: (0,), _BLIT: (0, 4)}
+
+_MAX_LAYERS = 256
+
+# Rows spanned by the calls that change the whole display
+_TOP = -0x40000000
+_BOTTOM = 0x3FFFFFFF
+
+_FONT_HEIGHT = 8
+
+
+class DisplayList(DisplayProxy):
+    """
+    Display proxy keeping every drawing call in a display list, while the
+    calls are forwarded to the wrapped display. Opcodes and integer arguments
+    are stored in ``array`` buffers, strings and blitted buffers in a list.
+    :meth:`replay` draws the list again in a single loop, without running
+    the chart code.
+
+    Calls are recorded in the current layer, see :meth:`layer`. A layer can be
+    cleared with :meth:`clear` and drawn again, leaving the other layers
+    untouched. Drawing over the same area keeps adding calls, so layers that
+    are redrawn often should be cleared first.
+
+    The rows spanned by each call are kept too, so the list can be drawn in
+    horizontal bands with :func:`render_bands`. The wrapped display then does
+    not need a frame buffer, and calls can be only recorded with ``forward``.
+
+    Charts drawing themselves again, like :class:`Logging` and :class:`Map`,
+    mark their calls with :meth:`owner` and replace them, so the list does
+    not keep growing while they are updated.
+
+    Colors are kept as display color values, displays with a ``lut`` show the
+    current table colors when replayed. Blitted buffers are kept by reference
+    and must not be modified after being drawn.
+
+    :param display: display object to wrap
+    :param bool forward: draw the calls on the wrapped display as they are
+     recorded. Defaults to `True`
+
+    """
+
+    # The frame buffer is not written directly while recording, see
+    # framebuffer.direct_buffer, so every change is a drawing call
+    retained = True
+
+    def __init__(self, display, forward: bool = True) -> None:
+        super().__init__(display)
+        self._forward = forward
+        self._opcodes = array("B")
+        self._layers = array("B")
+        self._starts = array("I")
+        self._tops = array("i")
+        self._bottoms = array("i")
+        self._args = array("i")
+        self._objects = []
+        self._indexes = {}
+        self._layer_ids = {"default": 0}
+        self._layer = 0
+        self._owners = array("H")
+        self._owner_ids = {}
+        self._owner = None
+        self._owner_id = 0
+        self._scrolled = False
+
+    def __len__(self) -> int:
+        return len(self._opcodes)
+
+    def layer(self, name: str = "default") -> None:
+        """
+        Selects the layer the next drawing calls are recorded in. Layers are
+        created when first selected.
+
+        :param str name: layer name. Defaults to ``"default"``
+        :return: None
+        """
+        layer_id = self._layer_ids.get(name)
+        if layer_id is None:
+            layer_id = len(self._layer_ids)
+            if layer_id >= _MAX_LAYERS:
+                raise ValueError("A display list can have %d layers" % _MAX_LAYERS)
+            self._layer_ids[name] = layer_id
+        self._layer = layer_id
+
+    def clear(self, layer: str = None) -> None:
+        """
+        Forgets the drawing calls recorded in a layer, the display is not
+        modified.
+
+        :param str|None layer: layer name, None forgets every layer. Defaults to None
+        :return: None
+        """
+        if layer is None:
+            self._compact(None, None)
+        else:
+            self._compact(self._layers, self._layer_ids.get(layer))
+
+    def owner(self, owner=None):
+        """
+        Sets the object owning the next drawing calls, for charts that draw
+        themselves again and replace their previous calls with :meth:`forget`
+
+        :param owner: owner object, None for no owner. Defaults to None
+        :return: previous owner object
+        """
+        previous = self._owner
+        self._owner = owner
+        self._owner_id = 0
+        if owner is not None:
+            self._owner_id = self._owner_ids.get(owner, 0)
+            if not self._owner_id:
+                self._owner_id = len(self._owner_ids) + 1
+                self._owner_ids[owner] = self._owner_id
+        return previous
+
+    def forget(self, owner) -> None:
+        """
+        Forgets the drawing calls made while ``owner`` owned them, the display
+        is not modified.
+
+        :param owner: owner object
+        :return: None
+        """
+        owner_id = self._owner_ids.get(owner)
+        if owner_id is not None:
+            self._compact(self._owners, owner_id)
+
+    def _compact(self, values, dropped) -> None:
+        """
+        Keeps the calls whose entry in ``values`` is not ``dropped``, every
+        call is dropped when ``values`` is None
+        """
+        opcodes = self._opcodes
+        layers = self._layers
+        owners = self._owners
+        starts = self._starts
+        tops = self._tops
+        bottoms = self._bottoms
+        args = self._args
+        objects = self._objects
+        self._opcodes = array("B")
+        self._layers = array("B")
+        self._owners = array("H")
+        self._starts = array("I")
+        self._tops = array("i")
+        self._bottoms = array("i")
+        self._args = array("i")
+        self._objects = []
+        self._indexes = {}
+        self._scrolled = False
+        if values is None:
+            return
+
+        layer = self._layer
+        owner_id = self._owner_id
+        count = len(opcodes)
+        for command in range(count):
+            if values[command] == dropped:
+                continue
+            start = starts[command]
+            end = starts[command + 1] if command + 1 < count else len(args)
+            arguments = args[start:end]
+            for position in _REFERENCES.get(opcodes[command], ()):
+                if arguments[position] >= 0:
+                    arguments[position] = self._intern(objects[arguments[position]])
+            if opcodes[command] == _SCROLL:
+                self._scrolled = True
+            self._layer = layers[command]
+            self._owner_id = owners[command]
+            self._add(opcodes[command], arguments, tops[command], bottoms[command])
+        self._layer = layer
+        self._owner_id = owner_id
+
+    def _intern(self, item) -> int:
+        """
+        Returns the index of an object in the object list, adding it if needed
+        """
+        key = id(item)
+        index = self._indexes.get(key)
+        if index is None:
+            index = len(self._objects)
+            self._objects.append(item)
+            self._indexes[key] = index
+        return index
+
+    def _add(self, opcode: int, values, top: int, bottom: int) -> None:
+        """
+        Adds a drawing call to the current layer, spanning the rows from
+        ``top`` to ``bottom``, bottom not included
+        """
+        self._opcodes.append(opcode)
+        self._layers.append(self._layer)
+        self._owners.append(self._owner_id)
+        self._starts.append(len(self._args))
+        self._tops.append(top)
+        self._bottoms.append(bottom)
+        # array.extend only takes arrays of the same type on MicroPython
+        args = self._args
+        for value in values:
+            args.append(value)
+
+    def _wanted(self, layers) -> bytearray:
+        """
+        Returns a flag for each layer id, set for the layers to draw
+        """
+        wanted = bytearray(_MAX_LAYERS)
+        if layers is None:
+            for layer_id in range(_MAX_LAYERS):
+                wanted[layer_id] = 1
+        else:
+            for name in layers:
+                if name not in self._layer_ids:
+                    raise ValueError("Unknown layer %s" % name)
+                wanted[self._layer_ids[name]] = 1
+        return wanted
+
+    def replay(self, display=None, layers=None) -> None:
+        """
+        Draws the recorded calls again, in the order they were made
+
+        :param display: display object to draw into. Defaults to the wrapped display
+        :param list|None layers: names of the layers to draw, None draws every
+         layer. Defaults to None
+        :return: None
+        """
+        if display is None:
+            display = self.display
+        self._draw(display, self._wanted(layers), 0, 0, _TOP, _BOTTOM)
+
+    def extent(self) -> tuple:
+        """
+        Returns the rows spanned by the recorded calls
+
+        :return tuple: first row and the row after the last one, ``(0, 0)``
+         when nothing was recorded
+        """
+        if not self._opcodes:
+            return 0, 0
+        return min(self._tops), max(self._bottoms)
+
+    def _draw(
+        self,
+        display,
+        wanted: bytearray,
+        xshift: int,
+        yshift: int,
+        top: int,
+        bottom: int,
+    ) -> None:
+        """
+        Draws the calls of the wanted layers crossing the rows from ``top`` to
+        ``bottom``, moved by ``xshift`` and ``yshift``
+        """
+        opcodes = self._opcodes
+        layer_of = self._layers
+        starts = self._starts
+        tops = self._tops
+        bottoms = self._bottoms
+        args = self._args
+        objects = self._objects
+        values = memoryview(args)
+        hline = display.hline
+        vline = display.vline
+        line = display.line
+        rect = display.rect
+
+        for command, opcode in enumerate(opcodes):
+            if (
+                not wanted[layer_of[command]]
+                or tops[command] >= bottom
+                or bottoms[command] <= top
+            ):
+                continue
+            start = starts[command]
+            if opcode == _HLINE:
+                hline(
+                    args[start] + xshift,
+                    args[start + 1] + yshift,
+                    args[start + 2],
+                    args[start + 3],
+                )
+            elif opcode == _VLINE:
+                vline(
+                    args[start] + xshift,
+                    args[start + 1] + yshift,
+                    args[start + 2],
+                    args[start + 3],
+                )
+            elif opcode == _LINE:
+                line(
+                    args[start] + xshift,
+                    args[start + 1] + yshift,
+                    args[start + 2] + xshift,
+                    args[start + 3] + yshift,
+                    args[start + 4],
+                )
+            elif opcode == _RECT:
+                if args[start + 5]:
+                    rect(
+                        args[start] + xshift,
+                        args[start + 1] + yshift,
+                        args[start + 2],
+                        args[start + 3],
+                        args[start + 4],
+                        True,
+                    )
+                else:
+                    rect(
+                        args[start] + xshift,
+                        args[start + 1] + yshift,
+                        args[start + 2],
+                        args[start + 3],
+                        args[start + 4],
+                    )
+            elif opcode == _PIXEL:
+                display.pixel(
+                    args[start] + xshift, args[start + 1] + yshift, args[start + 2]
+                )
+            elif opcode == _POLY:
+                end = start + 5 + args[start + 4]
+                if args[start + 3]:
+                    display.poly(
+                        args[start] + xshift,
+                        args[start + 1] + yshift,
+                        values[start + 5 : end],
+                        args[start + 2],
+                        True,
+                    )
+                else:
+                    display.poly(
+                        args[start] + xshift,
+                        args[start + 1] + yshift,
+                        values[start + 5 : end],
+                        args[start + 2],
+                    )
+            elif opcode == _TEXT:
+                string = objects[args[start]]
+                if args[start + 3] < 0:
+                    display.text(
+                        string, args[start + 1] + xshift, args[start + 2] + yshift
+                    )
+                else:
+                    display.text(
+                        string,
+                        args[start + 1] + xshift,
+                        args[start + 2] + yshift,
+                        args[start + 3],
+                    )
+            elif opcode == _BLIT:
+                buffer = objects[args[start]]
+                if args[start + 4] >= 0:
+                    display.blit(
+                        buffer,
+                        args[start + 1] + xshift,
+                        args[start + 2] + yshift,
+                        args[start + 3],
+                        objects[args[start + 4]],
+                    )
+                elif args[start + 3] != -1:
+                    display.blit(
+                        buffer,
+                        args[start + 1] + xshift,
+                        args[start + 2] + yshift,
+                        args[start + 3],
+                    )
+                else:
+                    display.blit(
+                        buffer, args[start + 1] + xshift, args[start + 2] + yshift
+                    )
+            elif opcode == _ELLIPSE:
+                options = []
+                if args[start + 5] >= 0:
+                    options.append(bool(args[start + 5]))
+                    if args[start + 6] >= 0:
+                        options.append(args[start + 6])
+                display.ellipse(
+                    args[start] + xshift,
+                    args[start + 1] + yshift,
+                    args[start + 2],
+                    args[start + 3],
+                    args[start + 4],
+                    *options,
+                )
+            elif opcode == _FILL_RECT:
+                display.fill_rect(
+                    args[start] + xshift,
+                    args[start + 1] + yshift,
+                    args[start + 2],
+                    args[start + 3],
+                    args[start + 4],
+                )
+            elif opcode == _FILL:
+                display.fill(args[start])
+            elif opcode == _SCROLL:
+                display.scroll(args[start], args[start + 1])
+
+    def pixel(self, x: int, y: int, *color):
+        if color:
+            self._add(_PIXEL, (x, y, color[0]), y, y + 1)
+            if not self._forward:
+                return None
+        return self.display.pixel(x, y, *color)
+
+    def line(self, xstart: int, ystart: int, xend: int, yend: int, color: int) -> None:
+        self._add(
+            _LINE,
+            (xstart, ystart, xend, yend, color),
+            min(ystart, yend),
+            max(ystart, yend) + 1,
+        )
+        if self._forward:
+            self.display.line(xstart, ystart, xend, yend, color)
+
+    def hline(self, x: int, y: int, width: int, color: int) -> None:
+        self._add(_HLINE, (x, y, width, color), y, y + 1)
+        if self._forward:
+            self.display.hline(x, y, width, color)
+
+    def vline(self, x: int, y: int, height: int, color: int) -> None:
+        self._add(_VLINE, (x, y, height, color), y, y + height)
+        if self._forward:
+            self.display.vline(x, y, height, color)
+
+    def rect(self, x: int, y: int, width: int, height: int, color: int, *fill):
+        self._add(
+            _RECT,
+            (x, y, width, height, color, 1 if fill and fill[0] else 0),
+            y,
+            y + height,
+        )
+        if self._forward:
+            self.display.rect(x, y, width, height, color, *fill)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int):
+        self._add(_FILL_RECT, (x, y, width, height, color), y, y + height)
+        if self._forward:
+            self.display.fill_rect(x, y, width, height, color)
+
+    def ellipse(self, x: int, y: int, xradius: int, yradius: int, color: int, *args):
+        fill = 1 if args and args[0] else 0
+        self._add(
+            _ELLIPSE,
+            (
+                x,
+                y,
+                xradius,
+                yradius,
+                color,
+                fill if args else -1,
+                args[1] if len(args) > 1 else -1,
+            ),
+            y - yradius,
+            y + yradius + 1,
+        )
+        if self._forward:
+            self.display.ellipse(x, y, xradius, yradius, color, *args)
+
+    def poly(self, x: int, y: int, coords, color: int, *fill):
+        # Arrays can not be sliced with a step on MicroPython
+        top = bottom = y
+        if len(coords) >= 2:
+            rows = [coords[index] for index in range(1, len(coords), 2)]
+            top = y + min(rows)
+            bottom = y + max(rows) + 1
+        values = [x, y, color, 1 if fill and fill[0] else 0, len(coords)]
+        values.extend(coords)
+        self._add(_POLY, values, top, bottom)
+        if self._forward:
+            self.display.poly(x, y, coords, color, *fill)
+
+    def text(self, string: str, x: int, y: int, *color) -> None:
+        self._add(
+            _TEXT,
+            (self._intern(string), x, y, color[0] if color else -1),
+            y,
+            y + _FONT_HEIGHT,
+        )
+        if self._forward:
+            self.display.text(string, x, y, *color)
+
+    def fill(self, color: int) -> None:
+        self._add(_FILL, (color,), _TOP, _BOTTOM)
+        if self._forward:
+            self.display.fill(color)
+
+    def blit(self, buffer, x: int, y: int, *args) -> None:
+        key = args[0] if args else -1
+        palette = self._intern(args[1]) if len(args) > 1 and args[1] else -1
+        height = getattr(buffer, "height", None)
+        self._add(
+            _BLIT,
+            (self._intern(buffer), x, y, key, palette),
+            _TOP if height is None else y,
+            _BOTTOM if height is None else y + height,
+        )
+        if self._forward:
+            self.display.blit(buffer, x, y, *args)
+
+    def scroll(self, xstep: int, ystep: int) -> None:
+        self._add(_SCROLL, (xstep, ystep), _TOP, _BOTTOM)
+        self._scrolled = True
+        if self._forward:
+            self.display.scroll(xstep, ystep)
+
+
+def draw_owned(display, owner, replace: bool, draw, *args) -> None:
+    """
+    Calls ``draw`` with ``args``, marking the calls recorded by a display list
+    as owned by ``owner``. With ``replace`` the calls ``owner`` made before are
+    forgotten first. Other displays are drawn on directly.
+
+    :param display: display object drawn on
+    :param owner: owner object
+    :param bool replace: forget the previous calls of the owner
+    :param draw: drawing function
+    :return: None
+    """
+    if not getattr(display, "retained", False):
+        draw(*args)
+        return
+    if replace:
+        display.forget(owner)
+    previous = display.owner(owner)
+    try:
+        draw(*args)
+    finally:
+        display.owner(previous)
+
+
+def render_bands(
+    display_lists,
+    canvas,
+    callback,
+    x: int,
+    y: int,
+    width: int,
+    height: int,
+    layers=None,
+    background: int = 0,
+) -> None:
+    """
+    Draws a rectangle of the display one horizontal band at a time, from one
+    or more display lists. Each band is cleared, only the calls crossing it
+    are drawn into ``canvas``, and the canvas is handed to ``callback`` before
+    being used for the next band. Calls scrolling the display can not be
+    drawn in bands.
+
+    :param list display_lists: display lists to draw, in order
+    :param canvas: drawable canvas as wide as the rectangle, with ``width``
+     and ``height`` attributes, see :func:`framebuffer.drawable_canvas`. Its
+     height is the number of rows of a band
+    :param callback: function called with the canvas, the display coordinates
+     of its origin and the number of rows of the band to use
+    :param int x: rectangle x origin
+    :param int y: rectangle y origin
+    :param int width: rectangle width in pixels
+    :param int height: rectangle height in pixels
+    :param list|None layers: names of the layers to draw, None draws every
+     layer. Lists without a layer skip it. Defaults to None
+    :param int background: color the bands are cleared with. Defaults to :const:`0`
+    :return: None
+    """
+    if canvas.width < width:
+        raise ValueError("The canvas is narrower than the rectangle")
+    wanted = []
+    for display_list in display_lists:
+        # Arrays do not support the in operator on MicroPython
+        if display_list._scrolled:
+            raise ValueError("Scrolled display lists can not be drawn in bands")
+        if layers is not None:
+            names = display_list._layer_ids
+            wanted.append(
+                display_list._wanted([name for name in layers if name in names])
+            )
+        else:
+            wanted.append(display_list._wanted(None))
+
+    band = canvas.height
+    for top in range(y, y + height, band):
+        rows = min(band, y + height - top)
+        canvas.fill(background)
+        for index, display_list in enumerate(display_lists):
+            display_list._draw(canvas, wanted[index], -x, -top, top, top + rows)
+        callback(canvas, x, top, rows)
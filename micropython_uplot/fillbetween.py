@@ -20,7 +20,8 @@ except ImportError:
     pass
 
 from array import array
-from micropython_uplot.colors import set_color
+from micropython_uplot.clipping import clip_polygon
+from micropython_uplot.stats import measure
 
 
 __version__ = "0.0.0+auto.0"
@@ -51,79 +52,60 @@ class Fillbetween:
         :param list|None rangex: x range limits
         :param list|None rangey: y range limits
         :param int fill_color: filling color. Defaults to (0, 255, 0)
-        :param int|None pointer_index: Pointer index. Defaults to None
+        :param int|None pointer_index: color table slot to use. Defaults to None,
+         the plot picks a slot, shared with charts of the same color
 
         """
-
-        if pointer_index is None:
-            self._pointer_index = plot._pointer_index
-        else:
-            self._pointer_index = pointer_index
-
-        self._line_color = set_color(
-            plot._display,
-            self._pointer_index,
-            fill_color[0],
-            fill_color[1],
-            fill_color[2],
-        )
-        plot._pointer_index += 1
-
-        points = []
-
-        max_x = max(x)
-        min_x = min(x)
-        max_y = max(max(y2), max(y1))
-        min_y = min(min(y1), min(y2))
-
-        if rangex is None:
-            self.xmin = min_x - (abs(max_x - min_x) / 10)
-            self.xmax = max_x + (abs(max_x - min_x) / 10)
-
-        else:
-            self.xmin = min(rangex)
-            self.xmax = max(rangex)
-
-        if rangey is None:
-            self.ymin = min_y - (abs(max_y - min_y) / 10)
-            self.ymax = max_y + (abs(max_y - min_y) / 10)
-        else:
-            self.ymin = min(rangey)
-            self.ymax = max(rangey)
-
-        xnorm = [
-            int(plot.transform(self.xmin, self.xmax, plot._newxmin, plot._newxmax, _))
-            for _ in x
-        ]
-        xrev = [
-            int(plot.transform(self.xmin, self.xmax, plot._newxmin, plot._newxmax, _))
-            for _ in x
-        ]
-
-        xrev.reverse()
-
-        y1norm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.ymin, self.ymax, plot._newymin, plot._newymax, _
-                    )
+        with measure(plot, "transform", self):
+            if pointer_index is None:
+                self._line_color = plot.color(fill_color, self)
+            else:
+                self._line_color = plot._color_table.set(
+                    pointer_index, fill_color, self
                 )
-                for _ in y1
-            ]
-        )
-        y2norm = [
-            int(plot.transform(self.ymin, self.ymax, plot._newymin, plot._newymax, _))
-            for _ in y2
-        ]
-        y2norm.reverse()
-
-        flip2y = y2norm
-
-        for index, item in enumerate(xnorm):
-            points.extend([item, y1norm[index]])
-        for index, item in enumerate(xrev):
-            points.extend([item, flip2y[index]])
-
-        array_points = array("i", points)
-        plot._display.poly(0, 0, array_points, self._line_color, True)
+
+            points = []
+
+            max_x = max(x)
+            min_x = min(x)
+            max_y = max(max(y2), max(y1))
+            min_y = min(min(y1), min(y2))
+
+            if rangex is None:
+                self.xmin = min_x - (abs(max_x - min_x) / 10)
+                self.xmax = max_x + (abs(max_x - min_x) / 10)
+
+            else:
+                self.xmin = min(rangex)
+                self.xmax = max(rangex)
+
+            if rangey is None:
+                self.ymin = min_y - (abs(max_y - min_y) / 10)
+                self.ymax = max_y + (abs(max_y - min_y) / 10)
+            else:
+                self.ymin = min(rangey)
+                self.ymax = max(rangey)
+
+            ymapper = plot.mapper(self.ymin, self.ymax, plot._newymin, plot._newymax)
+            xnorm = plot.mapper(self.xmin, self.xmax, plot._newxmin, plot._newxmax).map(
+                x
+            )
+            y1norm = ymapper.map(y1)
+            y2norm = ymapper.map(y2)
+
+            for index, item in enumerate(xnorm):
+                points.extend([item, y1norm[index]])
+            for index in range(len(xnorm) - 1, -1, -1):
+                points.extend([xnorm[index], y2norm[index]])
+
+            array_points = clip_polygon(
+                array("i", points),
+                (
+                    plot._newxmin + 1,
+                    plot._newymax + 1,
+                    plot._newxmax - 1,
+                    plot._newymin - 1,
+                ),
+            )
+            if array_points is not None:
+                plot._display.poly(0, 0, array_points, self._line_color, True)
@@ -0,0 +1,717 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`framebuffer`
+================================================================================
+
+Helpers to work directly with the display frame buffer
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from micropython_uplot.proxy import DisplayProxy
+from micropython_uplot.utils import zeros
+
+try:
+    import framebuf
+except ImportError:
+    framebuf = None
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+# Bits per pixel for each supported buffer format
+BITS = {"MONO": 1, "GS4": 4, "GS8": 8, "RGB565": 16}
+
+_PATTERN_CACHE_SIZE = 16
+_patterns = {}
+
+
+def get_buffer(display):
+    """
+    Returns a memoryview of the display frame buffer, or None if the display
+    does not expose it.
+
+    :param display: display object
+    """
+    for name in ("mvb", "buffer", "buf"):
+        buffer = getattr(display, name, None)
+        if buffer is not None:
+            return memoryview(buffer)
+    return None
+
+
+def direct_buffer(display):
+    """
+    Returns a memoryview of the display frame buffer to write pixels into, or
+    None. Displays keeping their drawing calls, with a ``retained`` attribute
+    set, must only be drawn with the drawing primitives.
+
+    :param display: display object
+    """
+    if getattr(display, "retained", False):
+        return None
+    return get_buffer(display)
+
+
+def buffer_format(display):
+    """
+    Returns the display buffer format as one of ``"MONO"``, ``"GS4"``,
+    ``"GS8"`` or ``"RGB565"``. The ``mode`` attribute is used when the display
+    has one, otherwise the format is deduced from the buffer size.
+    Returns None if the format can not be determined.
+
+    :param display: display object
+    """
+    mode = getattr(display, "mode", None)
+    if isinstance(mode, str):
+        return mode
+    if framebuf is not None and mode is not None:
+        for name in BITS:
+            if mode == _mode_constant(name):
+                return name
+
+    buffer = get_buffer(display)
+    width = getattr(display, "width", None)
+    height = getattr(display, "height", None)
+    if buffer is None or width is None or height is None:
+        return None
+    bits, remainder = divmod(8 * len(buffer), width * height)
+    if remainder == 0:
+        for name, value in BITS.items():
+            if value == bits:
+                return name
+    return None
+
+
+def can_blit(display) -> bool:
+    """
+    Returns `True` if framebuf canvases can be blitted into the display.
+    Display proxies are looked through, so the wrapped display is checked.
+
+    :param display: display object
+    """
+    if framebuf is None:
+        return False
+    while isinstance(display, DisplayProxy):
+        display = display.display
+    return hasattr(display, "blit")
+
+
+def _mode_constant(name):
+    """
+    Returns the framebuf mode constant for a buffer format
+    """
+    if name == "MONO":
+        return framebuf.MONO_HLSB
+    if name == "GS4":
+        return framebuf.GS4_HMSB
+    return getattr(framebuf, name)
+
+
+def _stride(width: int, mode: str) -> int:
+    """
+    Returns the number of bytes used by a row of ``width`` pixels
+    """
+    return (width * BITS[mode] + 7) // 8
+
+
+class Canvas:
+    """
+    Off-screen frame buffer used when the framebuf module is not available.
+    It only holds the pixel data, see :func:`new_canvas`.
+
+    :param int width: canvas width in pixels
+    :param int height: canvas height in pixels
+    :param str mode: buffer format, one of the :data:`BITS` keys
+
+    """
+
+    def __init__(self, width: int, height: int, mode: str) -> None:
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.buffer = bytearray(_stride(width, mode) * height)
+
+
+if framebuf is not None:
+
+    class _FrameCanvas(framebuf.FrameBuffer):
+        """
+        framebuf based canvas, it can be drawn on and blitted
+        """
+
+        def __init__(self, width: int, height: int, mode: str) -> None:
+            self.buffer = bytearray(_stride(width, mode) * height)
+            super().__init__(self.buffer, width, height, _mode_constant(mode))
+            self.width = width
+            self.height = height
+            self.mode = mode
+
+
+def new_canvas(width: int, height: int, mode: str = "RGB565"):
+    """
+    Returns an off-screen frame buffer with ``width``, ``height``, ``mode``
+    and ``buffer`` attributes. It is a ``framebuf.FrameBuffer`` when the
+    framebuf module is available, so it can be blitted into the display.
+
+    :param int width: canvas width in pixels
+    :param int height: canvas height in pixels
+    :param str mode: buffer format, one of the :data:`BITS` keys.
+     Defaults to ``"RGB565"``
+    """
+    if framebuf is not None:
+        return _FrameCanvas(width, height, mode)
+    return Canvas(width, height, mode)
+
+
+def drawable_canvas(display, width: int, height: int):
+    """
+    Returns an off-screen canvas that can be drawn on with the framebuf
+    methods and blitted into ``display``, or None if that is not possible.
+    Displays can provide an ``offscreen(width, height)`` method returning such
+    a canvas, otherwise a framebuf canvas in the display format is used.
+
+    :param display: display object
+    :param int width: canvas width in pixels
+    :param int height: canvas height in pixels
+    """
+    offscreen = getattr(display, "offscreen", None)
+    if offscreen is not None:
+        return offscreen(width, height)
+    mode = buffer_format(display)
+    if mode not in BITS or not can_blit(display):
+        return None
+    return _FrameCanvas(width, height, mode)
+
+
+def direct_canvas(display, width: int, height: int):
+    """
+    Returns a canvas in the display buffer format, see :func:`new_canvas`,
+    whose ``buffer`` can be filled directly and then drawn quickly with
+    :func:`paste_area`. Returns None if the display format can not be used
+    that way.
+
+    :param display: display object
+    :param int width: canvas width in pixels
+    :param int height: canvas height in pixels
+    """
+    mode = buffer_format(display)
+    if mode not in ("GS4", "GS8", "RGB565") or getattr(display, "retained", False):
+        return None
+    if get_buffer(display) is None and not can_blit(display):
+        return None
+    return new_canvas(width, height, mode)
+
+
+def can_paste(display, x: int) -> bool:
+    """
+    Returns `True` if an area copied with :func:`copy_area` at ``x`` can be
+    drawn back with a single ``blit`` or by copying whole rows, instead of
+    pixel by pixel.
+
+    :param display: display object
+    :param int x: x origin of the area
+    """
+    mode = buffer_format(display)
+    if mode not in ("GS4", "GS8", "RGB565") or get_buffer(display) is None:
+        return False
+    if can_blit(display):
+        return True
+    return direct_buffer(display) is not None and not (mode == "GS4" and x & 1)
+
+
+def copy_area(display, x: int, y: int, width: int, height: int):
+    """
+    Copies a rectangle of the display into a new canvas, see :func:`new_canvas`.
+    The canvas uses the display buffer format, displays without an accessible
+    buffer are read pixel by pixel and their raw values kept as ``"RGB565"``.
+
+    :param display: display object
+    :param int x: rectangle x origin
+    :param int y: rectangle y origin
+    :param int width: rectangle width in pixels
+    :param int height: rectangle height in pixels
+    :return: canvas with the rectangle content
+    """
+    mode = buffer_format(display)
+    buffer = get_buffer(display)
+    if buffer is None or mode not in ("GS4", "GS8", "RGB565"):
+        mode = "RGB565"
+        buffer = None
+    canvas = new_canvas(width, height, mode)
+    target = memoryview(canvas.buffer)
+    bits = BITS[mode]
+    stride = _stride(width, mode)
+
+    if buffer is not None and not (bits == 4 and x & 1):
+        row_bytes = display.width * bits // 8
+        start = (y * display.width + x) * bits // 8
+        position = 0
+        for _ in range(height):
+            target[position : position + stride] = buffer[start : start + stride]
+            start = start + row_bytes
+            position = position + stride
+        return canvas
+
+    reader = RowReader(display)
+    row = zeros("H", width)
+    for line in range(height):
+        reader.raw(x, y + line, width, row)
+        position = line * stride
+        if bits == 4:
+            for index in range(0, width - 1, 2):
+                target[position] = row[index] << 4 | row[index + 1]
+                position += 1
+            if width & 1:
+                target[position] = row[width - 1] << 4
+        else:
+            for value in row:
+                target[position] = value & 0xFF
+                target[position + 1] = value >> 8
+                position += 2
+    return canvas
+
+
+def paste_area(display, canvas, x: int, y: int) -> None:
+    """
+    Draws a canvas made by :func:`copy_area` back into the display. A single
+    ``blit`` is used when the framebuf module is available and the formats
+    match, otherwise the rows are copied directly into the display buffer,
+    or pixel by pixel for displays without an accessible buffer.
+
+    :param display: display object
+    :param canvas: canvas to draw
+    :param int x: x origin in the display
+    :param int y: y origin in the display
+    :return: None
+    """
+    width = canvas.width
+    height = canvas.height
+    mode = canvas.mode
+    same = mode == buffer_format(display)
+    if same and can_blit(display):
+        display.blit(canvas, x, y)
+        return
+
+    touch = getattr(display, "touch", None)
+    if touch is not None:
+        touch(x, y, width, height)
+
+    bits = BITS[mode]
+    stride = _stride(width, mode)
+    source = memoryview(canvas.buffer)
+    buffer = direct_buffer(display)
+    if buffer is not None and same and not (bits == 4 and x & 1):
+        count = width * bits // 8
+        row_bytes = display.width * bits // 8
+        start = (y * display.width + x) * bits // 8
+        position = 0
+        for _ in range(height):
+            buffer[start : start + count] = source[position : position + count]
+            start = start + row_bytes
+            position = position + stride
+        if bits == 4 and width & 1:
+            # The last column shares its byte with the next display pixel
+            for line in range(height):
+                display.pixel(
+                    x + width - 1, y + line, source[line * stride + stride - 1] >> 4
+                )
+        return
+
+    for line in range(height):
+        position = line * stride
+        for column in range(width):
+            if bits == 4:
+                value = source[position + (column >> 1)]
+                value = value & 0x0F if column & 1 else value >> 4
+            else:
+                value = source[position + 2 * column]
+                value = value | source[position + 2 * column + 1] << 8
+            display.pixel(x + column, y + line, value)
+
+
+def dashed_hline(
+    display, x: int, y: int, width: int, color: int, dash: int = 3, gap: int = 1
+) -> None:
+    """
+    Draws a dashed horizontal line. The line starts with a dash, and the
+    gaps keep the pixels under them.
+
+    :param display: display object
+    :param int x: line start x coordinate
+    :param int y: line y coordinate
+    :param int width: line width in pixels
+    :param int color: dash color
+    :param int dash: dash length in pixels. Defaults to :const:`3`
+    :param int gap: gap length in pixels. Defaults to :const:`1`
+    :return: None
+    """
+    _dashed_line(display, x, y, width, color, dash, gap, True)
+
+
+def dashed_vline(
+    display, x: int, y: int, height: int, color: int, dash: int = 3, gap: int = 1
+) -> None:
+    """
+    Draws a dashed vertical line. The line starts with a dash at the top, and
+    the gaps keep the pixels under them.
+
+    :param display: display object
+    :param int x: line x coordinate
+    :param int y: line start y coordinate
+    :param int height: line height in pixels
+    :param int color: dash color
+    :param int dash: dash length in pixels. Defaults to :const:`3`
+    :param int gap: gap length in pixels. Defaults to :const:`1`
+    :return: None
+    """
+    _dashed_line(display, x, y, height, color, dash, gap, False)
+
+
+def _dashed_line(
+    display,
+    x: int,
+    y: int,
+    length: int,
+    color: int,
+    dash: int,
+    gap: int,
+    horizontal: bool,
+) -> None:
+    """
+    Draws a dashed line. When the framebuf module is available the whole
+    pattern is pre-rendered once into a one pixel wide canvas, and the line is
+    drawn with a single ``blit`` using the gap color as transparent key.
+    Otherwise every dash is drawn with ``hline`` or ``vline``.
+    """
+    if length <= 0:
+        return
+    if gap <= 0 or dash >= length:
+        if horizontal:
+            display.hline(x, y, length, color)
+        else:
+            display.vline(x, y, length, color)
+        return
+
+    mode = buffer_format(display)
+    if mode in BITS and can_blit(display):
+        key = (length, color, dash, gap, horizontal, mode)
+        pattern = _patterns.get(key)
+        if pattern is None:
+            pattern = _dash_pattern(length, color, dash, gap, horizontal, mode)
+            if len(_patterns) >= _PATTERN_CACHE_SIZE:
+                _patterns.clear()
+            _patterns[key] = pattern
+        display.blit(pattern[0], x, y, pattern[1])
+        return
+
+    start = 0
+    while start < length:
+        size = min(dash, length - start)
+        if horizontal:
+            display.hline(x + start, y, size, color)
+        else:
+            display.vline(x, y + start, size, color)
+        start = start + dash + gap
+
+
+def _dash_pattern(
+    length: int, color: int, dash: int, gap: int, horizontal: bool, mode: str
+) -> tuple:
+    """
+    Renders a dash pattern, returns the canvas and its transparent key
+    """
+    key = 0 if color else 1
+    if horizontal:
+        canvas = _FrameCanvas(length, 1, mode)
+    else:
+        canvas = _FrameCanvas(1, length, mode)
+    canvas.fill(key)
+    for start in range(0, length, dash + gap):
+        size = min(dash, length - start)
+        if horizontal:
+            canvas.hline(start, 0, size, color)
+        else:
+            canvas.vline(0, start, size, color)
+    return canvas, key
+
+
+def scroll_area(display, x: int, y: int, width: int, height: int, shift: int) -> None:
+    """
+    Shifts the pixels inside a rectangle ``shift`` pixels to the left. Pixels
+    outside the rectangle are not modified. The ``shift`` columns at the right of
+    the rectangle keep their old content and must be redrawn by the caller.
+
+    A framebuf view of the rectangle is scrolled when the framebuf module is
+    available, otherwise the rows are moved directly in the buffer. Displays
+    without an accessible buffer are scrolled pixel by pixel.
+
+    :param display: display object
+    :param int x: rectangle x origin
+    :param int y: rectangle y origin
+    :param int width: rectangle width in pixels
+    :param int height: rectangle height in pixels
+    :param int shift: number of pixels to shift to the left
+    :return: None
+    """
+    if shift <= 0 or width <= 0 or height <= 0:
+        return
+    if shift >= width:
+        return
+
+    touch = getattr(display, "touch", None)
+    if touch is not None:
+        touch(x, y, width, height)
+
+    fmt = buffer_format(display)
+    buffer = direct_buffer(display)
+    if buffer is None or fmt not in ("GS4", "GS8", "RGB565"):
+        _scroll_pixels(display, x, y, width, height, shift)
+        return
+
+    bits = BITS[fmt]
+    if bits == 4 and x & 1:
+        # Rows must start on a byte boundary. The first column is moved by hand
+        for row in range(y, y + height):
+            display.pixel(x, row, display.pixel(x + shift, row))
+        x = x + 1
+        width = width - 1
+        if shift >= width:
+            return
+
+    if framebuf is not None:
+        start = (y * display.width + x) * bits // 8
+        try:
+            area = framebuf.FrameBuffer(
+                buffer[start:],
+                width,
+                height,
+                _mode_constant(fmt),
+                display.width,
+            )
+        except ValueError:
+            area = None
+        if area is not None:
+            area.scroll(-shift, 0)
+            return
+
+    if bits == 4 and shift & 1:
+        _scroll_pixels(display, x, y, width, height, shift)
+        return
+
+    row_bytes = display.width * bits // 8
+    offset = shift * bits // 8
+    count = (width - shift) * bits // 8
+    scratch = memoryview(bytearray(count))
+    start = (y * display.width + x) * bits // 8
+    for _ in range(height):
+        scratch[:] = buffer[start + offset : start + offset + count]
+        buffer[start : start + count] = scratch
+        start = start + row_bytes
+
+    if bits == 4 and (width - shift) & 1:
+        # The last moved column shares its byte with the exposed strip
+        column = x + width - shift - 1
+        for row in range(y, y + height):
+            display.pixel(column, row, display.pixel(column + shift, row))
+
+
+def _scroll_pixels(
+    display, x: int, y: int, width: int, height: int, shift: int
+) -> None:
+    """
+    Shifts the rectangle to the left using the display pixel method
+    """
+    for row in range(y, y + height):
+        for column in range(x, x + width - shift):
+            display.pixel(column, row, display.pixel(column + shift, row))
+
+
+class RowReader:
+    """
+    Reads rows of pixels from a display. The buffer is read directly when the
+    display exposes it, otherwise the display ``pixel`` method is used.
+
+    Colors are decoded with the display ``rgb`` method, so any channel order
+    or byte swapping used by the driver is handled. GS4 buffers are decoded
+    with the current ``lut`` of the display.
+
+    :param display: display object
+
+    """
+
+    def __init__(self, display) -> None:
+        self._display = display
+        self._format = buffer_format(display)
+        self._buffer = get_buffer(display)
+        if self._format not in ("GS4", "GS8", "RGB565"):
+            self._buffer = None
+        self._colors = {}
+        self._tables = None
+        if self._format != "MONO" and hasattr(display, "rgb"):
+            self._tables = _channel_tables(display)
+        self._palette = None
+        self._pairs = None
+        if hasattr(display, "lut"):
+            lut = display.lut
+            self._palette = [
+                self._native(lut[2 * index] | lut[2 * index + 1] << 8)
+                for index in range(len(lut) // 2)
+            ]
+        elif self._format == "GS8":
+            self._palette = [self._native(index) for index in range(256)]
+        if self._format == "GS4" and self._palette is not None:
+            self._pairs = [
+                self._palette[index >> 4] + self._palette[index & 0x0F]
+                for index in range(256)
+            ]
+
+    def _native(self, value: int) -> bytes:
+        """
+        Converts a native color value into RGB888 bytes
+        """
+        color = self._colors.get(value)
+        if color is None:
+            if self._tables is None:
+                color = b"\xff\xff\xff" if value else b"\x00\x00\x00"
+            else:
+                low = value & 0xFF
+                high = (value >> 8) & 0xFF
+                color = bytes(
+                    [
+                        expand[lows[low] | highs[high]]
+                        for lows, highs, expand in self._tables
+                    ]
+                )
+            self._colors[value] = color
+        return color
+
+    def color(self, value: int) -> bytes:
+        """
+        Converts a raw pixel value into RGB888 bytes
+
+        :param int value: pixel value as returned by ``pixel``
+        :return bytes: red, green and blue bytes
+        """
+        if self._palette is not None:
+            return self._palette[value]
+        return self._native(value)
+
+    def raw(self, x: int, y: int, width: int, out) -> None:
+        """
+        Reads the raw pixel values of a row
+
+        :param int x: row x origin
+        :param int y: row y coordinate
+        :param int width: number of pixels to read
+        :param out: ``array('H')`` with at least ``width`` elements
+        :return: None
+        """
+        buffer = self._buffer
+        if buffer is None:
+            pixel = self._display.pixel
+            for index in range(width):
+                out[index] = pixel(x + index, y)
+            return
+
+        start = y * self._display.width + x
+        if self._format == "GS8":
+            for index in range(width):
+                out[index] = buffer[start + index]
+        elif self._format == "RGB565":
+            start = 2 * start
+            for index in range(width):
+                out[index] = buffer[start] | buffer[start + 1] << 8
+                start += 2
+        else:
+            for index in range(width):
+                value = buffer[(start + index) >> 1]
+                out[index] = value & 0x0F if (start + index) & 1 else value >> 4
+
+    def rgb(self, x: int, y: int, width: int, out: bytearray) -> None:
+        """
+        Reads a row and converts it into RGB888 bytes
+
+        :param int x: row x origin
+        :param int y: row y coordinate
+        :param int width: number of pixels to read
+        :param bytearray out: buffer with at least ``3 * width`` bytes
+        :return: None
+        """
+        buffer = self._buffer
+        if buffer is None:
+            pixel = self._display.pixel
+            color = self.color
+            for index in range(width):
+                out[3 * index : 3 * index + 3] = color(pixel(x + index, y))
+            return
+
+        start = y * self._display.width + x
+        if self._format == "GS8":
+            palette = self._palette
+            for index in range(width):
+                out[3 * index : 3 * index + 3] = palette[buffer[start + index]]
+        elif self._format == "RGB565":
+            native = self._native
+            start = 2 * start
+            for index in range(width):
+                out[3 * index : 3 * index + 3] = native(
+                    buffer[start] | buffer[start + 1] << 8
+                )
+                start += 2
+        elif self._pairs is None:
+            color = self.color
+            for index in range(width):
+                value = buffer[(start + index) >> 1]
+                value = value & 0x0F if (start + index) & 1 else value >> 4
+                out[3 * index : 3 * index + 3] = color(value)
+        else:
+            palette = self._palette
+            index = 0
+            if start & 1:
+                out[0:3] = palette[buffer[start >> 1] & 0x0F]
+                index = 1
+            pairs = self._pairs
+            position = (start + index) >> 1
+            while index + 1 < width:
+                out[3 * index : 3 * index + 6] = pairs[buffer[position]]
+                position += 1
+                index += 2
+            if index < width:
+                out[3 * index : 3 * index + 3] = palette[buffer[position] >> 4]
+
+
+def _channel_tables(display) -> list:
+    """
+    Builds the tables used to decode native colors. For each channel the bits
+    set by ``display.rgb`` are probed, giving a table for the low byte, one for
+    the high byte and one to expand the channel to 8 bits.
+    """
+    tables = []
+    for channel in range(3):
+        lows = bytearray(256)
+        highs = bytearray(256)
+        bits = 0
+        for bit in range(8):
+            level = [0, 0, 0]
+            level[channel] = 1 << bit
+            mask = display.rgb(level[0], level[1], level[2])
+            if not mask:
+                continue
+            bits = bits | 1 << bit
+            for value in range(256):
+                if value & mask:
+                    lows[value] = lows[value] | 1 << bit
+                if value & (mask >> 8):
+                    highs[value] = highs[value] | 1 << bit
+        expand = bytearray(256)
+        if bits:
+            for value in range(256):
+                expand[value] = min(255, value * 255 // bits)
+        tables.append((lows, highs, expand))
+    return tables
@@ -0,0 +1,610 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`headless`
+================================================================================
+
+In memory display, to render plots without display hardware
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from micropython_uplot.framebuffer import BITS, _stride
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+# pylint: disable=too-many-arguments, too-many-locals, too-many-branches
+
+_MODES = ("GS4", "GS8", "RGB565")
+
+# 5x7 glyphs drawn inside the 8x8 character cell, one byte per row with the
+# leftmost column in bit 4. Other characters are drawn as a box
+_GLYPHS = {
+    "0": b"\x0e\x11\x13\x15\x19\x11\x0e",
+    "1": b"\x04\x0c\x04\x04\x04\x04\x0e",
+    "2": b"\x0e\x11\x01\x02\x04\x08\x1f",
+    "3": b"\x1f\x02\x04\x02\x01\x11\x0e",
+    "4": b"\x02\x06\x0a\x12\x1f\x02\x02",
+    "5": b"\x1f\x10\x1e\x01\x01\x11\x0e",
+    "6": b"\x06\x08\x10\x1e\x11\x11\x0e",
+    "7": b"\x1f\x01\x02\x04\x08\x08\x08",
+    "8": b"\x0e\x11\x11\x0e\x11\x11\x0e",
+    "9": b"\x0e\x11\x11\x0f\x01\x02\x0c",
+    ".": b"\x00\x00\x00\x00\x00\x0c\x0c",
+    "-": b"\x00\x00\x00\x1f\x00\x00\x00",
+    "+": b"\x00\x04\x04\x1f\x04\x04\x00",
+    "e": b"\x00\x00\x0e\x11\x1f\x10\x0e",
+    "E": b"\x1f\x10\x10\x1e\x10\x10\x1f",
+    ":": b"\x00\x0c\x0c\x00\x0c\x0c\x00",
+    "%": b"\x18\x19\x02\x04\x08\x13\x03",
+    " ": b"\x00\x00\x00\x00\x00\x00\x00",
+}
+
+
+class HeadlessDisplay:
+    """
+    Display whose frame buffer is a ``bytearray`` in memory. It has the same
+    drawing methods as the framebuf based display drivers, so plots can be
+    rendered, saved with :meth:`PLOT.screenshot` and profiled on any Python
+    interpreter, without display hardware or the framebuf module.
+
+    The buffer layout is the framebuf one: ``"GS4"`` is ``GS4_HMSB`` and maps
+    the pixel values through the ``lut`` color table, ``"GS8"`` uses RGB332
+    colors and ``"RGB565"`` stores the colors byte swapped, as sent to the
+    display. Text only has glyphs for numbers, other characters are drawn as
+    a box.
+
+    :param int width: display width in pixels. Defaults to :const:`480`
+    :param int height: display height in pixels. Defaults to :const:`320`
+    :param str mode: buffer format, ``"GS4"``, ``"GS8"`` or ``"RGB565"``.
+     Defaults to ``"GS4"``
+    :param bytearray|None lut: color table used in ``"GS4"`` mode. Defaults to
+     None, a new table is created
+
+    """
+
+    def __init__(
+        self,
+        width: int = 480,
+        height: int = 320,
+        mode: str = "GS4",
+        lut: bytearray = None,
+    ) -> None:
+        if mode not in _MODES:
+            raise ValueError("Mode must be GS4, GS8 or RGB565")
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self._bits = BITS[mode]
+        self._stride = _stride(width, mode)
+        self.buffer = bytearray(self._stride * height)
+        self.mvb = memoryview(self.buffer)
+        if mode == "GS4":
+            self.lut = bytearray(32) if lut is None else lut
+
+    def rgb(self, r: int, g: int, b: int) -> int:
+        """
+        Converts a color into the display color value
+
+        :param int r: red channel
+        :param int g: green channel
+        :param int b: blue channel
+        :return int: color value
+        """
+        if self._bits == 8:
+            return (r & 0xE0) | ((g >> 3) & 0x1C) | (b >> 6)
+        return ((r & 0xF8) << 5) | ((g & 0x1C) << 11) | (b & 0xF8) | ((g & 0xE0) >> 5)
+
+    def offscreen(self, width: int, height: int):
+        """
+        Returns a display with the same format and color table, used to
+        pre-render shapes that are then drawn with :meth:`blit`
+
+        :param int width: width in pixels
+        :param int height: height in pixels
+        :return HeadlessDisplay: the new display
+        """
+        return HeadlessDisplay(width, height, self.mode, getattr(self, "lut", None))
+
+    def show(self) -> None:
+        """
+        Nothing to send, the buffer is the output. Kept so the examples written
+        for display drivers work unchanged
+
+        :return: None
+        """
+
+    def pixel(self, x: int, y: int, color: int = None):
+        """
+        Sets a pixel, or returns its value when no color is given. Pixels
+        outside the display are ignored, and read as None
+
+        :param int x: x coordinate
+        :param int y: y coordinate
+        :param int|None color: color value. Defaults to None
+        :return: the pixel value when reading
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        buffer = self.buffer
+        start = y * self._stride
+        if self._bits == 16:
+            start += 2 * x
+            if color is None:
+                return buffer[start] | buffer[start + 1] << 8
+            buffer[start] = color & 0xFF
+            buffer[start + 1] = (color >> 8) & 0xFF
+        elif self._bits == 8:
+            if color is None:
+                return buffer[start + x]
+            buffer[start + x] = color & 0xFF
+        else:
+            start += x >> 1
+            value = buffer[start]
+            if color is None:
+                return value & 0x0F if x & 1 else value >> 4
+            if x & 1:
+                buffer[start] = value & 0xF0 | color & 0x0F
+            else:
+                buffer[start] = value & 0x0F | (color & 0x0F) << 4
+        return None
+
+    def _span(self, x: int, y: int, width: int, color: int) -> None:
+        """
+        Fills a row of pixels, clipped to the display
+        """
+        if not 0 <= y < self.height:
+            return
+        if x < 0:
+            width += x
+            x = 0
+        width = min(width, self.width - x)
+        if width <= 0:
+            return
+        buffer = self.buffer
+        start = y * self._stride
+        if self._bits == 16:
+            start += 2 * x
+            buffer[start : start + 2 * width] = (
+                bytes((color & 0xFF, (color >> 8) & 0xFF)) * width
+            )
+        elif self._bits == 8:
+            start += x
+            buffer[start : start + width] = bytes((color & 0xFF,)) * width
+        else:
+            color &= 0x0F
+            start += x >> 1
+            if x & 1:
+                buffer[start] = buffer[start] & 0xF0 | color
+                start += 1
+                width -= 1
+            count = width >> 1
+            if count:
+                buffer[start : start + count] = bytes((color << 4 | color,)) * count
+                start += count
+            if width & 1:
+                buffer[start] = buffer[start] & 0x0F | color << 4
+
+    def fill(self, color: int) -> None:
+        """
+        Fills the display with a color
+
+        :param int color: color value
+        :return: None
+        """
+        self.fill_rect(0, 0, self.width, self.height, color)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int) -> None:
+        """
+        Draws a filled rectangle
+
+        :param int x: x origin
+        :param int y: y origin
+        :param int width: width in pixels
+        :param int height: height in pixels
+        :param int color: color value
+        :return: None
+        """
+        if width <= 0:
+            return
+        for row in range(max(y, 0), min(y + height, self.height)):
+            self._span(x, row, width, color)
+
+    def hline(self, x: int, y: int, width: int, color: int) -> None:
+        """
+        Draws a horizontal line
+
+        :param int x: x origin
+        :param int y: y coordinate
+        :param int width: length in pixels
+        :param int color: color value
+        :return: None
+        """
+        self._span(x, y, width, color)
+
+    def vline(self, x: int, y: int, height: int, color: int) -> None:
+        """
+        Draws a vertical line
+
+        :param int x: x coordinate
+        :param int y: y origin
+        :param int height: length in pixels
+        :param int color: color value
+        :return: None
+        """
+        if not 0 <= x < self.width:
+            return
+        for row in range(max(y, 0), min(y + height, self.height)):
+            self.pixel(x, row, color)
+
+    def rect(
+        self, x: int, y: int, width: int, height: int, color: int, fill: bool = False
+    ) -> None:
+        """
+        Draws a rectangle
+
+        :param int x: x origin
+        :param int y: y origin
+        :param int width: width in pixels
+        :param int height: height in pixels
+        :param int color: color value
+        :param bool fill: fill the rectangle. Defaults to `False`
+        :return: None
+        """
+        if fill:
+            self.fill_rect(x, y, width, height, color)
+            return
+        self._span(x, y, width, color)
+        self._span(x, y + height - 1, width, color)
+        self.vline(x, y, height, color)
+        self.vline(x + width - 1, y, height, color)
+
+    def line(self, xstart: int, ystart: int, xend: int, yend: int, color: int) -> None:
+        """
+        Draws a line, with the same pixels as the framebuf module
+
+        :param int xstart: start x coordinate
+        :param int ystart: start y coordinate
+        :param int xend: end x coordinate
+        :param int yend: end y coordinate
+        :param int color: color value
+        :return: None
+        """
+        if ystart == yend:
+            self._span(min(xstart, xend), ystart, abs(xend - xstart) + 1, color)
+            return
+        if xstart == xend:
+            self.vline(xstart, min(ystart, yend), abs(yend - ystart) + 1, color)
+            return
+
+        deltax = abs(xend - xstart)
+        stepx = 1 if xend > xstart else -1
+        deltay = abs(yend - ystart)
+        stepy = 1 if yend > ystart else -1
+        steep = deltay > deltax
+        if steep:
+            xstart, ystart = ystart, xstart
+            deltax, deltay = deltay, deltax
+            stepx, stepy = stepy, stepx
+
+        error = 2 * deltay - deltax
+        pixel = self.pixel
+        for _ in range(deltax):
+            if steep:
+                pixel(ystart, xstart, color)
+            else:
+                pixel(xstart, ystart, color)
+            while error >= 0:
+                ystart += stepy
+                error -= 2 * deltax
+            xstart += stepx
+            error += 2 * deltay
+        pixel(xend, yend, color)
+
+    def ellipse(
+        self,
+        x: int,
+        y: int,
+        xradius: int,
+        yradius: int,
+        color: int,
+        fill: bool = False,
+        mask: int = 0x0F,
+    ) -> None:
+        """
+        Draws an ellipse, with the same pixels as the framebuf module
+
+        :param int x: center x coordinate
+        :param int y: center y coordinate
+        :param int xradius: radius in the x direction
+        :param int yradius: radius in the y direction
+        :param int color: color value
+        :param bool fill: fill the ellipse. Defaults to `False`
+        :param int mask: quadrants to draw, bit 0 is the upper right one and
+         the next bits follow counterclockwise. Defaults to all of them
+        :return: None
+        """
+        two_asquare = 2 * xradius * xradius
+        two_bsquare = 2 * yradius * yradius
+
+        xpoint = xradius
+        ypoint = 0
+        xchange = yradius * yradius * (1 - 2 * xradius)
+        ychange = xradius * xradius
+        error = 0
+        stopx = two_bsquare * xradius
+        stopy = 0
+        while stopx >= stopy:
+            self._ellipse_points(x, y, xpoint, ypoint, color, fill, mask)
+            ypoint += 1
+            stopy += two_asquare
+            error += ychange
+            ychange += two_asquare
+            if 2 * error + xchange > 0:
+                xpoint -= 1
+                stopx -= two_bsquare
+                error += xchange
+                xchange += two_bsquare
+
+        xpoint = 0
+        ypoint = yradius
+        xchange = yradius * yradius
+        ychange = xradius * xradius * (1 - 2 * yradius)
+        error = 0
+        stopx = 0
+        stopy = two_asquare * yradius
+        while stopx <= stopy:
+            self._ellipse_points(x, y, xpoint, ypoint, color, fill, mask)
+            xpoint += 1
+            stopx += two_bsquare
+            error += xchange
+            xchange += two_bsquare
+            if 2 * error + ychange > 0:
+                ypoint -= 1
+                stopy -= two_asquare
+                error += ychange
+                ychange += two_asquare
+
+    def _ellipse_points(
+        self, x: int, y: int, xpoint: int, ypoint: int, color: int, fill, mask
+    ) -> None:
+        """
+        Draws the four symmetric points of an ellipse, or the rows between
+        them and the center when filling
+        """
+        if fill:
+            if mask & 0x01:
+                self._span(x, y - ypoint, xpoint + 1, color)
+            if mask & 0x02:
+                self._span(x - xpoint, y - ypoint, xpoint + 1, color)
+            if mask & 0x04:
+                self._span(x - xpoint, y + ypoint, xpoint + 1, color)
+            if mask & 0x08:
+                self._span(x, y + ypoint, xpoint + 1, color)
+            return
+        if mask & 0x01:
+            self.pixel(x + xpoint, y - ypoint, color)
+        if mask & 0x02:
+            self.pixel(x - xpoint, y - ypoint, color)
+        if mask & 0x04:
+            self.pixel(x - xpoint, y + ypoint, color)
+        if mask & 0x08:
+            self.pixel(x + xpoint, y + ypoint, color)
+
+    def poly(self, x: int, y: int, coords, color: int, fill: bool = False) -> None:
+        """
+        Draws a closed polygon, with the same pixels as the framebuf module.
+        Filled polygons use the even-odd rule
+
+        :param int x: x offset added to every point
+        :param int y: y offset added to every point
+        :param coords: ``array('h')`` or list with the point coordinates as
+         ``x0, y0, x1, y1, ...``
+        :param int color: color value
+        :param bool fill: fill the polygon. Defaults to `False`
+        :return: None
+        """
+        count = len(coords) // 2
+        if count < 1:
+            return
+
+        if not fill:
+            xprev = coords[2 * count - 2]
+            yprev = coords[2 * count - 1]
+            for index in range(count):
+                xnew = coords[2 * index]
+                ynew = coords[2 * index + 1]
+                self.line(x + xprev, y + yprev, x + xnew, y + ynew, color)
+                xprev = xnew
+                yprev = ynew
+            return
+
+        ymin = min(coords[1::2])
+        ymax = max(coords[1::2])
+        for row in range(ymin, ymax + 1):
+            nodes = []
+            xprev = coords[0]
+            yprev = coords[1]
+            for index in range(count - 1, -1, -1):
+                xnew = coords[2 * index]
+                ynew = coords[2 * index + 1]
+                if yprev != ynew and ((yprev > row >= ynew) or (yprev <= row < ynew)):
+                    nodes.append(
+                        _div(
+                            32 * xprev
+                            + _div(32 * (xnew - xprev) * (row - yprev), ynew - yprev)
+                            + 16,
+                            32,
+                        )
+                    )
+                elif row == max(yprev, ynew):
+                    # Local minima are missed by the nodes, draw them here
+                    if yprev < ynew:
+                        self.pixel(x + xnew, y + ynew, color)
+                    elif ynew < yprev:
+                        self.pixel(x + xprev, y + yprev, color)
+                    else:
+                        self.line(x + xprev, y + yprev, x + xnew, y + ynew, color)
+                xprev = xnew
+                yprev = ynew
+
+            nodes.sort()
+            for index in range(0, len(nodes) - 1, 2):
+                self._span(
+                    x + nodes[index],
+                    y + row,
+                    nodes[index + 1] - nodes[index] + 1,
+                    color,
+                )
+
+    def text(self, text: str, x: int, y: int, color: int = 1) -> None:
+        """
+        Draws text using 8x8 pixel characters
+
+        :param str text: text to draw
+        :param int x: x origin
+        :param int y: y origin
+        :param int color: color value. Defaults to :const:`1`
+        :return: None
+        """
+        for character in text:
+            glyph = _GLYPHS.get(character)
+            if glyph is None:
+                self.rect(x + 1, y, 5, 7, color)
+            else:
+                for row, bits in enumerate(glyph):
+                    self._glyph_row(bits, x + 1, y + row, color)
+            x += 8
+
+    def _glyph_row(self, bits: int, x: int, y: int, color: int) -> None:
+        """
+        Draws the runs of set bits of a glyph row
+        """
+        column = 0
+        while bits:
+            if bits & 0x10:
+                start = column
+                while bits & 0x10:
+                    bits = (bits << 1) & 0x1F
+                    column += 1
+                self._span(x + start, y, column - start, color)
+            else:
+                bits = (bits << 1) & 0x1F
+                column += 1
+
+    def blit(self, source, x: int, y: int, key: int = -1, palette=None) -> None:
+        """
+        Draws another frame buffer, like a canvas or another headless display,
+        at the given position
+
+        :param source: object with ``width``, ``height``, ``mode`` and
+         ``buffer`` attributes, in the framebuf layout
+        :param int x: x origin
+        :param int y: y origin
+        :param int key: source value left transparent. Defaults to :const:`-1`,
+         no transparency
+        :param palette: frame buffer whose first row maps the source values
+         into color values. Defaults to None
+        :return: None
+        """
+        width = source.width
+        height = source.height
+        mode = getattr(source, "mode", self.mode)
+        bits = BITS[mode]
+        stride = _stride(width, mode)
+        data = source.buffer
+
+        left = max(0, -x)
+        right = min(width, self.width - x)
+        top = max(0, -y)
+        bottom = min(height, self.height - y)
+        if left >= right or top >= bottom:
+            return
+
+        if mode == self.mode and bits >= 8 and key == -1 and palette is None:
+            size = bits // 8
+            count = (right - left) * size
+            for row in range(top, bottom):
+                start = (y + row) * self._stride + (x + left) * size
+                position = row * stride + left * size
+                self.buffer[start : start + count] = data[position : position + count]
+            return
+
+        pixel = self.pixel
+        for row in range(top, bottom):
+            position = row * stride
+            for column in range(left, right):
+                value = _read(data, position, column, bits)
+                if value == key:
+                    continue
+                if palette is not None:
+                    value = palette.pixel(value, 0)
+                pixel(x + column, y + row, value)
+
+    def scroll(self, xstep: int, ystep: int) -> None:
+        """
+        Shifts the display content. The uncovered pixels keep their old values
+
+        :param int xstep: pixels to shift to the right, negative to the left
+        :param int ystep: pixels to shift down, negative to go up
+        :return: None
+        """
+        width = self.width
+        height = self.height
+        if abs(xstep) >= width or abs(ystep) >= height:
+            return
+        if ystep > 0:
+            rows = range(height - 1, ystep - 1, -1)
+        else:
+            rows = range(0, height + ystep)
+        left = max(0, xstep)
+        right = min(width, width + xstep)
+        size = self._bits // 8
+        buffer = self.buffer
+        pixel = self.pixel
+
+        for row in rows:
+            source = (row - ystep) * self._stride
+            if size:
+                start = row * self._stride + left * size
+                position = source + (left - xstep) * size
+                buffer[start : start + (right - left) * size] = buffer[
+                    position : position + (right - left) * size
+                ]
+            else:
+                values = [
+                    _read(buffer, source, column, 4)
+                    for column in range(left - xstep, right - xstep)
+                ]
+                for column in range(left, right):
+                    pixel(column, row, values[column - left])
+
+
+def _read(data, position: int, column: int, bits: int) -> int:
+    """
+    Reads a pixel value from a buffer row starting at ``position``
+    """
+    if bits == 16:
+        position += 2 * column
+        return data[position] | data[position + 1] << 8
+    if bits == 8:
+        return data[position + column]
+    if bits == 4:
+        value = data[position + (column >> 1)]
+        return value & 0x0F if column & 1 else value >> 4
+    return (data[position + (column >> 3)] >> (7 - (column & 7))) & 1
+
+
+def _div(dividend: int, divisor: int) -> int:
+    """
+    Integer division rounding towards zero, as done by the framebuf module
+    """
+    quotient = abs(dividend) // abs(divisor)
+    if (dividend < 0) != (divisor < 0):
+        return -quotient
+    return quotient
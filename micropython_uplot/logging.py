@@ -19,7 +19,12 @@ try:
 except ImportError:
     pass
 
-from micropython_uplot.colors import set_color
+from micropython_uplot.clipping import clip_line
+from micropython_uplot.displaylist import draw_owned
+from micropython_uplot.framebuffer import scroll_area
+from micropython_uplot.plot import Mapper
+from micropython_uplot.stats import measure
+from micropython_uplot.utils import zeros
 
 
 __version__ = "0.0.0+auto.0"
@@ -43,6 +48,8 @@ class Logging:
         ticksy: list = (0, 10, 30, 50, 70, 90),
         tick_pos: bool = False,
         fill: bool = False,
+        capacity: Optional[int] = None,
+        scroll: bool = False,
     ) -> None:
         """
 
@@ -57,50 +64,85 @@ class Logging:
         :param bool tick_pos: indicates ticks position. True for below the axes.
          Defaults to ``False``
         :param bool fill: enable the filling of the plot. Defaults to ``False``
+        :param int|None capacity: number of points kept in the ring buffer used by
+         :meth:`append`. Defaults to None, :meth:`append` is then not available
+        :param bool scroll: when the x range slides, shift the plot area pixels to
+         the left and draw only the new segment instead of redrawing every point.
+         Defaults to ``False``
 
         """
-        self.points = []
-        self.ticksx = tuple(ticksx)
-        self.ticksy = tuple(ticksy)
-
-        self._pointer_index = plot._pointer_index
-
-        self._line_color = set_color(
-            plot._display,
-            self._pointer_index,
-            line_color[0],
-            line_color[1],
-            line_color[2],
-        )
-        plot._pointer_index += 1
+        with measure(plot, "transform", self):
+            self.points = []
+            self.ticksx = tuple(ticksx)
+            self.ticksy = tuple(ticksy)
+
+            self._line_color = plot.color(line_color, self)
+
+            if tick_pos:
+                self._tickposx = plot._tickheightx
+                self._tickposy = plot._tickheighty
+            else:
+                self._tickposx = 0
+                self._tickposy = 0
+
+            self.xmin = rangex[0]
+            self.xmax = rangex[1]
+            self.ymin = rangey[0]
+            self.ymax = rangey[1]
+
+            self._plot = plot
+            self._fill = fill
+            self._capacity = capacity
+            self._scroll = scroll
+
+            if capacity is None:
+                self.draw_points(plot, x, y, fill)
+            else:
+                self._xbuffer = zeros("f", capacity)
+                self._ybuffer = zeros("f", capacity)
+                self._start = 0
+                self._count = 0
+                box = self._clip_box(plot)
+                self._xmapper = Mapper(self.xmin, self.xmax, box[0], box[2])
+                self._ymapper = Mapper(self.ymin, self.ymax, box[3], box[1])
+                for index in range(max(0, len(x) - capacity), len(x)):
+                    self._store(x[index], y[index])
+                self._redraw()
+
+            if plot._showticks:
+                if plot._loggingfirst:
+                    plot._loggingfirst = False
+                    self._draw_ticks(plot)
+                    plot._showticks = False
+
+    def _line(
+        self, plot: PLOT, box: tuple, xstart: int, ystart: int, xend: int, yend: int
+    ) -> None:
+        """
+        Draws a line clipped to the plot area
+        :param PLOT plot: plot object provided
+        :param tuple box: plot area limits, as returned by ``_clip_box``
+        :param int xstart: line start x coordinate
+        :param int ystart: line start y coordinate
+        :param int xend: line end x coordinate
+        :param int yend: line end y coordinate
+        """
+        segment = clip_line(xstart, ystart, xend, yend, box)
+        if segment is not None:
+            plot._display.line(
+                segment[0], segment[1], segment[2], segment[3], self._line_color
+            )
 
-        if tick_pos:
-            self._tickposx = plot._tickheightx
-            self._tickposy = plot._tickheighty
-        else:
-            self._tickposx = 0
-            self._tickposy = 0
-
-        self.xmin = rangex[0]
-        self.xmax = rangex[1]
-        self.ymin = rangey[0]
-        self.ymax = rangey[1]
-
-        self.draw_points(plot, x, y, fill)
-        if plot._showticks:
-            if plot._loggingfirst:
-                plot._loggingfirst = False
-                self._draw_ticks(plot)
-                plot._showticks = False
-
-    def _plot_line(self, plot: PLOT, index: int, xnorm: tuple, ynorm: tuple) -> None:
-        plot._display.line(
-            xnorm[index],
-            ynorm[index],
-            xnorm[index + 1],
-            ynorm[index + 1],
-            self._line_color,
-        )
+    def _pixel(self, plot: PLOT, box: tuple, x: int, y: int) -> None:
+        """
+        Draws a point if it is inside the plot area
+        :param PLOT plot: plot object provided
+        :param tuple box: plot area limits, as returned by ``_clip_box``
+        :param int x: x coordinate
+        :param int y: y coordinate
+        """
+        if box[0] <= x <= box[2] and box[1] <= y <= box[3]:
+            plot._display.pixel(x, y, self._line_color)
 
     def draw_points(self, plot: PLOT, x: list, y: list, fill: bool = False) -> None:
         """
@@ -111,6 +153,13 @@ class Logging:
         :param bool fill: parameter to fill the plot graphic. Defaults to False
         :return: None
         """
+        with measure(plot, "transform", self):
+            draw_owned(plot._display, self, True, self._draw_points, plot, x, y, fill)
+
+    def _draw_points(self, plot: PLOT, x: list, y: list, fill: bool) -> None:
+        """
+        Clears the plot area and draws the points
+        """
         self.clear_plot(plot)
         # if self._limits:
         #     self._draw_limit_lines(plot)
@@ -123,13 +172,32 @@ class Logging:
         :param PLOT plot: plot object provided
         """
 
-        plot._display.rect(
+        x, y, width, height = Logging._plot_area(plot)
+        plot._display.rect(x, y, width, height, plot._background_color, True)
+
+    @staticmethod
+    def _clip_box(plot: PLOT) -> tuple:
+        """
+        Returns the limits of the plot area, the data range and the ticks are
+        mapped into them and the lines are clipped to them
+        :param PLOT plot: plot object provided
+        :return tuple: xmin, ymin, xmax and ymax, limits included
+        """
+        x, y, width, height = Logging._plot_area(plot)
+        return x, y, x + width - 1, y + height - 1
+
+    @staticmethod
+    def _plot_area(plot: PLOT) -> tuple:
+        """
+        Returns the rectangle inside the axes and ticks used by the log
+        :param PLOT plot: plot object provided
+        :return tuple: x, y, width and height of the plot area
+        """
+        return (
             plot._newxmin + 1 + plot._tickheightx,
             plot._newymax + 1,
             plot._buff_width - 2 - 2 * plot.padding - plot._tickheightx,
             plot._buff_height - 2 - 2 * plot.padding - plot._tickheighty,
-            plot._background_color,
-            True,
         )
 
     def draw_new_lines(self, plot: PLOT, x: list, y: list, fill: bool = False) -> None:
@@ -141,47 +209,181 @@ class Logging:
         :param bool fill: parameter to fill the plot graphic. Defaults to False
         :return: None
         """
-        xnorm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.xmin, self.xmax, plot._newxmin, plot._newxmax, _
-                    )
-                )
-                for _ in x
-            ]
-        )
-        ynorm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.ymin, self.ymax, plot._newymin, plot._newymax, _
+        with measure(plot, "transform", self):
+            box = self._clip_box(plot)
+            xnorm = plot.mapper(self.xmin, self.xmax, box[0], box[2]).map(x)
+            ynorm = plot.mapper(self.ymin, self.ymax, box[3], box[1]).map(y)
+
+            if len(x) == 1:
+                self._pixel(plot, box, xnorm[0], ynorm[0])
+            else:
+                for index in range(len(xnorm) - 1):
+                    self._line(
+                        plot,
+                        box,
+                        xnorm[index],
+                        ynorm[index],
+                        xnorm[index + 1],
+                        ynorm[index + 1],
                     )
+
+                if fill:
+                    for index, item in enumerate(xnorm):
+                        self._line(plot, box, item, ynorm[index], item, plot._newymin)
+
+    def append(self, x: float, y: float) -> None:
+        """
+        Adds a new point to the ring buffer and draws it. While the buffer is
+        not full only the new segment is drawn. When the buffer is full, or the
+        point falls after the x range, the oldest point is dropped, the x range
+        slides to include the new point and the plot area is redrawn. In scroll
+        mode only the new segment is drawn. The plot area is shifted to the
+        left once the points moved a whole pixel, the fraction left is kept
+        for the next points, and the exposed strip is cleared. The plot area
+        is redrawn instead when the dropped point is still shown, so its
+        segment does not stay on the display.
+
+        :param float x: x value
+        :param float y: y value
+        :return: None
+        """
+        with measure(self._plot, "transform", self):
+            if self._capacity is None:
+                raise ValueError("Logging needs a capacity to append points")
+
+            full = self._count == self._capacity
+            redraw = full and not self._scroll
+            pixels = 0
+            if self._scroll:
+                pixels = self._slide(x)
+                # Points dropped in scroll mode usually left the plot area as
+                # it shifted, the area is redrawn when the oldest one is still
+                # inside it. On the left column it goes with the next shift
+                if full:
+                    left = self._clip_box(self._plot)[0]
+                    redraw = self._xmapper.pixel(self._xbuffer[self._start]) > left
+                if pixels and getattr(self._plot._display, "retained", False):
+                    # Shifted pixels can not be kept in a display list
+                    redraw = True
+                if redraw:
+                    pixels = 0
+            elif x > self.xmax:
+                shift = x - self.xmax
+                self.xmin = self.xmin + shift
+                self.xmax = x
+                self._xmapper.offset = (
+                    self._xmapper.offset - shift * self._xmapper.scale
                 )
-                for _ in y
-            ]
+                redraw = True
+
+            self._store(x, y)
+
+            if pixels:
+                self._scroll_plot(pixels)
+            elif redraw:
+                self._redraw()
+                return
+
+            # Display lists keep the segment until the next redraw replaces it
+            draw_owned(self._plot._display, self, False, self._draw_last, x, y)
+
+    def _draw_last(self, x: float, y: float) -> None:
+        """
+        Draws the segment reaching the last point
+        :param float x: x value of the last point
+        :param float y: y value of the last point
+        """
+        plot = self._plot
+        box = self._clip_box(plot)
+        xnew = self._xmapper.pixel(x)
+        ynew = self._ymapper.pixel(y)
+        if self._count == 1:
+            self._pixel(plot, box, xnew, ynew)
+        else:
+            index = (self._start + self._count - 2) % self._capacity
+            self._line(
+                plot,
+                box,
+                self._xmapper.pixel(self._xbuffer[index]),
+                self._ymapper.pixel(self._ybuffer[index]),
+                xnew,
+                ynew,
+            )
+        if self._fill:
+            self._line(plot, box, xnew, ynew, xnew, plot._newymin)
+
+    def _slide(self, x: float) -> int:
+        """
+        Slides the x range a whole number of pixels so the new point falls
+        inside the plot area
+        :param float x: x value of the new point
+        :return int: number of pixels the range moved
+        """
+        left, _, right, _ = self._clip_box(self._plot)
+        mapper = self._xmapper
+        pixels = int(mapper(x) - right)
+        if pixels <= 0:
+            return 0
+        mapper.offset = mapper.offset - pixels
+        self.xmin = (left - mapper.offset) / mapper.scale
+        self.xmax = (right - mapper.offset) / mapper.scale
+        return pixels
+
+    def _scroll_plot(self, pixels: int) -> None:
+        """
+        Shifts the plot area to the left and clears the exposed strip
+        :param int pixels: number of pixels to shift
+        """
+        plot = self._plot
+        x, y, width, height = self._plot_area(plot)
+        scroll_area(plot._display, x, y, width, height, pixels)
+        pixels = min(pixels, width)
+        plot._display.rect(
+            x + width - pixels, y, pixels, height, plot._background_color, True
         )
 
-        if len(x) == 1:
-            plot._display.pixel(xnorm[0], ynorm[0], self._line_color)
+    def _store(self, x: float, y: float) -> None:
+        """
+        Stores a point in the ring buffer, overwriting the oldest one when full
+        :param float x: x value
+        :param float y: y value
+        """
+        index = (self._start + self._count) % self._capacity
+        self._xbuffer[index] = x
+        self._ybuffer[index] = y
+        if self._count < self._capacity:
+            self._count += 1
         else:
-            for index, _ in enumerate(xnorm):
-                if index + 1 >= len(xnorm):
-                    break
-                if y[index] >= self.ymax:
-                    continue
+            self._start = (self._start + 1) % self._capacity
 
-                self._plot_line(plot, index, xnorm, ynorm)
+    def _redraw(self) -> None:
+        """
+        Clears the plot area and draws every point in the ring buffer. Display
+        lists forget the previous drawing of the points
+        """
+        draw_owned(self._plot._display, self, True, self._draw_buffer)
 
-            if fill:
-                for index, _ in enumerate(xnorm):
-                    plot._display.line(
-                        xnorm[index],
-                        ynorm[index],
-                        xnorm[index],
-                        plot._newymin,
-                        self._line_color,
-                    )
+    def _draw_buffer(self) -> None:
+        """
+        Clears the plot area and draws the points in the ring buffer
+        """
+        plot = self._plot
+        self.clear_plot(plot)
+        box = self._clip_box(plot)
+
+        xprev = yprev = None
+        for position in range(self._count):
+            index = (self._start + position) % self._capacity
+            xnew = self._xmapper.pixel(self._xbuffer[index])
+            ynew = self._ymapper.pixel(self._ybuffer[index])
+            if self._count == 1:
+                self._pixel(plot, box, xnew, ynew)
+            elif xprev is not None:
+                self._line(plot, box, xprev, yprev, xnew, ynew)
+            if self._fill:
+                self._line(plot, box, xnew, ynew, xnew, plot._newymin)
+            xprev = xnew
+            yprev = ynew
 
     def _draw_ticks(self, plot) -> None:
         """
@@ -189,56 +391,43 @@ class Logging:
         :param PLOT plot: plot object provided
 
         """
-
-        ticksxnorm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.xmin, self.xmax, plot._newxmin, plot._newxmax, _
-                    )
-                )
-                for _ in self.ticksx
-            ]
-        )
-        ticksynorm = tuple(
-            [
-                int(
-                    plot.transform(
-                        self.ymin, self.ymax, plot._newymin, plot._newymax, _
-                    )
-                )
-                for _ in self.ticksy
-            ]
-        )
-
-        for i, tick in enumerate(ticksxnorm):
-            plot._display.line(
-                tick,
-                plot._newymin,
-                tick,
-                plot._newymin - plot._tickheightx,
-                plot._tickcolor,
+        with measure(plot, "ticks"):
+            box = self._clip_box(plot)
+            ticksxnorm, _, labelsx = plot.tick_layout(
+                self.xmin, self.xmax, box[0], box[2], self.ticksx, False
+            )
+            ticksynorm, _, labelsy = plot.tick_layout(
+                self.ymin, self.ymax, box[3], box[1], self.ticksy, False
             )
-            if plot._showtext:
-                plot.show_text(
-                    "{:.{}f}".format(self.ticksx[i], plot._decimal_points),
+
+            for i, tick in enumerate(ticksxnorm):
+                plot._display.line(
                     tick,
                     plot._newymin,
-                    ax="x",
+                    tick,
+                    plot._newymin - plot._tickheightx,
+                    plot._tickcolor,
                 )
+                if plot._showtext:
+                    plot.show_text(
+                        labelsx[i],
+                        tick,
+                        plot._newymin,
+                        ax="x",
+                    )
 
-        for i, tick in enumerate(ticksynorm):
-            plot._display.line(
-                plot._newxmin,
-                tick,
-                plot._newxmin + plot._tickheighty,
-                tick,
-                plot._tickcolor,
-            )
-            if plot._showtext:
-                plot.show_text(
-                    "{:.{}f}".format(self.ticksy[i], plot._decimal_points),
+            for i, tick in enumerate(ticksynorm):
+                plot._display.line(
                     plot._newxmin,
                     tick,
-                    ax="y",
+                    plot._newxmin + plot._tickheighty,
+                    tick,
+                    plot._tickcolor,
                 )
+                if plot._showtext:
+                    plot.show_text(
+                        labelsy[i],
+                        plot._newxmin,
+                        tick,
+                        ax="y",
+                    )
@@ -15,16 +15,25 @@ MicroPython color map graph
 
 """
 try:
+    from typing import Optional, Union
     from micropython_uplot.plot import PLOT
 except ImportError:
     pass
 
 from math import floor
-from micropython_uplot.colors import set_color
+from struct import calcsize, unpack_from
+from micropython_uplot.displaylist import draw_owned
+from micropython_uplot.framebuffer import can_paste, direct_canvas, paste_area
+from micropython_uplot.palette import Palette, get_palette
+from micropython_uplot.stats import measure
+from micropython_uplot.utils import zeros
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/MicrotPython_UPLOT.git"
 
+_FADE_CACHE_SIZE = 8
+_fades = {}
+
 
 class Map:
     """
@@ -37,62 +46,463 @@ class Map:
         data_points: list,
         data_points_max: float,
         matrix_shape: list,
-        initial_color: tuple,
-        final_color: tuple,
+        initial_color: Optional[tuple] = None,
+        final_color: Optional[tuple] = None,
+        numbins: int = 10,
+        typecode: Optional[str] = None,
+        scale: float = 1,
+        interpolate: bool = False,
+        palette: Optional[Union[str, Palette]] = None,
     ) -> None:
         """
-        Due to IL9436 Display driver limitations number of map colors is limited to 10
+        The data is quantized into color bins in a single pass. When the display
+        buffer can be written directly, each row of cells is drawn with one blit
+        of a scaled band of bin colors, otherwise one filled rectangle is drawn
+        per cell.
+
         :param PLOT plot: Plot object for the scatter to be drawn
-        :param list data_points: data points to create the color map
+        :param list data_points: data points to create the color map, as a
+         list of rows or as a flat row-major sequence, like an ``array``, a
+         ``bytearray`` or a ``memoryview``. Flat data is read in place
         :param float data_points_max: data points max value
-        :param list matrix_shape: data_points matrix shape
-        :param tuple initial_color: initial color to create the color map
-        :param tuple final_color: final color to create the color map
+        :param list matrix_shape: data_points matrix shape, number of cells in
+         the x and y directions
+        :param tuple|None initial_color: initial color to create the color map
+        :param tuple|None final_color: final color to create the color map
+        :param int numbins: number of colors. Defaults to :const:`10`
+        :param str|None typecode: ``struct`` format of the values when flat data
+         is given as raw bytes, for example ``"<h"`` for little endian 16 bits
+         integers. Defaults to None, the values are read by indexing the data
+        :param float scale: factor applied to the values, for example to convert
+         raw sensor readings. Defaults to :const:`1`
+        :param bool interpolate: draw a smooth map, every pixel gets the color
+         of the value bilinearly interpolated from the nearest cells. The map
+         is computed and drawn one pixel row at a time, so only a few rows of
+         memory are used. Defaults to `False`
+        :param str|Palette|None palette: palette, or registered palette name, used
+         instead of the initial and final colors. The number of bins is then the
+         number of palette colors. Defaults to None
+
+        """
+        with measure(plot, "transform", self):
+            display = plot._display
+            self._plot = plot
+            if palette is None:
+                if initial_color is None or final_color is None:
+                    raise ValueError("Please provide the map colors or a palette")
+                palette = fade_palette(initial_color, final_color, numbins)
+            elif isinstance(palette, str):
+                palette = get_palette(palette)
+            numbins = len(palette)
+            self._numbins = numbins
+            self._step = data_points_max / numbins / scale
+            self._colors = palette.native(display, self)
+
+            self._flat = typecode is not None or isinstance(
+                data_points[0], (int, float)
+            )
+            if self._flat:
+                self._columns = matrix_shape[0]
+                self._rows = matrix_shape[1]
+            else:
+                self._columns = len(data_points[0])
+                self._rows = len(data_points)
+            self._format = None
+            if typecode is not None:
+                self._format = "%s%d%s" % (typecode[:-1], self._columns, typecode[-1])
+                self._row_bytes = calcsize(self._format)
+            width = plot._newxmax - plot._newxmin
+            height = plot._newymin - plot._newymax
+            self._xdist = width // matrix_shape[0]
+            self._ydist = height // matrix_shape[1]
+            self._left = plot._newxmin + plot.padding
+            self._top = plot._newymax + plot.padding
+
+            self._interpolate = interpolate
+            if interpolate:
+                self._setup_interpolation(display)
+                draw_owned(display, self, True, self._draw_interpolated, data_points)
+                return
+
+            self._bins = bytearray(self._columns * self._rows)
+            self._previous = bytearray(self._columns * self._rows)
+            self._quantize(data_points, self._bins)
+
+            self._band = self._new_band(display, self._ydist)
+            self._runs = {}
+            draw_owned(display, self, True, self._draw_rows, 0, self._rows)
 
+    def update(self, data_points: list) -> Optional[tuple]:
         """
+        Shows a new frame of data with the same shape. Only the cells whose
+        color bin changed are drawn again, rows where most cells changed are
+        drawn as a whole band.
 
-        self._numbins = 10
+        :param list data_points: data points of the new frame, in the same
+         layout used to create the map
 
-        self._pointer_index = 3
-        self._step = data_points_max / self._numbins
+        :return tuple|None: ``(x, y, width, height)`` rectangle containing the
+         changed cells, or None if no cell changed. Interpolated maps, and maps
+         kept in a display list, are always drawn again completely, the display
+         list then replaces the previous frame
 
-        width = plot._newxmax - plot._newxmin
-        height = plot._newymin - plot._newymax
-        xdist = width // matrix_shape[0]
-        ydist = height // matrix_shape[1]
+        """
+        with measure(self._plot, "transform", self):
+            if self._format is not None:
+                size = self._rows * self._row_bytes
+            elif self._flat:
+                size = self._rows * self._columns
+            else:
+                size = self._rows
+            if len(data_points) < size or (
+                not self._flat and len(data_points[0]) != self._columns
+            ):
+                raise ValueError("The new data shape does not match the map")
 
-        for i in range(1, 11):
-            color = color_fade(initial_color, final_color, i / 10)
-            print(color)
-            set_color(
-                plot._display,
-                self._pointer_index + i,
-                color[0],
-                color[1],
-                color[2],
+            display = self._plot._display
+            area = (
+                self._left,
+                self._top,
+                self._columns * self._xdist,
+                self._rows * self._ydist,
             )
+            if self._interpolate:
+                draw_owned(display, self, True, self._draw_interpolated, data_points)
+                return area
+
+            bins = self._previous
+            self._quantize(data_points, bins)
+            previous = self._bins
+            self._bins = bins
+            self._previous = previous
+
+            if getattr(display, "retained", False):
+                draw_owned(display, self, True, self._draw_rows, 0, self._rows)
+                return area
 
-        deltax = plot._newxmin + plot.padding
-        deltay = plot._newymax + plot.padding
+            columns = self._columns
+            colors = self._colors
+            xdist = self._xdist
+            ydist = self._ydist
+            colmin = columns
+            colmax = rowmin = rowmax = -1
 
-        for i, row in enumerate(data_points):
-            for _, col in enumerate(row):
-                if floor(col / self._step) > 9:
-                    color = 9
+            for row in range(self._rows):
+                start = row * columns
+                first = -1
+                count = 0
+                for column in range(columns):
+                    if bins[start + column] != previous[start + column]:
+                        if first < 0:
+                            first = column
+                        last = column
+                        count += 1
+                if not count:
+                    continue
+
+                if self._band is not None and 2 * count >= columns:
+                    self._draw_rows(row, row + 1)
+                    first = 0
+                    last = columns - 1
                 else:
-                    color = floor(col / self._step)
-                plot._display.rect(
-                    deltax,
-                    deltay,
-                    xdist,
-                    ydist,
-                    self._pointer_index + color + 1,
-                    True,
+                    deltay = self._top + row * ydist
+                    for column in range(first, last + 1):
+                        color = bins[start + column]
+                        if color != previous[start + column]:
+                            display.rect(
+                                self._left + column * xdist,
+                                deltay,
+                                xdist,
+                                ydist,
+                                colors[color],
+                                True,
+                            )
+
+                colmin = min(colmin, first)
+                colmax = max(colmax, last)
+                if rowmin < 0:
+                    rowmin = row
+                rowmax = row
+
+            if rowmin < 0:
+                return None
+            return (
+                self._left + colmin * xdist,
+                self._top + rowmin * ydist,
+                (colmax - colmin + 1) * xdist,
+                (rowmax - rowmin + 1) * ydist,
+            )
+
+    def _values(self, data_points):
+        """
+        Returns the data prepared to be read with :meth:`_row`
+        """
+        if self._flat and not isinstance(data_points, (list, tuple)):
+            return memoryview(data_points)
+        return data_points
+
+    def _row(self, data_points, row: int):
+        """
+        Returns the values of a row
+        """
+        if self._format is not None:
+            return unpack_from(self._format, data_points, row * self._row_bytes)
+        if self._flat:
+            return data_points[row * self._columns : (row + 1) * self._columns]
+        return data_points[row]
+
+    def _quantize(self, data_points, bins: bytearray) -> None:
+        """
+        Stores the color bin of every cell in ``bins``
+        """
+        step = self._step
+        last = self._numbins - 1
+        data_points = self._values(data_points)
+        index = 0
+        for row in range(self._rows):
+            for value in self._row(data_points, row):
+                color = floor(value / step)
+                if color > last:
+                    color = last
+                elif color < 0:
+                    color = 0
+                bins[index] = color
+                index += 1
+
+    def _setup_interpolation(self, display) -> None:
+        """
+        Allocates the row buffers and precomputes, for every pixel column and
+        row, the two cells used for the interpolation and the weight of the
+        second one
+        """
+        width = self._columns * self._xdist
+        self._xcells = _cell_weights(self._columns, self._xdist)
+        self._ycells = _cell_weights(self._rows, self._ydist)
+        self._upper = zeros("f", self._columns)
+        self._lower = zeros("f", self._columns)
+        self._mixed = zeros("f", self._columns)
+        self._pixels = bytearray(width)
+        self._band = self._new_band(display, 1)
+
+    def _new_band(self, display, height: int):
+        """
+        Returns a canvas for ``height`` pixel rows of the map, or None when
+        it can not be drawn with a blit or row copies at the map left edge,
+        for example GS4 buffers at an odd x without the framebuf module
+        """
+        if not can_paste(display, self._left):
+            return None
+        return direct_canvas(display, self._columns * self._xdist, height)
+
+    def _draw_interpolated(self, data_points) -> None:
+        """
+        Draws the map interpolating the values. For each pixel row the two
+        nearest data rows are mixed into one row of values, which is then
+        interpolated along the row, quantized and drawn
+        """
+        display = self._plot._display
+        data_points = self._values(data_points)
+        columns = self._columns
+        width = columns * self._xdist
+        step = self._step
+        last = self._numbins - 1
+        first_cells, second_cells, xweights = self._xcells
+        upper = self._upper
+        lower = self._lower
+        mixed = self._mixed
+        pixels = self._pixels
+        loaded = -1
+
+        for line in range(self._rows * self._ydist):
+            row = self._ycells[0][line]
+            if row != loaded:
+                _load(upper, self._row(data_points, row))
+                _load(lower, self._row(data_points, self._ycells[1][line]))
+                loaded = row
+            weight = self._ycells[2][line]
+            for column in range(columns):
+                mixed[column] = upper[column] + (lower[column] - upper[column]) * weight
+
+            for pixel in range(width):
+                value = mixed[first_cells[pixel]]
+                value = value + (mixed[second_cells[pixel]] - value) * xweights[pixel]
+                color = floor(value / step)
+                if color > last:
+                    color = last
+                elif color < 0:
+                    color = 0
+                pixels[pixel] = color
+
+            self._draw_pixels(display, self._top + line)
+
+    def _draw_pixels(self, display, y: int) -> None:
+        """
+        Draws a row of color bins. The row is packed into the line canvas when
+        the display buffer can be written directly, otherwise runs of the same
+        color are drawn with ``hline``
+        """
+        pixels = self._pixels
+        colors = self._colors
+        width = len(pixels)
+        band = self._band
+
+        if band is None:
+            start = 0
+            while start < width:
+                end = start + 1
+                while end < width and pixels[end] == pixels[start]:
+                    end += 1
+                display.hline(self._left + start, y, end - start, colors[pixels[start]])
+                start = end
+            return
+
+        buffer = band.buffer
+        if band.mode == "GS4":
+            for pixel in range(0, width - 1, 2):
+                buffer[pixel >> 1] = (
+                    colors[pixels[pixel]] << 4 | colors[pixels[pixel + 1]]
                 )
-                deltax = deltax + xdist
-            deltax = plot._newxmin + plot.padding
+            if width & 1:
+                buffer[width >> 1] = colors[pixels[width - 1]] << 4
+        elif band.mode == "GS8":
+            for pixel in range(width):
+                buffer[pixel] = colors[pixels[pixel]]
+        else:
+            for pixel in range(width):
+                value = colors[pixels[pixel]]
+                buffer[2 * pixel] = value & 0xFF
+                buffer[2 * pixel + 1] = value >> 8
+        paste_area(display, band, self._left, y)
+
+    def _draw_rows(self, first: int, last: int) -> None:
+        """
+        Draws the cells of the rows from ``first`` to ``last``, last not included
+        """
+        display = self._plot._display
+        columns = self._columns
+        xdist = self._xdist
+        ydist = self._ydist
+        bins = self._bins
+        colors = self._colors
+        band = self._band
+        deltay = self._top + first * ydist
+
+        for row in range(first, last):
+            start = row * columns
+            if band is None:
+                deltax = self._left
+                for color in bins[start : start + columns]:
+                    display.rect(deltax, deltay, xdist, ydist, colors[color], True)
+                    deltax = deltax + xdist
+            else:
+                self._fill_band(start)
+                paste_area(display, band, self._left, deltay)
             deltay = deltay + ydist
 
+    def _fill_band(self, start: int) -> None:
+        """
+        Fills the band canvas with the scaled cells of a row. The first line
+        is written from pre-rendered runs of bytes, and copied to the others
+        """
+        band = self._band
+        buffer = memoryview(band.buffer)
+        stride = len(band.buffer) // band.height
+        bins = self._bins
+        runs = self._runs
+        columns = self._columns
+        position = 0
+
+        if band.mode == "GS4":
+            # Pixels share bytes, so the cells are written two at a time
+            for index in range(start, start + columns, 2):
+                second = bins[index + 1] if index + 1 < start + columns else 0
+                key = bins[index] << 8 | second
+                run = runs.get(key)
+                if run is None:
+                    run = self._gs4_run(bins[index], second)
+                    runs[key] = run
+                size = min(len(run), stride - position)
+                buffer[position : position + size] = run[:size]
+                position = position + size
+        else:
+            for color in bins[start : start + columns]:
+                run = runs.get(color)
+                if run is None:
+                    value = self._colors[color]
+                    if band.mode == "GS8":
+                        run = bytes([value]) * self._xdist
+                    else:
+                        run = bytes([value & 0xFF, value >> 8]) * self._xdist
+                    runs[color] = run
+                buffer[position : position + len(run)] = run
+                position = position + len(run)
+
+        for line in range(1, band.height):
+            buffer[line * stride : (line + 1) * stride] = buffer[0:stride]
+
+    def _gs4_run(self, first: int, second: int) -> bytes:
+        """
+        Returns the packed GS4 pixels of two consecutive cells
+        """
+        xdist = self._xdist
+        pixels = [self._colors[first]] * xdist + [self._colors[second]] * xdist
+        return bytes(
+            [pixels[index] << 4 | pixels[index + 1] for index in range(0, 2 * xdist, 2)]
+        )
+
+
+def _cell_weights(cells: int, size: int) -> tuple:
+    """
+    For every pixel of an axis with ``cells`` cells of ``size`` pixels, returns
+    the first and second cells to interpolate from and the weight of the second
+    """
+    first = zeros("H", cells * size)
+    second = zeros("H", cells * size)
+    weights = zeros("f", cells * size)
+    for pixel in range(cells * size):
+        position = (pixel + 0.5) / size - 0.5
+        if position < 0:
+            position = 0
+        elif position > cells - 1:
+            position = cells - 1
+        cell = int(position)
+        first[pixel] = cell
+        second[pixel] = min(cell + 1, cells - 1)
+        weights[pixel] = position - cell
+    return first, second, weights
+
+
+def _load(target, values) -> None:
+    """
+    Copies the values of a row into a float array
+    """
+    for index, value in enumerate(values):
+        target[index] = value
+
+
+def fade_palette(initial_color: tuple, final_color: tuple, steps: int) -> Palette:
+    """
+    Returns the palette used for a fade between two colors, going from
+    ``1 / steps`` of the way to the final color. Palettes are cached, so
+    charts using the same colors share them.
+
+    :param tuple initial_color: initial color
+    :param tuple final_color: final color
+    :param int steps: number of colors
+
+    :return Palette: the palette
+    """
+    key = (tuple(initial_color), tuple(final_color), steps)
+    palette = _fades.get(key)
+    if palette is None:
+        if len(_fades) >= _FADE_CACHE_SIZE:
+            _fades.clear()
+        palette = Palette(
+            (color_fade(initial_color, final_color, 1 / steps), final_color), steps
+        )
+        _fades[key] = palette
+    return palette
+
 
 def color_fade(start_color: int, end_color: int, fraction: float) -> tuple:
     """Linear extrapolation of a color between two RGB colors (tuple or 24-bit integer).
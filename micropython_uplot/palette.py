@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`palette`
+================================================================================
+
+Color gradients computed once and shared between charts
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+try:
+    from typing import Optional
+except ImportError:
+    pass
+
+from micropython_uplot.colors import color_table
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+_SHIFT = 16
+
+# Color stops of the palettes available by name without registering them
+_PRESETS = {
+    "thermal": ((0, 0, 0), (128, 0, 128), (255, 0, 0), (255, 255, 0), (255, 255, 255)),
+    "gray": ((0, 0, 0), (255, 255, 255)),
+    "ocean": ((0, 0, 64), (0, 128, 255), (0, 255, 200)),
+}
+
+_palettes = {}
+
+
+class Palette:
+    """
+    Gradient of ``steps`` colors going through two or more evenly spaced color
+    stops. The gradient is computed once using integer math. The colors
+    converted for each display are cached by the display color table, so
+    charts sharing a palette do not convert them again.
+
+    :param list stops: colors of the gradient as ``(r, g, b)`` tuples, the
+     first and last colors are the ends of the gradient
+    :param int steps: number of colors. Defaults to :const:`10`
+    :param str|None name: name to register the palette with, see
+     :func:`get_palette`. Defaults to None
+
+    """
+
+    def __init__(self, stops, steps: int = 10, name: Optional[str] = None) -> None:
+        if len(stops) < 2:
+            raise ValueError("A palette needs at least two color stops")
+        if steps < 2:
+            raise ValueError("A palette needs at least two steps")
+
+        self.colors = []
+        segments = len(stops) - 1
+        for step in range(steps):
+            position = (step * segments << _SHIFT) // (steps - 1)
+            segment = position >> _SHIFT
+            if segment >= segments:
+                self.colors.append(tuple(stops[-1]))
+                continue
+            fraction = position & ((1 << _SHIFT) - 1)
+            start = stops[segment]
+            end = stops[segment + 1]
+            self.colors.append(
+                tuple(
+                    [
+                        start[i] + ((end[i] - start[i]) * fraction >> _SHIFT)
+                        for i in range(3)
+                    ]
+                )
+            )
+
+        if name is not None:
+            _palettes[name] = self
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def native(self, display, owner=None) -> list:
+        """
+        Returns the palette colors as display color values, taken from the
+        color table of the display. For displays with a ``lut`` each color
+        takes a slot held by ``owner``, colors already in the table reuse
+        their slot.
+
+        :param display: display object
+        :param owner: object holding the color slots. Defaults to the palette
+
+        :return list: color values to draw with
+        """
+        table = color_table(display)
+        if owner is None:
+            owner = self
+        return [table.get(color, owner) for color in self.colors]
+
+
+def get_palette(name: str) -> Palette:
+    """
+    Returns a registered palette. The ``"thermal"``, ``"gray"`` and ``"ocean"``
+    palettes are created with :const:`10` steps the first time they are asked.
+
+    :param str name: palette name
+
+    :return Palette: the palette
+    """
+    palette = _palettes.get(name)
+    if palette is None:
+        if name not in _PRESETS:
+            raise ValueError("Unknown palette %s" % name)
+        palette = Palette(_PRESETS[name], name=name)
+    return palette
@@ -13,11 +13,27 @@ MicroPython Graphics Library
 
 """
 
-from micropython_uplot.colors import set_color
+# pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-lines
+# pylint: disable=too-many-public-methods
+
+from array import array
+from micropython_uplot.colors import color_table
+from micropython_uplot.dirty import DirtyTracker
+from micropython_uplot.displaylist import DisplayList, render_bands
+from micropython_uplot.framebuffer import (
+    RowReader,
+    can_paste,
+    copy_area,
+    dashed_hline,
+    dashed_vline,
+    drawable_canvas,
+    paste_area,
+)
+from micropython_uplot.stats import Stats, StatsProxy, measure
+from micropython_uplot.utils import zeros
 
 try:
-    from typing import Union, Optional
-    from typing_extensions import Literal
+    from typing import Literal, Optional, Union
 except ImportError:
     pass
 
@@ -25,6 +41,91 @@ except ImportError:
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
 
+_PIXEL_MIN = -32768
+_PIXEL_MAX = 32767
+_MAPPER_CACHE_SIZE = 16
+_LAYOUT_CACHE_SIZE = 8
+
+# Default ticks and subticks, as a percentage of the axis range
+_TICKS = (10, 30, 50, 70, 90)
+_SUBTICKS = (20, 40, 60, 80)
+
+
+class Mapper:
+    """
+    Affine map between a data range and a pixel range. Scale and offset are
+    computed once, so a whole series can be converted in a single pass.
+
+    :param int|float rangemin: minimum of the original range
+    :param int|float rangemax: maximum of the original range
+    :param int|float newrangemin: minimum of the new range
+    :param int|float newrangemax: maximum of the new range
+
+    """
+
+    def __init__(
+        self,
+        rangemin: Union[float, int],
+        rangemax: Union[float, int],
+        newrangemin: Union[float, int],
+        newrangemax: Union[float, int],
+    ) -> None:
+        if rangemax == rangemin:
+            raise ValueError("Range minimum and maximum can not be the same value")
+        self.scale = (newrangemax - newrangemin) / (rangemax - rangemin)
+        self.offset = newrangemin - rangemin * self.scale
+
+    def __call__(self, value: Union[float, int]) -> float:
+        """
+        Converts a single value into the new range
+
+        :param int|float value: value to be converted
+
+        :return float: converted value
+
+        """
+        return value * self.scale + self.offset
+
+    def pixel(self, value: Union[float, int]) -> int:
+        """
+        Converts a single value into an integer pixel coordinate
+
+        :param int|float value: value to be converted
+
+        :return int: pixel coordinate
+
+        """
+        pixel = int(value * self.scale + self.offset)
+        if pixel > _PIXEL_MAX:
+            return _PIXEL_MAX
+        if pixel < _PIXEL_MIN:
+            return _PIXEL_MIN
+        return pixel
+
+    def map(self, values, out: Optional[array] = None) -> array:
+        """
+        Converts a whole sequence into pixel coordinates
+
+        :param values: sequence of values to be converted
+        :param array|None out: ``array('h')`` to be reused for the result. A new
+         array is created if it is None or its length does not match
+
+        :return array: ``array('h')`` with the pixel coordinates
+
+        """
+        if out is None or len(out) != len(values):
+            out = zeros("h", len(values))
+        scale = self.scale
+        offset = self.offset
+        for index, value in enumerate(values):
+            pixel = int(value * scale + offset)
+            if pixel > _PIXEL_MAX:
+                pixel = _PIXEL_MAX
+            elif pixel < _PIXEL_MIN:
+                pixel = _PIXEL_MIN
+            out[index] = pixel
+        return out
+
 
 class PLOT:
     """
@@ -43,6 +144,18 @@ class PLOT:
      Defaults to white ''(255, 255, 255)``
     :param int tickx_height: x axes tick height in pixels. Defaults to 8.
     :param int ticky_height: y axes tick height in pixels. Defaults to 8.
+    :param bool track_dirty: collect the regions changed by the plot, see
+     :meth:`dirty_regions`. Defaults to `False`
+    :param dirty_callback: function called by :meth:`refresh` with the list of
+     dirty regions, for drivers that support partial refresh. Defaults to None
+    :param bool stats: collect rendering statistics, see :meth:`stats`.
+     Defaults to `False`
+    :param bool record: keep the drawing calls in a display list, see
+     :meth:`replay`. Defaults to `False`
+    :param bool immediate: draw on the display while the calls are recorded.
+     With `False` the calls are only recorded, and the plot is drawn with
+     :meth:`render_bands` or :meth:`replay`, so the display does not need a
+     frame buffer. Defaults to `True`
 
     """
 
@@ -59,14 +172,36 @@ class PLOT:
         box_color: tuple = (255, 255, 255),
         tickx_height: int = 8,
         ticky_height: int = 8,
+        track_dirty: bool = False,
+        dirty_callback=None,
+        stats: bool = False,
+        record: bool = False,
+        immediate: bool = True,
     ) -> None:
+        self._stats = None
+        if stats:
+            self._stats = Stats()
+            display = StatsProxy(display, self._stats)
+        self._dirty = None
+        if track_dirty:
+            display = DirtyTracker(display)
+            self._dirty = display
+        self._display_list = None
+        self._immediate = immediate
+        if record or not immediate:
+            self._display_list = DisplayList(display, immediate)
+            display = self._display_list
         self._display = display
-        self._background_color = set_color(
-            display, 0, background_color[0], background_color[1], background_color[2]
-        )
-
-        self._tickcolor = set_color(display, 1, 255, 255, 255)
-        self._boxcolor = set_color(display, 2, box_color[0], box_color[1], box_color[2])
+        self._dirty_callback = dirty_callback
+        self._color_table = color_table(display)
+        try:
+            self._background_color = self._color_table.set(0, background_color, self)
+        except ValueError:
+            # Slot 0 holds the background of another plot on the display
+            self._background_color = self._color_table.get(background_color, self)
+
+        self._tickcolor = self.color((255, 255, 255), (self, "ticks"))
+        self._boxcolor = self.color(box_color)
         self._color0 = background_color
         self._color1 = box_color
         self._color2 = (255, 255, 255)
@@ -97,12 +232,17 @@ class PLOT:
         self._showticks = False
         self._tickgrid = False
 
-        self._grid_espace = 2
-        self._grid_lenght = 2
+        self._grid_dash = 3
+        self._grid_gap = 1
 
-        self._index_colorused = 4
+        self._mappers = {}
+        self._tick_layouts = {}
 
-        self._pointer_index = 3
+        self._showbox = show_box
+        self._static = None
+        self._static_args = None
+        self._static_origin = (0, 0)
+        self._static_ticks = False
 
         if show_box:
             self._drawbox()
@@ -161,6 +301,284 @@ class PLOT:
                 self._boxcolor,
             )
 
+    def dirty_regions(self) -> list:
+        """
+        Returns the regions changed since the last :meth:`clear_dirty`, as
+        ``(x, y, width, height)`` tuples. The list is empty if the plot was
+        not created with ``track_dirty``
+
+        :return list: dirty regions
+
+        """
+        if self._dirty is None:
+            return []
+        return self._dirty.regions
+
+    def clear_dirty(self) -> None:
+        """
+        Forgets the collected dirty regions
+
+        :return: None
+
+        """
+        if self._dirty is not None:
+            self._dirty.clear()
+
+    def refresh(self) -> None:
+        """
+        Sends the dirty regions to the display and clears them. The regions
+        are given to ``dirty_callback`` when one was provided, otherwise the
+        display ``show`` method is called if anything changed.
+
+        :return: None
+
+        """
+        regions = self.dirty_regions()
+        if not regions:
+            return
+        if self._dirty_callback is not None:
+            self._dirty_callback(regions)
+        else:
+            self._display.show()
+        self.clear_dirty()
+
+    def stats(self) -> dict:
+        """
+        Returns the rendering statistics collected since the plot was created
+        or :meth:`reset_stats` was called, until :meth:`stop_stats`. The plot
+        must be created with ``stats``. Only the charts drawn on this plot are
+        timed, plots created without ``stats`` are not affected.
+
+        ``calls`` and ``pixels`` give the number of calls and the estimated
+        pixels drawn for each display primitive. ``stages`` gives the
+        microseconds used converting the data, drawing, computing the ticks
+        and drawing text, and ``charts`` the microseconds used by each chart.
+
+        :return dict: ``calls``, ``pixels``, ``stages`` and ``charts``
+
+        """
+        if self._stats is None:
+            raise ValueError("The plot was not created with stats")
+        return self._stats.result()
+
+    def reset_stats(self) -> None:
+        """
+        Sets the rendering statistics to zero
+
+        :return: None
+
+        """
+        if self._stats is None:
+            raise ValueError("The plot was not created with stats")
+        self._stats.reset()
+
+    def stop_stats(self) -> None:
+        """
+        Stops collecting rendering statistics, :meth:`stats` keeps returning
+        the collected values.
+
+        :return: None
+
+        """
+        if self._stats is None:
+            raise ValueError("The plot was not created with stats")
+        self._stats.active = False
+
+    def layer(self, name: str = "default") -> None:
+        """
+        Selects the display list layer the next drawing calls are recorded in,
+        for example one layer for the box and ticks and one for each chart.
+        The plot must be created with ``record``.
+
+        :param str name: layer name. Defaults to ``"default"``
+        :return: None
+
+        """
+        self._recording().layer(name)
+
+    def invalidate(self, layer: Optional[str] = None) -> None:
+        """
+        Forgets the drawing calls recorded in a layer, so it can be drawn again
+        with new data. The display is not modified.
+
+        :param str|None layer: layer name, None forgets every layer. Defaults to None
+        :return: None
+
+        """
+        self._recording().clear(layer)
+
+    def replay(self, layers: Optional[list] = None, display=None) -> None:
+        """
+        Draws the recorded calls again without computing the charts, for
+        example after the screen was used by another page. The plot must be
+        created with ``record``.
+
+        :param list|None layers: names of the layers to draw, None draws every
+         layer. Defaults to None
+        :param display: display object to draw into. Defaults to the plot display
+
+        :return: None
+
+        """
+        self._recording().replay(display, layers)
+
+    def render_bands(
+        self,
+        callback,
+        band_height: int = 32,
+        layers: Optional[list] = None,
+        plots: tuple = (),
+        canvas=None,
+    ) -> None:
+        """
+        Draws the recorded calls one horizontal band of the display at a time,
+        so only a band sized buffer is needed. Each band spans the display
+        width and is cleared with the background color. It is drawn from the
+        calls crossing it, and handed to ``callback(canvas, x, y, rows)`` to be
+        sent to the display at ``x, y``, using the first ``rows`` rows of the
+        canvas. Only the rows used by the plots are drawn.
+
+        A 480x320 RGB565 display needs 30 kB with 32 rows bands, instead of
+        300 kB. Other plots on the same display are given in ``plots``, so
+        they are drawn in the same bands instead of being cleared.
+
+        :param callback: function sending a band to the display
+        :param int band_height: rows of each band. Defaults to :const:`32`
+        :param list|None layers: names of the layers to draw, None draws every
+         layer. Defaults to None
+        :param tuple plots: other plots to draw in the bands. Defaults to ``()``
+        :param canvas: canvas to draw the bands into, with the display width.
+         Its height sets the rows of each band. Defaults to a new canvas in the
+         display format, see :func:`drawable_canvas`
+
+        :return: None
+
+        """
+        display_lists = [self._recording()]
+        display_lists.extend([plot._recording() for plot in plots])
+        width = self._display.width
+        top = self._display.height
+        bottom = 0
+        for display_list in display_lists:
+            first, last = display_list.extent()
+            if first < last:
+                top = min(top, first)
+                bottom = max(bottom, last)
+        top = max(top, 0)
+        bottom = min(bottom, self._display.height)
+        if top >= bottom:
+            return
+        if canvas is None:
+            canvas = drawable_canvas(self._display, width, band_height)
+            if canvas is None:
+                raise ValueError("The display format can not be drawn in bands")
+        render_bands(
+            display_lists,
+            canvas,
+            callback,
+            0,
+            top,
+            width,
+            bottom - top,
+            layers,
+            self._background_color,
+        )
+
+    def _recording(self) -> DisplayList:
+        """
+        Returns the display list of a plot created with ``record`` or
+        without ``immediate``
+        """
+        if self._display_list is None:
+            raise ValueError("The plot does not record its drawing calls")
+        return self._display_list
+
+    def _drawn(self) -> None:
+        """
+        Checks the plot is drawn on the display. Plots created without
+        ``immediate`` are only recorded, their display holds nothing to read
+        """
+        if not self._immediate:
+            raise ValueError(
+                "The plot is only recorded, draw it with render_bands or replay"
+            )
+
+    def render_static(
+        self,
+        x: Optional[list] = None,
+        y: Optional[list] = None,
+        ticksx: Optional[list] = None,
+        ticksy: Optional[list] = None,
+    ) -> None:
+        """
+        Draws the static layer of the plot, the box, ticks, grid and tick
+        labels, over a cleared plot area and keeps a copy of it in an off-screen
+        buffer. :meth:`restore_static` then puts it back with a single blit
+        before drawing each data frame. The copy is discarded when
+        :meth:`tick_params` or :meth:`axs_params` are called, and rendered
+        again by the next :meth:`restore_static`.
+
+        Ticks are drawn as in :meth:`_draw_ticks` when ``x`` and ``y`` are given
+        and ticks are enabled. The ``show_ticks`` setting of :meth:`tick_params`
+        is then turned off, so charts created afterwards do not draw their
+        ticks over the layer. Call :meth:`tick_params` to turn it on again.
+
+        The copy takes the size of the plot area in the display buffer format,
+        a 300x250 plot uses 37.5 kB in GS4 and 150 kB in RGB565. The display
+        must expose its frame buffer, and the copy must be drawn back with a
+        single blit or by copying rows, otherwise a ``ValueError`` is raised
+        instead of restoring the layer pixel by pixel. Plots created without
+        ``immediate`` have no layer to copy and raise a ``ValueError`` too.
+
+        :param list|None x: x data used to place the ticks. Defaults to None
+        :param list|None y: y data used to place the ticks. Defaults to None
+        :param list|None ticksx: x ticks data. Defaults to None
+        :param list|None ticksy: y ticks data. Defaults to None
+
+        :return: None
+
+        """
+        self._drawn()
+        origin_x, origin_y, width, height = self._region(None, None, None, None)
+        if not can_paste(self._display, origin_x):
+            raise ValueError(
+                "The display can not restore the static layer with a blit or row copies"
+            )
+        self._static_args = (x, y, ticksx, ticksy)
+        ticks = (
+            x is not None and y is not None and (self._showticks or self._static_ticks)
+        )
+        self._static = None
+        self._display.rect(
+            origin_x, origin_y, width, height, self._background_color, True
+        )
+        if self._showbox:
+            self._drawbox()
+        if ticks:
+            self._draw_ticks(x, y, ticksx, ticksy)
+            self._showticks = False
+        self._static_ticks = ticks
+        self._static = copy_area(self._display, origin_x, origin_y, width, height)
+        self._static_origin = (origin_x, origin_y)
+
+    def restore_static(self) -> None:
+        """
+        Restores the static layer saved by :meth:`render_static`, erasing
+        everything drawn over it. The layer is rendered again if it was
+        discarded by a parameter change.
+
+        :return: None
+
+        """
+        if self._static is None:
+            if self._static_args is None:
+                raise ValueError("The static layer has not been rendered")
+            self.render_static(*self._static_args)
+            return
+        paste_area(
+            self._display, self._static, self._static_origin[0], self._static_origin[1]
+        )
+
     def _update_plot(self) -> None:
         """
         Function to update graph
@@ -181,6 +599,7 @@ class PLOT:
 
         """
         self._axesparams = axstype
+        self._static = None
         self._update_plot()
 
     def _draw_ticks(self, x: int, y: int, ticksx=None, ticksy=None) -> None:
@@ -195,116 +614,69 @@ class PLOT:
         :return:None
 
         """
-        ticks_dummy = (10, 30, 50, 70, 90)
-        subticks_dummy = (20, 40, 60, 80)
-        minx = min(x)
-        maxx = max(x)
-        miny = min(y)
-        maxy = max(y)
-
-        if ticksx is None:
-            ticksxnorm = tuple(
-                [self.transform(0, 100, minx, maxx, _) for _ in ticks_dummy]
-            )
-            subticksxnorm = tuple(
-                [self.transform(0, 100, minx, maxx, _) for _ in subticks_dummy]
-            )
-        else:
-            ticksxnorm = tuple([self.transform(0, 100, minx, maxx, _) for _ in ticksx])
-
-        if ticksy is None:
-            ticksynorm = tuple(
-                [self.transform(0, 100, miny, maxy, _) for _ in ticks_dummy]
-            )
-            subticksynorm = tuple(
-                [self.transform(0, 100, miny, maxy, _) for _ in subticks_dummy]
-            )
-        else:
-            ticksynorm = tuple([self.transform(0, 100, miny, maxy, _) for _ in ticksy])
-
-        ticksxrenorm = tuple(
-            [
-                int(self.transform(minx, maxx, self._newxmin, self._newxmax, _))
-                for _ in ticksxnorm
-            ]
-        )
-        ticksyrenorm = tuple(
-            [
-                int(self.transform(miny, maxy, self._newymin, self._newymax, _))
-                for _ in ticksynorm
-            ]
-        )
-
-        if ticksx is None:
-            subticksxrenorm = tuple(
-                [
-                    int(self.transform(minx, maxx, self._newxmin, self._newxmax, _))
-                    for _ in subticksxnorm
-                ]
+        with measure(self, "ticks"):
+            ticksxrenorm, subticksxrenorm, labelsx = self.tick_layout(
+                min(x), max(x), self._newxmin, self._newxmax, ticksx
             )
-        if ticksy is None:
-            subticksyrenorm = tuple(
-                [
-                    int(self.transform(miny, maxy, self._newymin, self._newymax, _))
-                    for _ in subticksynorm
-                ]
+            ticksyrenorm, subticksyrenorm, labelsy = self.tick_layout(
+                min(y), max(y), self._newymin, self._newymax, ticksy
             )
 
-        for i, tick in enumerate(ticksxrenorm):
-            self._display.line(
-                tick,
-                self._newymin,
-                tick,
-                self._newymin - self._tickheightx,
-                self._tickcolor,
-            )
-            if self._showtext:
-                self.show_text(
-                    "{:.{}f}".format(ticksxnorm[i], self._decimal_points),
-                    tick,
-                    self._newymin,
-                    ax="x",
-                )
-
-        for i, tick in enumerate(ticksyrenorm):
-            self._display.line(
-                self._newxmin,
-                tick,
-                self._newxmin + self._tickheighty,
-                tick,
-                self._tickcolor,
-            )
-            if self._showtext:
-                self.show_text(
-                    "{:.{}f}".format(ticksynorm[i], self._decimal_points),
-                    self._newxmin,
-                    tick,
-                    ax="y",
-                )
-
-        if ticksx is None:
-            for tick in subticksxrenorm:
+            for i, tick in enumerate(ticksxrenorm):
                 self._display.line(
                     tick,
                     self._newymin,
                     tick,
-                    self._newymin - self._tickheightx // 2,
+                    self._newymin - self._tickheightx,
                     self._tickcolor,
                 )
+                if self._showtext:
+                    self.show_text(
+                        labelsx[i],
+                        tick,
+                        self._newymin,
+                        ax="x",
+                    )
 
-        if ticksy is None:
-            for tick in subticksyrenorm:
+            for i, tick in enumerate(ticksyrenorm):
                 self._display.line(
                     self._newxmin,
                     tick,
-                    self._newxmin + self._tickheighty // 2,
+                    self._newxmin + self._tickheighty,
                     tick,
                     self._tickcolor,
                 )
+                if self._showtext:
+                    self.show_text(
+                        labelsy[i],
+                        self._newxmin,
+                        tick,
+                        ax="y",
+                    )
+
+            if subticksxrenorm is not None:
+                for tick in subticksxrenorm:
+                    self._display.line(
+                        tick,
+                        self._newymin,
+                        tick,
+                        self._newymin - self._tickheightx // 2,
+                        self._tickcolor,
+                    )
+
+            if subticksyrenorm is not None:
+                for tick in subticksyrenorm:
+                    self._display.line(
+                        self._newxmin,
+                        tick,
+                        self._newxmin + self._tickheighty // 2,
+                        tick,
+                        self._tickcolor,
+                    )
 
-        if self._tickgrid:
-            self._draw_gridx(ticksxrenorm)
-            self._draw_gridy(ticksyrenorm)
+            if self._tickgrid:
+                self._draw_gridx(ticksxrenorm)
+                self._draw_gridy(ticksyrenorm)
 
     @staticmethod
     def transform(
@@ -331,6 +703,92 @@ class PLOT:
             / (oldrangemax - oldrangemin)
         ) + newrangemin
 
+    def mapper(
+        self,
+        oldrangemin: Union[float, int],
+        oldrangemax: Union[float, int],
+        newrangemin: Union[float, int],
+        newrangemax: Union[float, int],
+    ) -> Mapper:
+        """
+        Returns a :class:`Mapper` for the given ranges. Mappers are cached, so
+        charts sharing the same data and pixel ranges reuse the same object.
+
+        :param int|float oldrangemin: minimum of the original range
+        :param int|float oldrangemax: maximum of the original range
+        :param int|float newrangemin: minimum of the new range
+        :param int|float newrangemax: maximum of the new range
+
+        :return Mapper: mapper for the given ranges
+
+        """
+        key = (oldrangemin, oldrangemax, newrangemin, newrangemax)
+        mapper = self._mappers.get(key)
+        if mapper is None:
+            if len(self._mappers) >= _MAPPER_CACHE_SIZE:
+                self._mappers.clear()
+            mapper = Mapper(oldrangemin, oldrangemax, newrangemin, newrangemax)
+            self._mappers[key] = mapper
+        return mapper
+
+    def tick_layout(
+        self,
+        rangemin: Union[float, int],
+        rangemax: Union[float, int],
+        pixelmin: int,
+        pixelmax: int,
+        ticks=None,
+        relative: bool = True,
+    ) -> tuple:
+        """
+        Returns the layout of the ticks of an axis: the tick pixel positions,
+        the subtick pixel positions and the tick labels. Layouts are cached,
+        keyed on the axis range, the pixel span, the ticks and the number of
+        decimal points, so redrawing an axis with the same range does not
+        compute the positions or format the labels again.
+
+        :param int|float rangemin: minimum of the axis range
+        :param int|float rangemax: maximum of the axis range
+        :param int pixelmin: pixel coordinate of the range minimum
+        :param int pixelmax: pixel coordinate of the range maximum
+        :param list|None ticks: ticks values. Defaults to None, five ticks and
+         four subticks evenly spread over the range are then used
+        :param bool relative: ticks are given as a percentage of the range.
+         Set to `False` if they are given as range values. Defaults to `True`
+
+        :return tuple: ``array('h')`` with the tick positions, ``array('h')``
+         with the subtick positions or None, and a tuple with the labels, or
+         None if the text is not shown
+
+        """
+        if ticks is not None:
+            ticks = tuple(ticks)
+        key = (rangemin, rangemax, pixelmin, pixelmax, ticks, relative)
+        layout = self._tick_layouts.get(key)
+        if layout is None:
+            mapper = self.mapper(rangemin, rangemax, pixelmin, pixelmax)
+            subticks = None
+            if ticks is None or relative:
+                norm = self.mapper(0, 100, rangemin, rangemax)
+                if ticks is None:
+                    ticks = _TICKS
+                    subticks = mapper.map(tuple([norm(_) for _ in _SUBTICKS]))
+                ticks = tuple([norm(_) for _ in ticks])
+            layout = [mapper.map(ticks), subticks, ticks, None, None]
+            if len(self._tick_layouts) >= _LAYOUT_CACHE_SIZE:
+                self._tick_layouts.clear()
+            self._tick_layouts[key] = layout
+
+        labels = None
+        if self._showtext:
+            if layout[4] != self._decimal_points:
+                layout[3] = tuple(
+                    ["{:.{}f}".format(_, self._decimal_points) for _ in layout[2]]
+                )
+                layout[4] = self._decimal_points
+            labels = layout[3]
+        return layout[0], layout[1], labels
+
     def tick_params(
         self,
         show_ticks=True,
@@ -340,6 +798,8 @@ class PLOT:
         tickgrid: bool = False,
         showtext: bool = False,
         decimal_points: int = 0,
+        grid_dash: int = 3,
+        grid_gap: int = 1,
     ) -> None:
         """
         Function to set ticks parameters
@@ -351,6 +811,8 @@ class PLOT:
         :param bool tickgrid: defines if the grid is to be shown. Defaults to `False`
         :param bool showtext: Show Axes text. Defaults to `False`
         :param int decimal_points: Number of decimal points to show. Defaults to :const:`0`
+        :param int grid_dash: grid dash length in pixels. Defaults to :const:`3`
+        :param int grid_gap: grid gap length in pixels. Defaults to :const:`1`
 
         :return: None
 
@@ -359,19 +821,56 @@ class PLOT:
             raise ValueError(
                 "Please select a padding that allows to show the tick text"
             )
+        if grid_dash < 1 or grid_gap < 0:
+            raise ValueError("Grid dash must be at least 1 and gap can not be negative")
 
         self._showticks = show_ticks
         self._tickheightx = tickx_height
         self._tickheighty = ticky_height
 
-        self._tickcolor = set_color(
-            self._display, 1, tickcolor[0], tickcolor[1], tickcolor[2]
-        )
+        self.release_colors((self, "ticks"))
+        self._tickcolor = self.color(tickcolor, (self, "ticks"))
         self._color2 = tickcolor
 
         self._tickgrid = tickgrid
+        self._grid_dash = grid_dash
+        self._grid_gap = grid_gap
         self._showtext = showtext
         self._decimal_points = decimal_points
+        self._static = None
+        self._static_ticks = False
+
+    def color(self, color: tuple, owner=None) -> int:
+        """
+        Returns the value to draw a color with. On displays with a color table
+        the color takes a slot, shared with every chart using the same color.
+        The slot is held by ``owner`` until :meth:`release_colors` is called,
+        so charts that are removed can give their slots back.
+
+        :param tuple color: color as ``(r, g, b)``
+        :param owner: object holding the color slot. Defaults to the plot
+
+        :return int: color value
+        """
+        if owner is None:
+            owner = self
+        return self._color_table.get(color, owner)
+
+    def release_colors(self, owner=None) -> None:
+        """
+        Releases the color slots held by ``owner``, for example a chart that
+        is not shown anymore. The slots keep their colors until they are
+        needed for new colors.
+
+        :param owner: object holding the color slots. Defaults to the plot,
+         releasing the background, box and tick colors
+
+        :return: None
+        """
+        if owner is None:
+            self._color_table.release((self, "ticks"))
+            owner = self
+        self._color_table.release(owner)
 
     def show_text(
         self,
@@ -418,17 +917,21 @@ class PLOT:
         :return: None
 
         """
+        period = self._grid_dash + self._grid_gap
+        count = (self._newxmax - self._newxmin + 1 - self._grid_dash) // period + 1
+        if count <= 0:
+            return
+        width = (count - 1) * period + self._grid_dash
         for tick in ticks_data:
-            start = self._newxmin
-            while start + self._grid_lenght <= self._newxmax:
-                self._display.line(
-                    start,
-                    tick,
-                    start + self._grid_lenght,
-                    tick,
-                    self._tickcolor,
-                )
-                start = start + self._grid_espace + self._grid_lenght
+            dashed_hline(
+                self._display,
+                self._newxmin,
+                tick,
+                width,
+                self._tickcolor,
+                self._grid_dash,
+                self._grid_gap,
+            )
 
     def _draw_gridx(self, ticks_data: list[int]) -> None:
         """
@@ -439,84 +942,173 @@ class PLOT:
         :return: None
 
         """
+        period = self._grid_dash + self._grid_gap
+        count = (
+            self._newymin - self._newymax - self._grid_gap - self._grid_dash
+        ) // period + 1
+        if count <= 0:
+            return
+        height = (count - 1) * period + self._grid_dash
         for tick in ticks_data:
-            start = self._newymin
-            while start - self._grid_lenght - self._grid_espace >= self._newymax:
-                self._display.line(
-                    tick,
-                    start,
-                    tick,
-                    start - self._grid_lenght,
-                    self._tickcolor,
-                )
-                start = start - self._grid_espace - self._grid_lenght
+            dashed_vline(
+                self._display,
+                tick,
+                self._newymin - height + 1,
+                height,
+                self._tickcolor,
+                self._grid_dash,
+                self._grid_gap,
+            )
 
     def _writeplainpbm(self, file: str = "newfile.pbm") -> None:
         """
-        Function to write a plain pbm file
-        adapted from https://github.com/orgs/micropython/discussions/10785
-        Author: Stewart Russell
+        Function to write a pbm file of the whole display. Kept for
+        compatibility, use :meth:`save_pbm` instead
+
+        :param str file: picture filename
+
         """
-        with open(file, "wb") as file_write:
-            file_write.write("P1" + "\n")
-            file_write.write(str(480) + " " + str(320) + "\n")
-            for y in range(320):
-                for x in range(480):
-                    file_write.write(str(self._display.pixel(x, y)))
-                file_write.write("\n")
-            file_write.close()
+        self.save_pbm(
+            file,
+            0,
+            0,
+            getattr(self._display, "width", 480),
+            getattr(self._display, "height", 320),
+        )
+
+    def save_pbm(
+        self,
+        filename: str = "picture.pbm",
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        threshold: Optional[int] = None,
+    ) -> None:
+        """
+        Saves the plot, or a rectangle of the display, as a packed binary pbm
+        (P4) file, 8 pixels per byte and one write per row. Pixels are set
+        when their value is not zero. For color buffers a ``threshold`` can be
+        given instead, pixels are then set when their brightness, from 0 to
+        255, is above it.
+
+        :param str filename: picture filename. Defaults to ``picture.pbm``
+        :param int|None x: x origin of the rectangle. Defaults to the plot x origin
+        :param int|None y: y origin of the rectangle. Defaults to the plot y origin
+        :param int|None width: rectangle width in pixels. Defaults to the plot width
+        :param int|None height: rectangle height in pixels. Defaults to the plot height
+        :param int|None threshold: brightness threshold. Defaults to None
+
+        :return: None
+
+        """
+        self._drawn()
+        x, y, width, height = self._region(x, y, width, height)
+        reader = RowReader(self._display)
+        row = zeros("H", width)
+        packed = bytearray((width + 7) // 8)
+        levels = {}
+
+        with open(filename, "wb") as pbmfile:
+            pbmfile.write(b"P4\n%d %d\n" % (width, height))
+            for line in range(y, y + height):
+                reader.raw(x, line, width, row)
+                byte = 0
+                bit = 0x80
+                position = 0
+                for value in row:
+                    if threshold is None:
+                        lit = value
+                    else:
+                        lit = levels.get(value)
+                        if lit is None:
+                            color = reader.color(value)
+                            lit = (
+                                color[0] * 77 + color[1] * 150 + color[2] * 29
+                            ) >> 8 > threshold
+                            levels[value] = lit
+                    if lit:
+                        byte = byte | bit
+                    bit = bit >> 1
+                    if not bit:
+                        packed[position] = byte
+                        position += 1
+                        byte = 0
+                        bit = 0x80
+                if bit != 0x80:
+                    packed[position] = byte
+                pbmfile.write(packed)
 
     def _savingppm(
         self, filename: str = "picture.ppm", width: int = 480, height: int = 320
     ) -> None:
         """
-        Function to save the screen as a ppm file
-        Adapted from https://gist.github.com/nicholasRutherford/c95a55239e03ba99bab3
-        Author: Nicholas Rutherford
+        Function to save the screen as a ppm file. Kept for compatibility,
+        use :meth:`screenshot` instead
 
         :param str filename: picture filename
         :param int width: screenshot width in pixels
         :param int height: screenshot height in pixels
 
-        This function requires adding the colors used manually in the z list
-        """
-
-        z = [
-            self._color0,
-            self._color2,
-            self._color1,
-            (255, 0, 0),
-            (237, 0, 86),
-            (218, 0, 105),
-            (199, 0, 124),
-            (181, 0, 142),
-            (162, 0, 161),
-            (143, 0, 180),
-            (125, 0, 198),
-            (106, 0, 217),
-            (87, 0, 236),
-            (68, 0, 255),
-        ]
-
-        # Header values for the file
-        comment = b"MicroPlot"
-        ftype = b"P6"
-
-        # First write the header values
-        with open(filename, "wb+") as ppmfile:
-            ppmfile.write(b"%s\n" % (ftype))
-            ppmfile.write(b"#%s\n" % comment)
-            ppmfile.write(b"%d %d\n" % (width, height))
-            ppmfile.write(b"255\n")
-
-            for y in range(height):
-                for x in range(width):
-                    ppmfile.write(
-                        b"%c%c%c"
-                        % (
-                            z[self._display.pixel(x, y)][0],
-                            z[self._display.pixel(x, y)][1],
-                            z[self._display.pixel(x, y)][2],
-                        )
-                    )
-            ppmfile.close()
+        """
+        self.screenshot(filename, 0, 0, width, height)
+
+    def _region(
+        self,
+        x: Optional[int],
+        y: Optional[int],
+        width: Optional[int],
+        height: Optional[int],
+    ) -> tuple:
+        """
+        Returns the rectangle to export. Missing values default to the plot
+        position and size, and the rectangle is clipped to the display.
+        """
+        if x is None:
+            x = self._width - self._buff_width
+        if y is None:
+            y = self._height - self._buff_height
+        if width is None:
+            width = self._buff_width
+        if height is None:
+            height = self._buff_height
+        width = min(width, getattr(self._display, "width", x + width) - x)
+        height = min(height, getattr(self._display, "height", y + height) - y)
+        if x < 0 or y < 0 or width <= 0 or height <= 0:
+            raise ValueError("The region to export is outside the display")
+        return x, y, width, height
+
+    def screenshot(
+        self,
+        filename: str = "picture.ppm",
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ) -> None:
+        """
+        Saves the plot, or a rectangle of the display, as a binary ppm file.
+        The frame buffer is read one row at a time and every row is written
+        with a single call. GS4 buffers are decoded with the display ``lut``,
+        GS8 and RGB565 buffers with the display ``rgb`` method. Plots created
+        without ``immediate`` can not be saved.
+
+        :param str filename: picture filename. Defaults to ``picture.ppm``
+        :param int|None x: x origin of the rectangle. Defaults to the plot x origin
+        :param int|None y: y origin of the rectangle. Defaults to the plot y origin
+        :param int|None width: rectangle width in pixels. Defaults to the plot width
+        :param int|None height: rectangle height in pixels. Defaults to the plot height
+
+        :return: None
+
+        """
+        self._drawn()
+        x, y, width, height = self._region(x, y, width, height)
+        reader = RowReader(self._display)
+        row = bytearray(3 * width)
+
+        with open(filename, "wb") as ppmfile:
+            ppmfile.write(b"P6\n#MicroPlot\n%d %d\n255\n" % (width, height))
+            for line in range(y, y + height):
+                reader.rgb(x, line, width, row)
+                ppmfile.write(row)
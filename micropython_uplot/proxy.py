@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`proxy`
+================================================================================
+
+Display wrapper used to observe the drawing primitives issued by a plot
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+# pylint: disable=too-many-arguments
+
+_FONT_WIDTH = 8
+_FONT_HEIGHT = 8
+
+
+class DisplayProxy:
+    """
+    Wraps a display object. Every drawing primitive reports the rectangle it
+    touches to :meth:`_record` and is then forwarded to the wrapped display.
+    Any other attribute, like ``rgb``, ``lut``, ``width`` or ``show``, is read
+    from the wrapped display, so the proxy can be used wherever the display is.
+
+    Proxies can be stacked, each one forwards to the next.
+
+    :param display: display object to wrap
+
+    """
+
+    def __init__(self, display) -> None:
+        self.display = display
+
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
+    def _record(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        Called with the rectangle touched by each primitive
+        """
+
+    def _record_all(self) -> None:
+        """
+        Records the whole display area
+        """
+        self._record(
+            0,
+            0,
+            getattr(self.display, "width", 0x7FFF),
+            getattr(self.display, "height", 0x7FFF),
+        )
+
+    def touch(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        Reports a rectangle modified without using the drawing primitives,
+        for example by writing directly into the frame buffer
+
+        :param int x: rectangle x origin
+        :param int y: rectangle y origin
+        :param int width: rectangle width in pixels
+        :param int height: rectangle height in pixels
+        :return: None
+        """
+        self._record(x, y, width, height)
+        touch = getattr(self.display, "touch", None)
+        if touch is not None:
+            touch(x, y, width, height)
+
+    def pixel(self, x: int, y: int, *color):
+        """
+        Reads or sets a pixel
+        """
+        if color:
+            self._record(x, y, 1, 1)
+        return self.display.pixel(x, y, *color)
+
+    def line(self, xstart: int, ystart: int, xend: int, yend: int, color: int) -> None:
+        """
+        Draws a line
+        """
+        self._record(
+            min(xstart, xend),
+            min(ystart, yend),
+            abs(xend - xstart) + 1,
+            abs(yend - ystart) + 1,
+        )
+        self.display.line(xstart, ystart, xend, yend, color)
+
+    def hline(self, x: int, y: int, width: int, color: int) -> None:
+        """
+        Draws a horizontal line
+        """
+        self._record(x, y, width, 1)
+        self.display.hline(x, y, width, color)
+
+    def vline(self, x: int, y: int, height: int, color: int) -> None:
+        """
+        Draws a vertical line
+        """
+        self._record(x, y, 1, height)
+        self.display.vline(x, y, height, color)
+
+    def rect(self, x: int, y: int, width: int, height: int, color: int, *fill):
+        """
+        Draws a rectangle
+        """
+        self._record(x, y, width, height)
+        self.display.rect(x, y, width, height, color, *fill)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int):
+        """
+        Draws a filled rectangle
+        """
+        self._record(x, y, width, height)
+        self.display.fill_rect(x, y, width, height, color)
+
+    def ellipse(self, x: int, y: int, xradius: int, yradius: int, color: int, *args):
+        """
+        Draws an ellipse
+        """
+        self._record(x - xradius, y - yradius, 2 * xradius + 1, 2 * yradius + 1)
+        self.display.ellipse(x, y, xradius, yradius, color, *args)
+
+    def poly(self, x: int, y: int, coords, color: int, *fill):
+        """
+        Draws a polygon
+        """
+        if len(coords) >= 2:
+            xmin = xmax = coords[0]
+            ymin = ymax = coords[1]
+            for index in range(2, len(coords) - 1, 2):
+                value = coords[index]
+                if value < xmin:
+                    xmin = value
+                elif value > xmax:
+                    xmax = value
+                value = coords[index + 1]
+                if value < ymin:
+                    ymin = value
+                elif value > ymax:
+                    ymax = value
+            self._record(x + xmin, y + ymin, xmax - xmin + 1, ymax - ymin + 1)
+        self.display.poly(x, y, coords, color, *fill)
+
+    def text(self, string: str, x: int, y: int, *color) -> None:
+        """
+        Draws a text
+        """
+        self._record(x, y, _FONT_WIDTH * len(string), _FONT_HEIGHT)
+        self.display.text(string, x, y, *color)
+
+    def fill(self, color: int) -> None:
+        """
+        Fills the whole display
+        """
+        self._record_all()
+        self.display.fill(color)
+
+    def blit(self, buffer, x: int, y: int, *args) -> None:
+        """
+        Draws another frame buffer. Buffers without ``width`` and ``height``
+        attributes are recorded as touching the whole display
+        """
+        width = getattr(buffer, "width", None)
+        height = getattr(buffer, "height", None)
+        if width is None or height is None:
+            self._record_all()
+        else:
+            self._record(x, y, width, height)
+        self.display.blit(buffer, x, y, *args)
+
+    def scroll(self, xstep: int, ystep: int) -> None:
+        """
+        Scrolls the whole display
+        """
+        self._record_all()
+        self.display.scroll(xstep, ystep)
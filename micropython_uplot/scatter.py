@@ -13,7 +13,8 @@ scatter plot for micropython_uplot
 
 """
 from array import array
-from micropython_uplot.colors import set_color
+from micropython_uplot.framebuffer import buffer_format, drawable_canvas
+from micropython_uplot.stats import measure
 
 try:
     from typing import Union, Optional
@@ -28,6 +29,10 @@ __repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
 _TRIANGLE = array("i", [0, 0, 8, 0, 4, -7])
 _SQUARE = array("i", [0, 0, 6, 0, 6, -6, 0, -6])
 _DIAMOND = array("i", [0, 0, 3, -4, 6, 0, 3, 4])
+_SHAPES = {"triangle": _TRIANGLE, "square": _SQUARE, "diamond": _DIAMOND}
+
+_SPRITE_CACHE_SIZE = 16
+_sprites = {}
 
 
 class Scatter:
@@ -46,6 +51,7 @@ class Scatter:
         pointer_color: tuple = (0, 255, 0),
         pointer: Optional[str] = None,
         pointer_index: Optional[int] = None,
+        cull: int = 0,
     ) -> None:
         """
 
@@ -57,75 +63,74 @@ class Scatter:
         :param int|list radius: circle radius
         :param int pointer_color: pointer color. Default is 0xFF905D
         :param str|None pointer: pointer shape.
-        :param int|None pointer_index: pointer index. Default is None
+        :param int|None pointer_index: color table slot to use. Defaults to None,
+         the plot picks a slot, shared with charts of the same color
+        :param int cull: cell size in pixels used to skip hidden markers. A
+         marker is not drawn when an earlier marker of this scatter fell in the
+         same cell. With :const:`1` only markers on an already used pixel are
+         skipped, so the plot looks the same. Larger cells skip more markers
+         but move the visible ones. The number of skipped markers is kept in
+         ``culled``. Needs a fixed radius. Defaults to :const:`0`, no culling
 
         """
+        with measure(plot, "transform", self):
+            if pointer is None:
+                self._pointer = "circle"
+            else:
+                self._pointer = pointer
+
+            if pointer_index is None:
+                self._pointer_color = plot.color(pointer_color, self)
+            else:
+                self._pointer_color = plot._color_table.set(
+                    pointer_index, pointer_color, self
+                )
 
-        if pointer is None:
-            self._pointer = "circle"
-        else:
-            self._pointer = pointer
+            self._radius = radius
+            self._cull = cull
+            self.culled = 0
 
-        if pointer_index is None:
-            self._pointer_index = plot._pointer_index
-        else:
-            self._pointer_index = pointer_index
-
-        self._radius = radius
-        self._pointer_color = set_color(
-            plot._display,
-            self._pointer_index,
-            pointer_color[0],
-            pointer_color[1],
-            pointer_color[2],
-        )
-        plot._pointer_index += 1
-
-        if isinstance(self._radius, list) and self._pointer != "circle":
-            raise ValueError(
-                f"Pointer paramater is {self._pointer}. Variable Radius are not accepted"
-            )
-
-        max_x = max(x)
-        min_x = min(x)
-        max_y = max(y)
-        min_y = min(y)
-
-        if rangex is None:
-            xmin = min_x - (abs(max_x - min_x) / 10)
-            xmax = max_x + (abs(max_x - min_x) / 10)
-        else:
-            xmin = min(rangex)
-            xmax = max(rangex)
+            if self._pointer != "circle" and self._pointer not in _SHAPES:
+                raise ValueError("pointer must be a valid option")
 
-        if rangey is None:
-            ymin = min_y - (abs(max_y - min_y) / 10)
-            ymax = max_y + (abs(max_y - min_y) / 10)
-        else:
-            ymin = min(rangey)
-            ymax = max(rangey)
-
-        self._xnorm = tuple(
-            [
-                int(plot.transform(xmin, xmax, plot._newxmin, plot._newxmax, _))
-                for _ in x
-            ]
-        )
-        self._ynorm = tuple(
-            [
-                int(plot.transform(ymin, ymax, plot._newymin, plot._newymax, _))
-                for _ in y
-            ]
-        )
-
-        self._draw_pointer(plot)
-
-        if plot._scatterfirst:
-            if plot._showticks:
-                plot._draw_ticks(x, y)
-
-                plot._scatterfirst = False
-                plot._showticks = False
+            if isinstance(self._radius, list) and self._pointer != "circle":
+                raise ValueError(
+                    f"Pointer paramater is {self._pointer}. Variable Radius are not accepted"
+                )
+
+            if cull and isinstance(self._radius, list):
+                raise ValueError("Culling needs a fixed radius")
+
+            max_x = max(x)
+            min_x = min(x)
+            max_y = max(y)
+            min_y = min(y)
+
+            if rangex is None:
+                xmin = min_x - (abs(max_x - min_x) / 10)
+                xmax = max_x + (abs(max_x - min_x) / 10)
+            else:
+                xmin = min(rangex)
+                xmax = max(rangex)
+
+            if rangey is None:
+                ymin = min_y - (abs(max_y - min_y) / 10)
+                ymax = max_y + (abs(max_y - min_y) / 10)
+            else:
+                ymin = min(rangey)
+                ymax = max(rangey)
+
+            self._xnorm = plot.mapper(xmin, xmax, plot._newxmin, plot._newxmax).map(x)
+            self._ynorm = plot.mapper(ymin, ymax, plot._newymin, plot._newymax).map(y)
+
+            self._draw_pointer(plot)
+
+            if plot._scatterfirst:
+                if plot._showticks:
+                    plot._draw_ticks(x, y)
+
+                    plot._scatterfirst = False
+                    plot._showticks = False
 
     def _draw_pointer(self, plot: PLOT) -> None:
         """
@@ -133,55 +138,129 @@ class Scatter:
         :param PLOT plot: Plot object for the scatter to be drawn
 
         """
+        display = plot._display
+        xnorm = self._xnorm
+        ynorm = self._ynorm
 
         if isinstance(self._radius, list):
-            for i, _ in enumerate(self._xnorm):
-                plot._display.ellipse(
-                    self._xnorm[i],
-                    self._ynorm[i],
-                    self._radius[i],
-                    self._radius[i],
-                    self._pointer_color,
-                    True,
-                )
-
-        else:
-            for i, _ in enumerate(self._xnorm):
-                if self._pointer == "circle":
-                    plot._display.ellipse(
-                        self._xnorm[i],
-                        self._ynorm[i],
-                        self._radius,
-                        self._radius,
-                        self._pointer_color,
-                        True,
+            stampers = {}
+            for i, radius in enumerate(self._radius):
+                stamp = stampers.get(radius)
+                if stamp is None:
+                    stamp = _stamper(
+                        display, self._pointer, radius, self._pointer_color
                     )
+                    stampers[radius] = stamp
+                stamp(xnorm[i], ynorm[i])
+        else:
+            stamp = _stamper(display, self._pointer, self._radius, self._pointer_color)
+            if self._cull:
+                self._draw_culled(plot, stamp)
+            else:
+                for i, item in enumerate(xnorm):
+                    stamp(item, ynorm[i])
+
+    def _draw_culled(self, plot: PLOT, stamp) -> None:
+        """
+        Draws the markers skipping the ones falling in an already used cell.
+        Used cells are kept in a bitset covering the plot box, markers
+        outside the box are always drawn.
 
-                elif self._pointer == "triangle":
-                    plot._display.poly(
-                        self._xnorm[i],
-                        self._ynorm[i],
-                        _TRIANGLE,
-                        self._pointer_color,
-                        True,
-                    )
+        :param PLOT plot: Plot object for the scatter to be drawn
+        :param stamp: function drawing a marker at a point
 
-                elif self._pointer == "square":
-                    plot._display.poly(
-                        self._xnorm[i],
-                        self._ynorm[i],
-                        _SQUARE,
-                        self._pointer_color,
-                        True,
-                    )
-                elif self._pointer == "diamond":
-                    plot._display.poly(
-                        self._xnorm[i],
-                        self._ynorm[i],
-                        _DIAMOND,
-                        self._pointer_color,
-                        True,
-                    )
+        """
+        cell = self._cull
+        left = plot._newxmin
+        top = plot._newymax
+        columns = (plot._newxmax - left) // cell + 1
+        rows = (plot._newymin - top) // cell + 1
+        used = bytearray((columns * rows + 7) // 8)
+        ynorm = self._ynorm
+        culled = 0
+
+        for i, x in enumerate(self._xnorm):
+            y = ynorm[i]
+            column = (x - left) // cell
+            row = (y - top) // cell
+            if 0 <= column < columns and 0 <= row < rows:
+                index = row * columns + column
+                mask = 1 << (index & 7)
+                if used[index >> 3] & mask:
+                    culled += 1
+                    continue
+                used[index >> 3] = used[index >> 3] | mask
+            stamp(x, y)
+
+        self.culled = culled
+
+
+def _stamper(display, shape: str, radius: int, color: int):
+    """
+    Returns a function drawing the marker at a given point. Markers are
+    pre-rendered into a sprite and stamped with ``blit`` when the display
+    allows it, otherwise they are drawn with ``ellipse`` or ``poly``.
+    Sprites are cached and shared by every scatter.
+    """
+    key = (shape, radius, color, buffer_format(display))
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = _make_sprite(display, shape, radius, color)
+        if sprite is not None:
+            if len(_sprites) >= _SPRITE_CACHE_SIZE:
+                _sprites.clear()
+            _sprites[key] = sprite
+
+    if sprite is not None:
+        canvas, xoffset, yoffset, transparent = sprite
+        blit = display.blit
+
+        def stamp(x, y):
+            blit(canvas, x + xoffset, y + yoffset, transparent)
+
+    elif shape == "circle":
+        ellipse = display.ellipse
+
+        def stamp(x, y):
+            ellipse(x, y, radius, radius, color, True)
+
+    else:
+        poly = display.poly
+        coords = _SHAPES[shape]
+
+        def stamp(x, y):
+            poly(x, y, coords, color, True)
+
+    return stamp
+
+
+def _make_sprite(display, shape: str, radius: int, color: int) -> tuple:
+    """
+    Renders a marker into a canvas. Returns the canvas, the offset of its
+    origin from the marker point and the transparent color, or None when the
+    display can not blit it.
+    """
+    if shape == "circle":
+        xmin = ymin = -radius
+        xmax = ymax = radius
+    else:
+        coords = _SHAPES[shape]
+        xmin = min(coords[0::2])
+        xmax = max(coords[0::2])
+        ymin = min(coords[1::2])
+        ymax = max(coords[1::2])
+
+    canvas = drawable_canvas(display, xmax - xmin + 1, ymax - ymin + 1)
+    if canvas is None:
+        return None
+
+    transparent = 0 if color else 1
+    canvas.fill(transparent)
+    if shape == "circle":
+        canvas.ellipse(radius, radius, radius, radius, color, True)
+    else:
+        canvas.poly(-xmin, -ymin, coords, color, True)
+    return canvas, xmin, ymin, transparent
 
 
 class Pointer:
@@ -0,0 +1,302 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`stats`
+================================================================================
+
+Rendering statistics: drawing calls, pixels and time used by each stage
+
+
+* Author: Jose D. Montoya
+
+
+"""
+
+from micropython_uplot.proxy import DisplayProxy
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter_ns
+
+    def ticks_us() -> int:
+        """
+        Microseconds counter
+        """
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(end: int, start: int) -> int:
+        """
+        Difference between two counter values
+        """
+        return end - start
+
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/MicroPython_UPLOT.git"
+
+# Stages the time is split into
+STAGES = ("transform", "rasterize", "ticks", "text")
+
+
+class Stats:
+    """
+    Rendering statistics collected by a plot created with ``stats``, see
+    :meth:`PLOT.stats`. The time is split into stages that do not overlap:
+
+    * ``transform``: chart code, converting and clipping the data
+    * ``rasterize``: display drawing calls, except text
+    * ``ticks``: computing the ticks and the grid
+    * ``text``: display text calls
+
+    The time of every chart method is also added to the chart, including the
+    drawing and ticks done by the method.
+
+    The stages are timed by the blocks given by :func:`measure`, so only the
+    plots created with ``stats`` are timed.
+
+    """
+
+    def __init__(self) -> None:
+        self.active = True
+        self._next_stage = "transform"
+        self._next_chart = None
+        self.calls = {}
+        self.pixels = {}
+        self.stages = {}
+        self._charts = {}
+        self._times = {}
+        self._stack = []
+        self._mark = 0
+        self._chart = None
+        self._chart_start = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Sets every counter to zero
+
+        :return: None
+        """
+        self.calls = {}
+        self.pixels = {}
+        self.stages = {stage: 0 for stage in STAGES}
+        self._charts = {}
+        self._times = {}
+
+    def count(self, name: str, pixels: int) -> None:
+        """
+        Counts a drawing call
+
+        :param str name: primitive name
+        :param int pixels: estimated number of pixels drawn
+        :return: None
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.pixels[name] = self.pixels.get(name, 0) + pixels
+
+    def enter(self, stage: str, chart=None) -> None:
+        """
+        Starts timing a stage, pausing the current one
+
+        :param str stage: stage name
+        :param chart: chart object whose time includes this stage. Defaults to None
+        :return: None
+        """
+        now = ticks_us()
+        stack = self._stack
+        if stack:
+            self.stages[stack[-1]] += ticks_diff(now, self._mark)
+        stack.append(stage)
+        self._mark = now
+        if chart is not None and self._chart is None:
+            self._chart = (chart, len(stack))
+            self._chart_start = now
+
+    def __enter__(self) -> None:
+        chart = self._next_chart
+        self._next_chart = None
+        self.enter(self._next_stage, chart)
+
+    def __exit__(self, *args) -> None:
+        self.leave()
+
+    def leave(self) -> None:
+        """
+        Stops timing the current stage and resumes the previous one
+
+        :return: None
+        """
+        now = ticks_us()
+        stage = self._stack.pop()
+        self.stages[stage] += ticks_diff(now, self._mark)
+        self._mark = now
+        if self._chart is not None and len(self._stack) < self._chart[1]:
+            label = self._label(self._chart[0])
+            self._times[label] = self._times.get(label, 0) + ticks_diff(
+                now, self._chart_start
+            )
+            self._chart = None
+
+    def _label(self, chart) -> str:
+        """
+        Returns the name of a chart, its class followed by a number
+        """
+        label = self._charts.get(chart)
+        if label is None:
+            name = type(chart).__name__
+            number = 1 + sum(1 for item in self._charts if type(item) is type(chart))
+            label = "%s %d" % (name, number)
+            self._charts[chart] = label
+        return label
+
+    def result(self) -> dict:
+        """
+        Returns the statistics
+
+        :return dict: ``calls`` and ``pixels`` per primitive, microseconds per
+         stage in ``stages``, and per chart in ``charts``
+        """
+        return {
+            "calls": dict(self.calls),
+            "pixels": dict(self.pixels),
+            "stages": dict(self.stages),
+            "charts": dict(self._times),
+        }
+
+
+class _Idle:
+    """
+    Context doing nothing, used by the plots without statistics
+    """
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args) -> None:
+        return None
+
+
+_IDLE = _Idle()
+
+
+def measure(plot, stage: str, chart=None):
+    """
+    Returns a context timing a block as a stage of the plot statistics. Plots
+    created without ``stats``, or stopped with :meth:`PLOT.stop_stats`, get a
+    context doing nothing.
+
+    :param PLOT plot: plot drawn by the block
+    :param str stage: stage name
+    :param chart: chart object whose time includes the block. Defaults to None
+    """
+    stats = plot._stats
+    if stats is None or not stats.active:
+        return _IDLE
+    stats._next_stage = stage
+    stats._next_chart = chart
+    return stats
+
+
+class StatsProxy(DisplayProxy):
+    """
+    Display proxy counting the drawing calls and estimating the pixels they
+    draw. Each call is timed as the ``rasterize`` stage, or ``text``. Lines
+    and outlines count their length, filled shapes their area, filled
+    polygons half their bounding box and text a full character cell per
+    character. Rectangles written directly into the frame buffer are counted
+    as ``touch``.
+
+    :param display: display object to wrap
+    :param Stats stats: statistics to update
+
+    """
+
+    def __init__(self, display, stats: Stats) -> None:
+        super().__init__(display)
+        self._stats = stats
+
+    def _draw(self, name: str, pixels: int, stage: str, *args):
+        """
+        Counts, times and forwards a drawing call
+        """
+        stats = self._stats
+        if not stats.active:
+            return getattr(self.display, name)(*args)
+        stats.count(name, pixels)
+        stats.enter(stage)
+        try:
+            return getattr(self.display, name)(*args)
+        finally:
+            stats.leave()
+
+    def touch(self, x: int, y: int, width: int, height: int) -> None:
+        if self._stats.active:
+            self._stats.count("touch", width * height)
+        super().touch(x, y, width, height)
+
+    def pixel(self, x: int, y: int, *color):
+        return self._draw("pixel", 1 if color else 0, "rasterize", x, y, *color)
+
+    def line(self, xstart: int, ystart: int, xend: int, yend: int, color: int) -> None:
+        pixels = max(abs(xend - xstart), abs(yend - ystart)) + 1
+        self._draw("line", pixels, "rasterize", xstart, ystart, xend, yend, color)
+
+    def hline(self, x: int, y: int, width: int, color: int) -> None:
+        self._draw("hline", width, "rasterize", x, y, width, color)
+
+    def vline(self, x: int, y: int, height: int, color: int) -> None:
+        self._draw("vline", height, "rasterize", x, y, height, color)
+
+    def rect(self, x: int, y: int, width: int, height: int, color: int, *fill):
+        if fill and fill[0]:
+            pixels = width * height
+        else:
+            pixels = 2 * (width + height)
+        self._draw("rect", pixels, "rasterize", x, y, width, height, color, *fill)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int):
+        self._draw("fill_rect", width * height, "rasterize", x, y, width, height, color)
+
+    def ellipse(self, x: int, y: int, xradius: int, yradius: int, color: int, *args):
+        if args and args[0]:
+            pixels = 355 * (xradius + 1) * (yradius + 1) // 113
+        else:
+            pixels = 355 * (xradius + yradius) // 113 + 4
+        self._draw("ellipse", pixels, "rasterize", x, y, xradius, yradius, color, *args)
+
+    def poly(self, x: int, y: int, coords, color: int, *fill):
+        count = len(coords) // 2
+        pixels = 0
+        if count:
+            if fill and fill[0]:
+                width = max(coords[0::2]) - min(coords[0::2]) + 1
+                height = max(coords[1::2]) - min(coords[1::2]) + 1
+                pixels = width * height // 2
+            else:
+                xprev = coords[2 * count - 2]
+                yprev = coords[2 * count - 1]
+                for index in range(count):
+                    pixels += max(
+                        abs(coords[2 * index] - xprev),
+                        abs(coords[2 * index + 1] - yprev),
+                    )
+                    xprev = coords[2 * index]
+                    yprev = coords[2 * index + 1]
+        self._draw("poly", pixels, "rasterize", x, y, coords, color, *fill)
+
+    def text(self, string: str, x: int, y: int, *color) -> None:
+        self._draw("text", 64 * len(string), "text", string, x, y, *color)
+
+    def fill(self, color: int) -> None:
+        pixels = getattr(self.display, "width", 0) * getattr(self.display, "height", 0)
+        self._draw("fill", pixels, "rasterize", color)
+
+    def blit(self, buffer, x: int, y: int, *args) -> None:
+        pixels = getattr(buffer, "width", 0) * getattr(buffer, "height", 0)
+        self._draw("blit", pixels, "rasterize", buffer, x, y, *args)
+
+    def scroll(self, xstep: int, ystep: int) -> None:
+        pixels = getattr(self.display, "width", 0) * getattr(self.display, "height", 0)
+        self._draw("scroll", pixels, "rasterize", xstep, ystep)
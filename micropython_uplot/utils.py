@@ -11,6 +11,9 @@ Plot Utilities
 
 """
 
+from array import array
+from struct import calcsize
+
 # Taken from
 # https://stackoverflow.com/questions/12334442/does-python-have-a-linspace-function-in-its-std-lib
 
@@ -28,3 +31,12 @@ def linspace(start: int, stop: int, n: int):
     delta = (stop - start) / (n - 1)
     for i in range(n):
         yield start + delta * i
+
+
+def zeros(typecode: str, n: int) -> array:
+    """
+    Creates a zero filled array without building an intermediate list
+    :param str typecode: array typecode
+    :param int n: number of elements
+    """
+    return array(typecode, bytes(calcsize(typecode) * n))
@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from micropython_uplot.cartesian import Cartesian
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+
+
+def test_decimate_needs_solid_line_style():
+    plot = PLOT(HeadlessDisplay(480, 320, "RGB565"), 0, 0, 300, 200)
+    with pytest.raises(ValueError):
+        Cartesian(plot, [0, 1, 2], [0, 1, 0], line_style="- -", decimate=True)
+
+
+def test_lines_and_fill_do_not_draw_over_the_axes():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25)
+    edges = [(x, plot._newymin) for x in range(plot._newxmin, plot._newxmax + 1)]
+    edges += [(plot._newxmin, y) for y in range(plot._newymax, plot._newymin + 1)]
+    before = [display.pixel(x, y) for x, y in edges]
+    Cartesian(
+        plot,
+        [-5, 0, 5, 10, 15],
+        [-5, 8, -3, 9, -5],
+        rangex=[0, 10],
+        rangey=[0, 5],
+        line_color=(255, 0, 0),
+        fill=True,
+    )
+    assert [display.pixel(x, y) for x, y in edges] == before
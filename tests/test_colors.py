@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import gc
+import weakref
+
+import pytest
+
+from micropython_uplot.colors import color_table
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+
+
+def test_plots_share_the_display_color_table():
+    display = HeadlessDisplay(480, 320, "GS4")
+    first = PLOT(display, 0, 0, 200, 200)
+    second = PLOT(display, 240, 0, 200, 200)
+    assert first._color_table is second._color_table is color_table(display)
+
+
+def test_color_table_does_not_keep_the_display_alive():
+    display = HeadlessDisplay(480, 320, "GS4")
+    PLOT(display, 0, 0, 200, 200)
+    reference = weakref.ref(display)
+    del display
+    gc.collect()
+    assert reference() is None
+
+
+def test_second_background_does_not_recolor_the_first_plot():
+    display = HeadlessDisplay(480, 320, "GS4")
+    first = PLOT(display, 0, 0, 200, 200, background_color=(0, 0, 0))
+    table = color_table(display)
+    black = table.native((0, 0, 0))
+    second = PLOT(display, 240, 0, 200, 200, background_color=(0, 0, 255))
+    assert first._background_color == 0
+    assert second._background_color != 0
+    assert display.lut[0] | display.lut[1] << 8 == black
+
+
+def test_pinned_slot_used_by_another_chart_is_refused():
+    display = HeadlessDisplay(480, 320, "GS4")
+    plot = PLOT(display, 0, 0, 200, 200)
+    slot = plot.color((255, 0, 0), "first")
+    with pytest.raises(ValueError):
+        color_table(display).set(slot, (0, 255, 0), "second")
+    assert color_table(display).set(slot, (255, 0, 0), "second") == slot
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from micropython_uplot.density import Density
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+
+
+def _density(points, **kwargs):
+    display = HeadlessDisplay(320, 240, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=1, stats=True)
+    plot.tick_params(show_ticks=False)
+    chart = Density(plot, points, [0, 4], [0, 2], bins=(4, 2), **kwargs)
+    return display, plot, chart
+
+
+def test_points_are_counted_in_their_bin():
+    points = [(0, 0), (0.5, 0.5), (3.9, 1.9), (4, 2), (1.5, 1.2), (5, 1), (2, -1)]
+    _, _, chart = _density(points)
+    assert list(chart.counts) == [2, 0, 0, 0, 0, 1, 0, 2]
+    assert chart.total == 5
+    chart.add([(2.5, 0.5)])
+    assert chart.counts[2] == 1
+    assert chart.total == 6
+    chart.clear()
+    assert chart.total == 0
+    assert not any(chart.counts)
+
+
+def test_levels_spread_the_counts_over_the_colors():
+    _, _, chart = _density([], levels=10)
+    assert chart._level(1, 20) == 0
+    assert chart._level(20, 20) == 9
+    assert chart._level(11, 20) == 5
+    _, _, chart = _density([], levels=10, log_scale=True)
+    assert chart._level(1, 99) == 0
+    assert chart._level(99, 99) == 9
+    assert chart._level(10, 99) == 5
+
+
+def test_bins_are_drawn_with_their_level_color():
+    points = [(0.5, 1.5)] * 4 + [(1.5, 1.5)] * 4 + [(3.5, 0.5)]
+    display, plot, chart = _density(points, levels=4)
+    plot.reset_stats()
+    chart.draw()
+    # The two full bins of the top row are drawn together, empty bins are not
+    assert plot.stats()["calls"] == {"rect": 2}
+    left = plot._newxmin + 1
+    top = plot._newymax + 1
+    xdist = (plot._newxmax - plot._newxmin - 1) // 4
+    ydist = (plot._newymin - plot._newymax - 1) // 2
+    assert display.pixel(left + 1, top + 1) == chart._colors[3]
+    assert display.pixel(left + xdist + 1, top + 1) == chart._colors[3]
+    assert display.pixel(left + 3 * xdist + 1, top + ydist + 1) == chart._colors[0]
+    assert display.pixel(left + 2 * xdist + 1, top + 1) == plot._background_color
+
+
+def test_empty_range_is_refused():
+    display = HeadlessDisplay(320, 240, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200)
+    with pytest.raises(ValueError):
+        Density(plot, [], [1, 1], [0, 2])
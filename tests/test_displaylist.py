@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+from array import array
+
+import pytest
+
+from micropython_uplot.displaylist import DisplayList, render_bands
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.logging import Logging
+from micropython_uplot.map import Map
+from micropython_uplot.plot import PLOT
+
+
+def test_poly_keeps_short_coordinates():
+    display = HeadlessDisplay(100, 100, "RGB565")
+    display_list = DisplayList(display)
+    coords = array("h", [0, 0, 30, 5, 10, 40])
+    display_list.poly(20, 10, coords, 0xFFFF, True)
+    drawn = bytes(display.buffer)
+    display.fill(0)
+    display_list.replay()
+    assert bytes(display.buffer) == drawn
+    assert display_list.extent() == (10, 51)
+
+
+def test_logging_append_replaces_its_calls():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25, record=True)
+    chart = Logging(plot, [], [], rangex=[0, 10], rangey=[0, 10], capacity=20)
+    for index in range(100):
+        chart.append(index * 0.5, index % 10)
+    size = len(plot._display_list)
+    for index in range(100, 300):
+        chart.append(index * 0.5, index % 10)
+    assert len(plot._display_list) == size
+    drawn = bytes(display.buffer)
+    display.fill(0)
+    plot.replay()
+    assert bytes(display.buffer) == drawn
+
+
+def test_map_update_replaces_its_calls():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25, record=True)
+    frames = [
+        [[(row + column + frame) % 10 for column in range(8)] for row in range(6)]
+        for frame in range(10)
+    ]
+    chart = Map(plot, frames[0], 10, [8, 6], (0, 0, 255), (255, 0, 0))
+    size = len(plot._display_list)
+    for frame in frames[1:]:
+        chart.update(frame)
+    assert len(plot._display_list) == size
+    drawn = bytes(display.buffer)
+    display.fill(0)
+    plot.replay()
+    assert bytes(display.buffer) == drawn
+
+
+def test_recorded_only_plot_can_not_be_read():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25, immediate=False)
+    with pytest.raises(ValueError):
+        plot.render_static()
+    with pytest.raises(ValueError):
+        plot.screenshot("picture.ppm")
+    with pytest.raises(ValueError):
+        plot.save_pbm("picture.pbm")
+
+
+def test_scrolled_lists_are_not_drawn_in_bands():
+    display = HeadlessDisplay(100, 100, "RGB565")
+    canvas = HeadlessDisplay(100, 10, "RGB565")
+    display_list = DisplayList(display)
+    display_list.scroll(5, 0)
+    with pytest.raises(ValueError):
+        render_bands([display_list], canvas, None, 0, 0, 100, 100)
+    display_list.clear()
+    display_list.hline(0, 5, 50, 0xFFFF)
+    bands = []
+    render_bands(
+        [display_list],
+        canvas,
+        lambda band, x, y, rows: bands.append(y),
+        0,
+        0,
+        100,
+        100,
+    )
+    assert bands == list(range(0, 100, 10))
@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.logging import Logging
+from micropython_uplot.plot import PLOT
+
+
+def _full_logging(step):
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25, stats=True)
+    chart = Logging(
+        plot, [], [], rangex=[0, 100], rangey=[0, 10], capacity=400, scroll=True
+    )
+    x = 0.0
+    for index in range(400):
+        chart.append(x, index % 10)
+        x = x + step
+    return plot, chart, x
+
+
+def _lines_per_appends(step, appends=100):
+    plot, chart, x = _full_logging(step)
+    plot.reset_stats()
+    for index in range(appends):
+        chart.append(x, index % 10)
+        x = x + step
+    return plot.stats()["calls"].get("line", 0)
+
+
+def test_scroll_sub_pixel_steps_draw_only_new_segments():
+    # 0.25 per sample is about 0.62 pixels in a 249 pixels wide plot area
+    assert _lines_per_appends(0.25) <= 100
+
+
+def test_scroll_whole_pixel_steps_draw_only_new_segments():
+    assert _lines_per_appends(0.5) <= 100
+
+
+def test_scroll_keeps_sub_pixel_remainder():
+    plot, chart, x = _full_logging(0.25)
+    xmin = chart.xmin
+    for index in range(8):
+        chart.append(x, index % 10)
+        x = x + 0.25
+    # 8 samples of 0.62 pixels shift the range 4 or 5 whole pixels
+    shifted = (chart.xmin - xmin) * chart._xmapper.scale
+    assert 4 <= round(shifted) <= 5
+
+
+def test_range_minimum_is_drawn_inside_the_plot_area():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25)
+    chart = Logging(
+        plot, [0, 100], [0, 10], rangex=[0, 100], rangey=[0, 10], capacity=10
+    )
+    left, top, right, bottom = chart._clip_box(plot)
+    color = chart._line_color
+    assert display.pixel(left, bottom) == color
+    assert display.pixel(right, top) == color
+
+
+def _scrolling(x, y):
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25)
+    chart = Logging(
+        plot, x, y, rangex=[0, 100], rangey=[0, 10], capacity=20, scroll=True
+    )
+    return display, chart
+
+
+def test_scroll_erases_the_dropped_segments():
+    display, chart = _scrolling([], [])
+    for index in range(60):
+        chart.append(index, index % 7)
+    expected, _ = _scrolling(
+        list(range(40, 60)), [index % 7 for index in range(40, 60)]
+    )
+    assert display.buffer == expected.buffer
@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.map import Map
+from micropython_uplot.plot import PLOT
+
+_DATA = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+
+@pytest.mark.parametrize("interpolate", [False, True])
+def test_odd_gs4_edge_is_not_drawn_pixel_by_pixel(interpolate):
+    display = HeadlessDisplay(480, 320, "GS4")
+    plot = PLOT(display, 5, 5, 300, 250, padding=1, stats=True)
+    plot.reset_stats()
+    Map(plot, _DATA, 10, [3, 3], (0, 0, 255), (255, 0, 0), interpolate=interpolate)
+    calls = plot.stats()["calls"]
+    assert "pixel" not in calls
+    assert sum(calls.values()) <= 3 * 250
+
+
+def _frame(offset):
+    return [
+        [(row * 4 + column + offset) % 10 for column in range(4)] for row in range(3)
+    ]
+
+
+def _map(frame, mode="RGB565", **kwargs):
+    display = HeadlessDisplay(320, 240, mode)
+    plot = PLOT(display, 0, 0, 300, 200, padding=1, stats=True)
+    chart = Map(plot, frame, 10, [4, 3], (0, 0, 255), (255, 0, 0), **kwargs)
+    return display, plot, chart
+
+
+@pytest.mark.parametrize("mode", ["GS4", "RGB565"])
+def test_update_matches_a_full_redraw(mode):
+    display, _, chart = _map(_frame(0), mode)
+    for offset in (1, 5):
+        chart.update(_frame(offset))
+        assert display.buffer == _map(_frame(offset), mode)[0].buffer
+
+
+def test_update_redraws_only_the_changed_cells():
+    frame = _frame(0)
+    display, plot, chart = _map(frame)
+    assert chart.update(_frame(0)) is None
+    changed = [list(row) for row in frame]
+    changed[1][2] = (changed[1][2] + 5) % 10
+    plot.reset_stats()
+    area = chart.update(changed)
+    assert plot.stats()["calls"] == {"rect": 1}
+    assert area == (
+        chart._left + 2 * chart._xdist,
+        chart._top + chart._ydist,
+        chart._xdist,
+        chart._ydist,
+    )
+    assert display.buffer == _map(changed)[0].buffer
+
+
+def test_update_refuses_another_shape():
+    _, _, chart = _map(_frame(0))
+    with pytest.raises(ValueError):
+        chart.update([[0, 1, 2], [3, 4, 5]])
+
+
+def test_interpolated_uniform_map_matches_the_cells():
+    frame = [[4] * 4 for _ in range(3)]
+    assert _map(frame, interpolate=True)[0].buffer == _map(frame)[0].buffer
+
+
+def test_interpolated_row_is_a_gradient_between_the_cells():
+    display = HeadlessDisplay(320, 240, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=1)
+    chart = Map(
+        plot, [[0, 9.9]], 10, [2, 1], (0, 0, 255), (255, 0, 0), interpolate=True
+    )
+    bins = [
+        chart._colors.index(display.pixel(chart._left + column, chart._top))
+        for column in range(2 * chart._xdist)
+    ]
+    assert bins[0] == 0
+    assert bins[-1] == 9
+    assert bins == sorted(bins)
+    assert len(set(bins)) == 10
+
+
+def test_interpolated_update_matches_a_full_redraw():
+    display, _, chart = _map(_frame(0), interpolate=True)
+    chart.update(_frame(3))
+    assert display.buffer == _map(_frame(3), interpolate=True)[0].buffer
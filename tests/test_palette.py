@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from micropython_uplot.colors import color_table
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.map import color_fade, fade_palette
+from micropython_uplot.palette import Palette, get_palette
+
+
+def test_two_stop_gradient_is_evenly_spaced():
+    palette = Palette(((0, 0, 0), (252, 88, 32)), 5)
+    assert palette.colors == [
+        (0, 0, 0),
+        (63, 22, 8),
+        (126, 44, 16),
+        (189, 66, 24),
+        (252, 88, 32),
+    ]
+
+
+def test_gradient_goes_through_every_stop():
+    stops = ((0, 0, 0), (255, 0, 0), (255, 255, 255))
+    palette = Palette(stops, 5)
+    assert len(palette) == 5
+    assert palette.colors[0] == stops[0]
+    assert palette.colors[2] == stops[1]
+    assert palette.colors[4] == stops[2]
+
+
+def test_gradient_matches_color_fade():
+    start = (10, 200, 40)
+    end = (250, 20, 120)
+    palette = Palette((start, end), 11)
+    for step, color in enumerate(palette.colors):
+        expected = color_fade(start, end, step / 10)
+        assert all(abs(color[i] - expected[i]) <= 1 for i in range(3))
+
+
+def test_palette_needs_two_stops_and_steps():
+    with pytest.raises(ValueError):
+        Palette(((0, 0, 0),))
+    with pytest.raises(ValueError):
+        Palette(((0, 0, 0), (255, 255, 255)), 1)
+
+
+def test_named_palettes_are_shared():
+    assert get_palette("thermal") is get_palette("thermal")
+    registered = Palette(((0, 0, 0), (0, 255, 0)), name="test green")
+    assert get_palette("test green") is registered
+    with pytest.raises(ValueError):
+        get_palette("unknown")
+
+
+def test_fade_palettes_are_cached():
+    assert fade_palette((0, 0, 255), (255, 0, 0), 10) is fade_palette(
+        (0, 0, 255), (255, 0, 0), 10
+    )
+
+
+def test_native_colors_share_the_display_table_slots():
+    display = HeadlessDisplay(100, 100, "GS4")
+    palette = Palette(((0, 0, 0), (255, 255, 255)), 4)
+    first = palette.native(display, "first")
+    second = palette.native(display, "second")
+    assert first == second == [0, 1, 2, 3]
+    table = color_table(display)
+    for slot, color in enumerate(palette.colors):
+        assert display.lut[2 * slot] | display.lut[2 * slot + 1] << 8 == (
+            table.native(color)
+        )
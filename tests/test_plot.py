@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from micropython_uplot.cartesian import Cartesian
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+
+
+def test_restore_static_erases_the_data():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=25)
+    plot.render_static()
+    static = bytes(display.buffer)
+    display.rect(50, 50, 100, 100, 0xFFFF, True)
+    plot.restore_static()
+    assert bytes(display.buffer) == static
+
+
+def test_render_static_refuses_pixel_by_pixel_restore():
+    display = HeadlessDisplay(480, 320, "GS4")
+    plot = PLOT(display, 3, 0, 300, 200, padding=25)
+    with pytest.raises(ValueError):
+        plot.render_static()
+
+
+def test_recorded_plot_tracks_dirty_regions():
+    display = HeadlessDisplay(480, 320, "RGB565")
+    refreshed = []
+    plot = PLOT(
+        display,
+        0,
+        0,
+        300,
+        200,
+        padding=25,
+        track_dirty=True,
+        record=True,
+        dirty_callback=refreshed.extend,
+    )
+    plot.clear_dirty()
+    Cartesian(plot, [0, 1, 2, 3], [0, 2, 1, 3])
+    assert plot.dirty_regions()
+    plot.refresh()
+    assert refreshed
+    assert not plot.dirty_regions()
+
+
+def test_plot_imports_without_typing_extensions():
+    code = (
+        "import sys; sys.modules['typing_extensions'] = None; "
+        "import micropython_uplot.plot"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def _exported(mode, tmp_path):
+    display = HeadlessDisplay(40, 30, mode)
+    plot = PLOT(display, 0, 0, 40, 30, padding=5, show_box=False)
+    display.rect(5, 3, 5, 4, plot.color((255, 0, 0)), True)
+    return plot, str(tmp_path / "picture")
+
+
+@pytest.mark.parametrize("mode", ["GS4", "GS8", "RGB565"])
+def test_screenshot_writes_the_region_colors(mode, tmp_path):
+    plot, filename = _exported(mode, tmp_path)
+    plot.screenshot(filename, 0, 0, 11, 9)
+    with open(filename, "rb") as ppmfile:
+        header = [ppmfile.readline() for _ in range(4)]
+        pixels = ppmfile.read()
+    assert header == [b"P6\n", b"#MicroPlot\n", b"11 9\n", b"255\n"]
+    assert len(pixels) == 3 * 11 * 9
+    assert pixels[3 * (3 * 11 + 5) : 3 * (3 * 11 + 6)] == b"\xff\x00\x00"
+    assert pixels[:3] == b"\x00\x00\x00"
+
+
+def test_screenshot_region_is_clipped_to_the_display(tmp_path):
+    plot, filename = _exported("RGB565", tmp_path)
+    plot.screenshot(filename, 30, 25, 20, 20)
+    with open(filename, "rb") as ppmfile:
+        header = [ppmfile.readline() for _ in range(4)]
+        pixels = ppmfile.read()
+    assert header[2] == b"10 5\n"
+    assert len(pixels) == 3 * 10 * 5
+    with pytest.raises(ValueError):
+        plot.screenshot(filename, 40, 0, 10, 10)
+
+
+def _pbm(filename):
+    with open(filename, "rb") as pbmfile:
+        header = [pbmfile.readline() for _ in range(2)]
+        return header, pbmfile.read()
+
+
+@pytest.mark.parametrize("width", [8, 11, 16, 17])
+def test_save_pbm_pads_every_row_to_a_byte(width, tmp_path):
+    plot, filename = _exported("GS4", tmp_path)
+    plot.save_pbm(filename, 0, 0, width, 9)
+    header, rows = _pbm(filename)
+    stride = (width + 7) // 8
+    assert header == [b"P4\n", b"%d 9\n" % width]
+    assert len(rows) == stride * 9
+    # The rectangle covers columns 5 to 9 of rows 3 to 6
+    expected = bytearray(stride)
+    for column in range(5, min(10, width)):
+        expected[column // 8] |= 0x80 >> (column % 8)
+    for row in range(9):
+        line = rows[row * stride : (row + 1) * stride]
+        assert line == (expected if 3 <= row <= 6 else bytes(stride))
+
+
+def test_save_pbm_defaults_to_the_plot_size(tmp_path):
+    display = HeadlessDisplay(100, 80, "RGB565")
+    plot = PLOT(display, 10, 20, 50, 30, padding=5)
+    filename = str(tmp_path / "picture.pbm")
+    plot.save_pbm(filename)
+    header, rows = _pbm(filename)
+    assert header[1] == b"50 30\n"
+    assert len(rows) == 7 * 30
+
+
+def test_save_pbm_threshold_uses_the_brightness(tmp_path):
+    display = HeadlessDisplay(16, 2, "RGB565")
+    plot = PLOT(display, 0, 0, 16, 2, padding=0, show_box=False)
+    display.hline(0, 0, 8, plot.color((40, 40, 40)))
+    display.hline(8, 0, 8, plot.color((200, 200, 200)))
+    filename = str(tmp_path / "picture.pbm")
+    plot.save_pbm(filename, 0, 0, 16, 2, threshold=128)
+    assert _pbm(filename)[1] == b"\x00\xff\x00\x00"
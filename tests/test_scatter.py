@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+from micropython_uplot.scatter import _SHAPES, Scatter
+
+_X = [1, 2, 3, 5, 8, 9]
+_Y = [2, 7, 1, 8, 2, 8]
+
+
+def _scatter(pointer, mode="RGB565", **kwargs):
+    display = HeadlessDisplay(320, 240, mode)
+    plot = PLOT(display, 0, 0, 300, 200, padding=1, stats=True)
+    plot.tick_params(show_ticks=False)
+    plot.reset_stats()
+    chart = Scatter(plot, _X, _Y, [0, 10], [0, 10], pointer=pointer, **kwargs)
+    return display, plot, chart
+
+
+@pytest.mark.parametrize("mode", ["GS4", "RGB565"])
+@pytest.mark.parametrize("pointer", ["circle", "triangle", "square", "diamond"])
+def test_stamped_markers_match_the_drawn_shapes(pointer, mode):
+    display, plot, chart = _scatter(pointer, mode)
+    assert plot.stats()["calls"] == {"blit": len(_X)}
+
+    expected = HeadlessDisplay(320, 240, mode)
+    PLOT(expected, 0, 0, 300, 200, padding=1)
+    color = chart._pointer_color
+    for index, x in enumerate(chart._xnorm):
+        y = chart._ynorm[index]
+        if pointer == "circle":
+            expected.ellipse(x, y, 3, 3, color, True)
+        else:
+            expected.poly(x, y, _SHAPES[pointer], color, True)
+    assert display.buffer == expected.buffer
+
+
+def test_variable_radius_markers_are_stamped():
+    _, plot, _ = _scatter("circle", radius=[1, 2, 3, 1, 2, 3])
+    assert plot.stats()["calls"] == {"blit": len(_X)}
+
+
+def _dense(cull, x, y):
+    display = HeadlessDisplay(320, 240, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=1)
+    plot.tick_params(show_ticks=False)
+    chart = Scatter(plot, x, y, [0, 10], [0, 10], radius=2, cull=cull)
+    return display, chart
+
+
+def test_pixel_culling_skips_hidden_markers_only():
+    x = [1, 1, 1, 4, 4, 6.5]
+    y = [1, 1, 1, 4, 4, 3]
+    display, chart = _dense(1, x, y)
+    assert chart.culled == 3
+    reference, unculled = _dense(0, x, y)
+    assert unculled.culled == 0
+    assert display.buffer == reference.buffer
+
+
+def test_cell_culling_counts_the_skipped_markers():
+    # The points spread over 4 pixels in the top left 16 pixel cell
+    x = [0.2 + index / 30 for index in range(5)]
+    y = [9.8 - index / 30 for index in range(5)]
+    _, chart = _dense(16, x, y)
+    assert chart.culled == 4
+
+
+def test_markers_outside_the_box_are_never_culled():
+    _, chart = _dense(1, [-5, -5, -5], [20, 20, 20])
+    assert chart.culled == 0
+
+
+def test_culling_needs_a_fixed_radius():
+    display = HeadlessDisplay(320, 240, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, padding=1)
+    with pytest.raises(ValueError):
+        Scatter(plot, [1, 2], [1, 2], radius=[1, 2], cull=1)
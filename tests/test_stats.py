@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+from micropython_uplot.cartesian import Cartesian
+from micropython_uplot.headless import HeadlessDisplay
+from micropython_uplot.plot import PLOT
+
+_ORIGINAL = Cartesian.__init__
+
+
+def _draw(stats):
+    display = HeadlessDisplay(480, 320, "RGB565")
+    plot = PLOT(display, 0, 0, 300, 200, stats=stats)
+    Cartesian(plot, [0, 1, 2, 3], [0, 2, 1, 3])
+    return plot, display
+
+
+def test_chart_methods_are_timed_per_plot():
+    plot, display = _draw(True)
+    assert Cartesian.__init__ is _ORIGINAL
+    assert "Cartesian 1" in plot.stats()["charts"]
+    assert display.buffer == _draw(False)[1].buffer
+
+
+def test_plots_do_not_share_the_timing():
+    first, _ = _draw(True)
+    second, _ = _draw(True)
+    Cartesian(second, [0, 1], [1, 0])
+    assert list(first.stats()["charts"]) == ["Cartesian 1"]
+    assert len(second.stats()["charts"]) == 2
+
+
+def test_stopped_stats_keep_their_values():
+    plot, _ = _draw(True)
+    plot.stop_stats()
+    collected = plot.stats()
+    Cartesian(plot, [0, 1], [1, 0])
+    assert plot.stats() == collected